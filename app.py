@@ -1,11 +1,13 @@
 import streamlit as st
-import pandas as pd
 import datetime
+import uuid
 import utils
+import core
+from core import profiling
 from streamlit_option_menu import option_menu 
 
 # Import Views
-from views import dashboard, visualisasi, input_data, dataset, perbandingan, landing_page
+from views import dashboard, visualisasi, input_data, dataset, perbandingan, landing_page, debug_panel
 
 # 1. KONFIGURASI HALAMAN (Wajib Paling Atas)
 st.set_page_config(
@@ -25,6 +27,14 @@ except FileNotFoundError:
 # 3. INITIALISASI SESSION STATE
 if 'landing_page_selesai' not in st.session_state:
     st.session_state['landing_page_selesai'] = False
+if 'id_sesi' not in st.session_state:
+    st.session_state['id_sesi'] = uuid.uuid4().hex[:8]
+
+# 4. INSTRUMENTASI (aktif jika panel debug dinyalakan atau PREDIKSIRF_PROFILE=1)
+rerun_id = profiling.begin_rerun(
+    enabled=st.session_state.get('debug_timing', profiling.PROFILE_ENABLED),
+    sesi=st.session_state['id_sesi'],
+)
 
 # =========================================================
 # KONDISI 1: USER BELUM KLIK "MULAI" (LANDING PAGE)
@@ -114,21 +124,14 @@ else:
             real_suhu = 0.0
             real_hujan = 0.0
             
-            # Cek database
+            # Cek database (indeks hari dari HistoryStore, dibangun sekali saat load)
             if df_historis is not None:
-                ts_pilih = pd.to_datetime(tanggal_pilihan)
-                
-                # Normalisasi tipe data tanggal agar sinkron
-                if not pd.api.types.is_datetime64_any_dtype(df_historis['Tanggal']):
-                     df_historis['Tanggal'] = pd.to_datetime(df_historis['Tanggal'])
+                row_now = core.history_store(df_historis).lookup(tanggal_pilihan)
                 
-                # Filter data
-                row_now = df_historis[df_historis['Tanggal'] == ts_pilih]
-                
-                if not row_now.empty:
+                if row_now is not None:
                     data_tersedia = True
-                    if 'Suhu' in row_now.columns: real_suhu = float(row_now['Suhu'].values[0])
-                    if 'Curah Hujan' in row_now.columns: real_hujan = float(row_now['Curah Hujan'].values[0])
+                    real_suhu = row_now.get('Suhu', real_suhu)
+                    real_hujan = row_now.get('Curah Hujan', real_hujan)
             
             # --- TAMPILAN KONDISIONAL (FORMAL) ---
             if data_tersedia:
@@ -157,6 +160,8 @@ else:
         
         st.markdown("---")
         
+        st.checkbox("Mode Debug (Waktu Proses)", value=profiling.PROFILE_ENABLED, key='debug_timing')
+        
         # Tombol Kembali (Bahasa Baku)
         if st.button("Kembali ke Beranda", use_container_width=True):
             st.session_state['landing_page_selesai'] = False
@@ -176,4 +181,9 @@ else:
         dataset.show(df_historis)
 
     elif selected_menu == "Input Data":
-        input_data.show()
\ No newline at end of file
+        input_data.show()
+
+    # --- PANEL DEBUG (setelah halaman selesai dirender) ---
+    if st.session_state.get('debug_timing'):
+        with st.sidebar:
+            debug_panel.show(rerun_id, st.session_state['id_sesi'])
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Prediksi massal tanpa Streamlit: banyak outlet x skenario cuaca dalam satu jalan.
+
+    python batch_forecast.py manifest.csv -o hasil.parquet [--workers 4]
+
+Manifest (CSV atau JSON) berisi satu job per baris dengan kolom:
+    outlet, dataset, model, start, days, suhu, hujan, [skenario]
+Path dataset/model relatif terhadap folder manifest. Manifest JSON boleh berupa
+list job, atau objek {"defaults": {...}, "scenarios": [...], "jobs": [...]}:
+job tanpa suhu/hujan dijalankan untuk setiap skenario
+(mis. {"skenario": "kemarau", "suhu": 30, "hujan": 0}).
+
+Job dikelompokkan per (dataset, model) sehingga tiap proses worker cukup memuat
+model & dataset sekali. Salinan biner (sidecar) tiap dataset disiapkan sekali oleh
+proses induk; worker hanya membacanya. Hasil semua job ditulis ke satu file kolumnar
+(.parquet, .feather atau .csv sesuai ekstensi).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import core
+
+JOB_COLUMNS = ['outlet', 'skenario', 'dataset', 'model', 'start', 'days', 'suhu', 'hujan']
+DEFAULT_JOB = {'days': 30, 'suhu': 27.0, 'hujan': 5.0, 'skenario': 'default'}
+
+
+# --- MANIFEST ---
+def read_manifest(path):
+    """Membaca manifest -> DataFrame job (JOB_COLUMNS), path sudah absolut."""
+    base = os.path.dirname(os.path.abspath(path))
+    if path.lower().endswith('.json'):
+        with open(path) as f:
+            spec = json.load(f)
+        if isinstance(spec, list):
+            spec = {'jobs': spec}
+        defaults = {**DEFAULT_JOB, **spec.get('defaults', {})}
+        scenarios = spec.get('scenarios') or []
+        rows = []
+        for job in spec['jobs']:
+            if scenarios and 'suhu' not in job and 'hujan' not in job:
+                rows.extend({**defaults, **job, **sc} for sc in scenarios)
+            else:
+                rows.append({**defaults, **job})
+        jobs = pd.DataFrame(rows)
+    else:
+        jobs = pd.read_csv(path)
+        for col, val in DEFAULT_JOB.items():
+            if col not in jobs.columns:
+                jobs[col] = val
+            jobs[col] = jobs[col].fillna(val)
+
+    hilang = {'outlet', 'dataset', 'model', 'start'} - set(jobs.columns)
+    if hilang:
+        raise ValueError(f"Kolom manifest tidak ada: {sorted(hilang)}")
+    for col in ['dataset', 'model']:
+        jobs[col] = [p if os.path.isabs(p) else os.path.normpath(os.path.join(base, p)) for p in jobs[col]]
+    jobs['start'] = pd.to_datetime(jobs['start'])
+    jobs['days'] = jobs['days'].astype(int)
+    jobs['suhu'] = jobs['suhu'].astype(float)
+    jobs['hujan'] = jobs['hujan'].astype(float)
+    jobs['skenario'] = jobs['skenario'].astype(str)
+    return jobs[JOB_COLUMNS].reset_index(drop=True)
+
+
+def make_tasks(jobs, workers):
+    """
+    Kelompokkan job per (dataset, model) lalu pecah menjadi potongan agar semua
+    worker kebagian kerja -> tiap potongan hanya memuat resource sekali.
+    """
+    tasks = []
+    n_target = max(1, workers * 4)
+    ukuran = max(1, -(-len(jobs) // n_target))
+    for (dataset, model), grup in jobs.groupby(['dataset', 'model'], sort=False):
+        records = grup.to_dict('records')
+        for i in range(0, len(records), ukuran):
+            tasks.append((dataset, model, records[i:i + ukuran]))
+    return tasks
+
+
+# --- WORKER ---
+_resources = {}
+
+def _load(dataset, model):
+    key = (dataset, model)
+    if key not in _resources:
+        # Read-only: sidecar sudah disiapkan proses induk (run_batch), worker tidak menulis
+        _resources[key] = core.load_resources_from(model, dataset, write_cache=False)
+    return _resources[key]
+
+
+def run_task(dataset, model_path, records):
+    """Menjalankan sekumpulan job dengan dataset & model yang sama -> (DataFrame hasil, daftar error)."""
+    model, df = _load(dataset, model_path)
+    hasil, errors = [], []
+    for job in records:
+        if model is None:
+            errors.append({**job, 'error': f"Model tidak ditemukan: {model_path}"})
+            continue
+        if df is None:
+            errors.append({**job, 'error': f"Dataset tidak dapat dibaca: {dataset}"})
+            continue
+        try:
+            out = core.generate_forecast_data(model, df, job['start'], job['suhu'], job['hujan'], days=job['days'])
+        except Exception as e:
+            errors.append({**job, 'error': f"{type(e).__name__}: {e}"})
+            continue
+        out.insert(0, 'outlet', job['outlet'])
+        out.insert(1, 'skenario', job['skenario'])
+        hasil.append(out)
+    frame = pd.concat(hasil, ignore_index=True) if hasil else None
+    return frame, errors
+
+
+def run_batch(jobs, workers=1):
+    """Menjalankan semua job -> (DataFrame gabungan, DataFrame error)."""
+    tasks = make_tasks(jobs, workers)
+    for dataset in jobs['dataset'].unique():
+        core.prepare_dataset_cache(dataset)
+    frames, errors = [], []
+    if workers <= 1:
+        for t in tasks:
+            frame, err = run_task(*t)
+            frames.append(frame)
+            errors.extend(err)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_task, *t) for t in tasks]
+            for fut in as_completed(futures):
+                frame, err = fut.result()
+                frames.append(frame)
+                errors.extend(err)
+
+    frames = [f for f in frames if f is not None]
+    hasil = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if len(hasil):
+        # Urutan stabil apa pun urutan selesainya worker
+        hasil = hasil.sort_values(['outlet', 'skenario', 'Tanggal'], kind='stable').reset_index(drop=True)
+    return hasil, pd.DataFrame(errors)
+
+
+# --- OUTPUT KOLUMNAR ---
+def write_output(df, path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.parquet':
+        df.to_parquet(path, index=False)
+    elif ext == '.feather':
+        df.to_feather(path)
+    elif ext == '.csv':
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Format output tidak dikenal: {ext} (pakai .parquet, .feather, atau .csv)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('manifest')
+    parser.add_argument('-o', '--output', default='hasil_prediksi.parquet')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    jobs = read_manifest(args.manifest)
+    t0 = time.perf_counter()
+    hasil, errors = run_batch(jobs, args.workers)
+    durasi = time.perf_counter() - t0
+    if len(hasil):
+        write_output(hasil, args.output)
+
+    n_ok = len(jobs) - len(errors)
+    tujuan = f"-> {args.output}" if len(hasil) else "(tidak ada file ditulis)"
+    print(f"{n_ok}/{len(jobs)} job selesai dalam {durasi:.2f} s dengan {args.workers} worker "
+          f"({n_ok / durasi:.1f} job/s, {len(hasil)} baris) {tujuan}")
+    for _, e in errors.iterrows():
+        print(f"  GAGAL {e['outlet']} [{e['skenario']}]: {e['error']}", file=sys.stderr)
+    return 1 if len(errors) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
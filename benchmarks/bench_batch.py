@@ -0,0 +1,77 @@
+"""
+Benchmark skalabilitas batch_forecast: throughput (job/s) untuk 1, 2, 4 worker.
+
+Histori & model sintetis (seperti benchmarks.suite) ditulis ke folder sementara,
+lalu manifest berisi `--jobs` job (tanggal awal & cuaca berbeda -> tanpa cache hit)
+dijalankan dengan run_batch. Waktu termasuk start pool & pemuatan resource di worker.
+Percepatan mendekati linear hanya bisa terlihat bila jumlah core >= jumlah worker.
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_batch [--jobs 64] [--days 30] [--workers 1 2 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import batch_forecast
+import core
+from benchmarks.suite import synthetic_history, synthetic_model
+
+
+def buat_jobs(workdir, n_jobs, days, years, trees, seed=0):
+    data_path = os.path.join(workdir, 'history.xlsx')
+    model_path = os.path.join(workdir, 'model.pkl')
+    df = synthetic_history(years, seed)
+    df.to_excel(data_path, index=False)
+    joblib.dump(synthetic_model(df, trees), model_path)
+
+    rng = np.random.default_rng(seed)
+    start = df['Tanggal'].max() + pd.Timedelta(days=1)
+    return pd.DataFrame({
+        'outlet': [f'outlet_{i:03d}' for i in range(n_jobs)],
+        'skenario': 'default',
+        'dataset': data_path,
+        'model': model_path,
+        'start': start + pd.to_timedelta(np.arange(n_jobs) % 7, unit='D'),
+        'days': days,
+        'suhu': np.round(rng.uniform(24, 32, n_jobs), 2),
+        'hujan': np.round(rng.uniform(0, 20, n_jobs), 2),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=64)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--years', type=float, default=3)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='prediksirf_batch_') as workdir:
+        jobs = buat_jobs(workdir, args.jobs, args.days, args.years, args.trees)
+        core.prepare_dataset_cache(jobs['dataset'].iloc[0])
+
+        print(f"{args.jobs} job x {args.days} hari, {args.trees} pohon, {os.cpu_count()} core")
+        print(f"{'worker':>7} {'waktu':>9} {'job/s':>8} {'percepatan':>11}")
+        dasar = None
+        for workers in args.workers:
+            # Mulai dingin tiap kali: worker (dan proses ini untuk 1 worker) memuat ulang resource
+            batch_forecast._resources.clear()
+            core.clear_result_caches()
+            t0 = time.perf_counter()
+            hasil, errors = batch_forecast.run_batch(jobs, workers)
+            durasi = time.perf_counter() - t0
+            assert len(errors) == 0 and len(hasil) == args.jobs * args.days
+            laju = args.jobs / durasi
+            dasar = dasar or laju
+            print(f"{workers:>7} {durasi:7.2f} s {laju:8.1f} {laju / dasar:10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark grafik tren Aktual vs Prediksi (Perbandingan): semua titik harian vs
+disederhanakan di server (core.downsample, LTTB / min-max) sebelum dikirim ke browser.
+
+Diukur ukuran JSON Plotly yang dikirim Streamlit dan waktu membangun figure +
+serialisasi. Waktu render di browser sebanding dengan jumlah titik yang dikirim.
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_chart [--repeat 5] [--points 500]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.downsample import downsample_frame
+from views.perbandingan import buat_grafik_tren
+
+
+def _timeit(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def data_sintetis(hari, seed=0):
+    rng = np.random.default_rng(seed)
+    aktual = rng.integers(8_000_000, 25_000_000, hari).astype(float)
+    return pd.DataFrame({
+        'Tanggal': pd.date_range('2015-01-01', periods=hari, freq='D'),
+        'Total Omzet': aktual,
+        'Prediksi': aktual * rng.normal(1.0, 0.15, hari),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--points', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'Periode':>9} {'metode':>7} {'titik':>6} {'JSON':>10} {'waktu':>10} {'puncak ok':>10}")
+    for label, hari in [('1 tahun', 366), ('5 tahun', 1827), ('10 tahun', 3653)]:
+        df = data_sintetis(hari)
+        puncak = df['Total Omzet'].max()
+        for metode in ['penuh', 'lttb', 'minmax']:
+            if metode == 'penuh':
+                siapkan = lambda: df
+            else:
+                siapkan = lambda: downsample_frame(df, 'Tanggal', ['Total Omzet', 'Prediksi'], args.points, metode)
+            t, payload = _timeit(lambda: buat_grafik_tren(siapkan(), maks_titik=None)[0].to_json(), args.repeat)
+            df_plot = siapkan()
+            ok = df_plot['Total Omzet'].max() == puncak
+            print(f"{label:>9} {metode:>7} {len(df_plot):>6} {len(payload) / 1024:8.1f}KB {t * 1000:8.2f}ms {'ya' if ok else 'tidak':>10}")
+
+
+if __name__ == '__main__':
+    main()
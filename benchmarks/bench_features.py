@@ -0,0 +1,103 @@
+"""
+Benchmark konstruksi fitur: cara lama vs modul features (vektor dari HistoryStore).
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_features [--repeat 5]
+
+- Backtest : salin DataFrame + shift() per kolom (Perbandingan lama) vs features.backtest_features
+- Prediksi : dict per baris + get_val_fast (generate_forecast_data lama) vs features.build_feature_matrix
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from core import features
+from benchmarks.bench_forecast import _get_val, load_data
+from core.history_store import HistoryStore
+
+
+def _timeit(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+# --- REFERENSI LAMA ---
+def backtest_lama(df_historis):
+    df = df_historis.copy()
+    df['Hari'] = df['Tanggal'].dt.day
+    df['Bulan'] = df['Tanggal'].dt.month
+    df['Minggu ke'] = df['Tanggal'].dt.isocalendar().week
+    df['Weekend'] = (df['Tanggal'].dt.weekday >= 5).astype(int)
+    df['Hujan_t-3'] = df['Curah Hujan'].shift(3)
+    df['Hujan_t-7'] = df['Curah Hujan'].shift(7)
+    df['Hujan_t-14'] = df['Curah Hujan'].shift(14)
+    df['Suhu_t-3'] = df['Suhu'].shift(3)
+    df['Suhu_t-7'] = df['Suhu'].shift(7)
+    for col in features.SHIFT_COLS:
+        df[f'{col}_t-7'] = df[col].shift(7)
+        df[f'{col}_t-30'] = df[col].shift(30)
+    df_ready = df.dropna().reset_index(drop=True)
+    return df_ready['Tanggal'], df_ready[features.FEATURE_COLS]
+
+def fitur_per_baris_lama(df_historis, start, days, base_suhu, base_hujan):
+    lookup = df_historis.set_index('Tanggal')[['Suhu', 'Curah Hujan'] + features.SHIFT_COLS].to_dict('index')
+    rows = []
+    for i in range(days):
+        tgt = pd.to_datetime(start) + pd.Timedelta(days=i)
+        row = {
+            'Hari': tgt.day, 'Bulan': tgt.month, 'Minggu ke': tgt.isocalendar()[1], 'Weekend': 1 if tgt.weekday() >= 5 else 0,
+            'Suhu': _get_val(lookup, tgt, 'Suhu', base_suhu),
+            'Curah Hujan': _get_val(lookup, tgt, 'Curah Hujan', base_hujan),
+            'Hujan_t-3': _get_val(lookup, tgt - pd.Timedelta(days=3), 'Curah Hujan', base_hujan),
+            'Hujan_t-7': _get_val(lookup, tgt - pd.Timedelta(days=7), 'Curah Hujan', base_hujan),
+            'Hujan_t-14': _get_val(lookup, tgt - pd.Timedelta(days=14), 'Curah Hujan', base_hujan),
+            'Suhu_t-3': _get_val(lookup, tgt - pd.Timedelta(days=3), 'Suhu', base_suhu),
+            'Suhu_t-7': _get_val(lookup, tgt - pd.Timedelta(days=7), 'Suhu', base_suhu),
+        }
+        for shift in features.SHIFT_COLS:
+            for l in features.LAG_OMZET:
+                row[f'{shift}_t-{l}'] = _get_val(lookup, tgt - pd.Timedelta(days=l), shift, features.DEFAULT_OMZET)
+        rows.append(pd.DataFrame([row])[features.FEATURE_COLS])
+    return pd.concat(rows, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    df = load_data()
+    t_store, store = _timeit(lambda: HistoryStore.from_frame(df), args.repeat)
+
+    # Backtest seluruh histori
+    t_bt_lama, (tgl_lama, X_lama) = _timeit(lambda: backtest_lama(df), args.repeat)
+    t_bt_baru, (tgl_baru, X_baru, _) = _timeit(lambda: features.backtest_features(store), args.repeat)
+    np.testing.assert_array_equal(X_lama.to_numpy(dtype=float), X_baru)
+    np.testing.assert_array_equal(tgl_lama.to_numpy(), tgl_baru.to_numpy())
+
+    # Fitur prediksi 365 hari di dalam rentang histori (semua lag dari histori)
+    start, days = df['Tanggal'].min() + pd.Timedelta(days=30), 365
+
+    def fitur_baru():
+        tanggal, pos, suhu, hujan, omzet = features.forecast_timelines(store, start, days, 27.0, 5.0)
+        return features.build_feature_matrix(tanggal, suhu, hujan, omzet, pos)
+
+    t_fc_lama, F_lama = _timeit(lambda: fitur_per_baris_lama(df, start, days, 27.0, 5.0), args.repeat)
+    t_fc_baru, F_baru = _timeit(fitur_baru, args.repeat)
+    np.testing.assert_array_equal(F_lama.to_numpy(dtype=float), F_baru)
+
+    print(f"Dataset                 : {len(df)} baris, history store dibangun {t_store * 1000:.2f} ms (sekali)")
+    print(f"{'':24} {'lama':>10} {'baru':>10} {'speedup':>9}")
+    print(f"{'Backtest (' + str(len(X_baru)) + ' baris)':24} {t_bt_lama * 1000:8.2f}ms {t_bt_baru * 1000:8.2f}ms {t_bt_lama / t_bt_baru:8.1f}x")
+    print(f"{'Prediksi (' + str(days) + ' hari)':24} {t_fc_lama * 1000:8.2f}ms {t_fc_baru * 1000:8.2f}ms {t_fc_lama / t_fc_baru:8.1f}x")
+    print("Matriks fitur identik   : ya")
+
+
+if __name__ == '__main__':
+    main()
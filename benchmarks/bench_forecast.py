@@ -0,0 +1,163 @@
+"""
+Benchmark prediksi rekursif: loop per hari (versi lama) vs batch per blok 7 hari.
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_forecast [--days 365] [--repeat 3]
+
+Jika 'model_skripsi_multishift.pkl' tidak ada, model RandomForest multi-output
+dilatih sebentar dari TRAIN_80_ANGKA.xlsx agar benchmark tetap bisa dijalankan.
+"""
+import argparse
+import time
+
+import joblib
+import pandas as pd
+
+import core
+from core import features
+
+
+# --- REFERENSI: IMPLEMENTASI LAMA (1 DataFrame + 1 predict per hari) ---
+def _get_val(history_lookup, date_key, col, default):
+    if date_key in history_lookup:
+        val = history_lookup[date_key].get(col)
+        return float(val) if val is not None and pd.notnull(val) else default
+    return default
+
+def generate_forecast_data_lama(model, df_historis, start_date, base_suhu, base_hujan, days=30):
+    results = []
+    history_lookup = {}
+    if df_historis is not None:
+        temp_df = df_historis.set_index('Tanggal')
+        cols_needed = [c for c in temp_df.columns if c in ['Suhu', 'Curah Hujan', 'Omzet Pagi', 'Omzet Siang', 'Omzet Malam', 'Total Omzet']]
+        history_lookup = temp_df[cols_needed].to_dict('index')
+
+    prediction_buffer = {}
+    for i in range(days):
+        tgt = pd.to_datetime(start_date) + pd.Timedelta(days=i)
+        h, b, mk, wd = tgt.day, tgt.month, tgt.isocalendar()[1], tgt.weekday()
+        row_data = {
+            'Hari': h, 'Bulan': b, 'Minggu ke': mk, 'Weekend': 1 if wd >= 5 else 0,
+            'Suhu': _get_val(history_lookup, tgt, 'Suhu', base_suhu),
+            'Curah Hujan': _get_val(history_lookup, tgt, 'Curah Hujan', base_hujan),
+            'Hujan_t-3': _get_val(history_lookup, tgt - pd.Timedelta(days=3), 'Curah Hujan', base_hujan),
+            'Hujan_t-7': _get_val(history_lookup, tgt - pd.Timedelta(days=7), 'Curah Hujan', base_hujan),
+            'Hujan_t-14': _get_val(history_lookup, tgt - pd.Timedelta(days=14), 'Curah Hujan', base_hujan),
+            'Suhu_t-3': _get_val(history_lookup, tgt - pd.Timedelta(days=3), 'Suhu', base_suhu),
+            'Suhu_t-7': _get_val(history_lookup, tgt - pd.Timedelta(days=7), 'Suhu', base_suhu),
+        }
+        for shift in features.SHIFT_COLS:
+            for l in features.LAG_OMZET:
+                lag_date = tgt - pd.Timedelta(days=l)
+                if lag_date in prediction_buffer:
+                    val = prediction_buffer[lag_date][shift]
+                else:
+                    val = _get_val(history_lookup, lag_date, shift, features.DEFAULT_OMZET)
+                row_data[f'{shift}_t-{l}'] = val
+
+        pred = model.predict(pd.DataFrame([row_data])[features.FEATURE_COLS])[0]
+        prediction_buffer[tgt] = {'Omzet Pagi': pred[0], 'Omzet Siang': pred[1], 'Omzet Malam': pred[2]}
+        results.append({
+            'Tanggal': tgt,
+            'Hari_Nama': core.LIST_HARI[wd],
+            'Bulan': b,
+            'Bulan_Nama': core.LIST_BULAN[b - 1],
+            'Tahun': tgt.year,
+            'Prediksi Pagi': pred[0],
+            'Prediksi Siang': pred[1],
+            'Prediksi Malam': pred[2],
+            'Prediksi Total': pred[0] + pred[1] + pred[2],
+            'Suhu': row_data['Suhu'],
+            'Hujan': row_data['Curah Hujan']
+        })
+    return pd.DataFrame(results)
+
+
+# --- PERSIAPAN MODEL & DATA ---
+def load_data(path='TRAIN_80_ANGKA.xlsx'):
+    df = pd.read_excel(path)
+    df.columns = [c.strip() for c in df.columns]
+    df['Tanggal'] = pd.to_datetime(df['Tanggal'])
+    return df.sort_values('Tanggal').reset_index(drop=True)
+
+def load_or_train_model(df, path='model_skripsi_multishift.pkl'):
+    try:
+        return joblib.load(path)
+    except FileNotFoundError:
+        pass
+    from sklearn.ensemble import RandomForestRegressor
+
+    d = df.copy()
+    d['Hari'] = d['Tanggal'].dt.day
+    d['Bulan'] = d['Tanggal'].dt.month
+    d['Minggu ke'] = d['Tanggal'].dt.isocalendar().week
+    d['Weekend'] = (d['Tanggal'].dt.weekday >= 5).astype(int)
+    for l in [3, 7, 14]:
+        d[f'Hujan_t-{l}'] = d['Curah Hujan'].shift(l)
+    for l in [3, 7]:
+        d[f'Suhu_t-{l}'] = d['Suhu'].shift(l)
+    for col in features.SHIFT_COLS:
+        for l in features.LAG_OMZET:
+            d[f'{col}_t-{l}'] = d[col].shift(l)
+    d = d.dropna()
+    model = RandomForestRegressor(n_estimators=100, random_state=42)
+    model.fit(d[features.FEATURE_COLS], d[features.SHIFT_COLS])
+    return model
+
+
+def _timeit(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--start', default=None, help="Tanggal awal (default: 1 Jan setelah data terakhir)")
+    args = parser.parse_args()
+
+    df = load_data()
+    model = load_or_train_model(df)
+    start = pd.to_datetime(args.start) if args.start else df['Tanggal'].max().replace(month=1, day=1) + pd.DateOffset(years=1)
+
+    run_lama = lambda: generate_forecast_data_lama(model, df, start, 27.0, 5.0, days=args.days)
+
+    def run_baru():
+        # Tanpa cache hasil agar yang diukur adalah mesin prediksinya
+        core.clear_forecast_cache()
+        return core.generate_forecast_data(model, df, start, 27.0, 5.0, days=args.days)
+
+    t_lama, out_lama = _timeit(run_lama, args.repeat)
+    t_baru, out_baru = _timeit(run_baru, args.repeat)
+
+    t_cache, _ = _timeit(lambda: core.generate_forecast_data(model, df, start, 27.0, 5.0, days=args.days), args.repeat)
+
+    def run_prefix():
+        # Horizon panjang setelah horizon 31 hari dari tanggal awal yang sama (mis. Bulan -> Tahun)
+        core.clear_forecast_cache()
+        core.generate_forecast_data(model, df, start, 27.0, 5.0, days=31)
+        t0 = time.perf_counter()
+        out = core.generate_forecast_data(model, df, start, 27.0, 5.0, days=args.days)
+        return time.perf_counter() - t0, out
+
+    t_prefix, out_prefix = min((run_prefix() for _ in range(args.repeat)), key=lambda r: r[0])
+    pd.testing.assert_frame_equal(out_lama, out_prefix)
+
+    pd.testing.assert_frame_equal(out_lama, out_baru)
+
+    print(f"Horizon        : {args.days} hari mulai {start.date()}")
+    print(f"Loop per hari  : {t_lama * 1000:9.1f} ms")
+    print(f"Batch per blok : {t_baru * 1000:9.1f} ms")
+    print(f"Speedup        : {t_lama / t_baru:9.1f}x")
+    print(f"Lanjut prefix  : {t_prefix * 1000:9.1f} ms (31 hari pertama dari buffer)")
+    print(f"Cache (ulang)  : {t_cache * 1000:9.2f} ms")
+    print("Hasil identik  : ya")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark waktu impor: paket inti `core` (tanpa Streamlit) vs `utils` (adapter Streamlit).
+Setiap pengukuran memakai interpreter baru agar tidak ada modul yang sudah ter-cache.
+Juga memastikan `import core` tidak ikut memuat dependensi berat.
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_import [--repeat 7]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODUL_BERAT = ['streamlit', 'sklearn', 'joblib', 'plotly', 'openpyxl', 'xlsxwriter']
+
+_SKRIP = """
+import json, sys, time
+t0 = time.perf_counter()
+import {modul}
+dt = time.perf_counter() - t0
+print(json.dumps({{'detik': dt, 'berat': [m for m in {berat!r} if m in sys.modules]}}))
+"""
+
+
+def ukur_impor(modul):
+    out = subprocess.run([sys.executable, '-c', _SKRIP.format(modul=modul, berat=MODUL_BERAT)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    hasil = {}
+    for modul in ['numpy, pandas', 'core', 'utils']:
+        runs = [ukur_impor(modul) for _ in range(args.repeat)]
+        hasil[modul] = statistics.median(r['detik'] for r in runs)
+        print(f"import {modul:<14} {hasil[modul] * 1000:8.1f} ms   modul berat: {', '.join(runs[-1]['berat']) or '-'}")
+    print(f"core / utils         {hasil['core'] / hasil['utils']:8.2f}x")
+
+    assert not ukur_impor('core')['berat'], "import core memuat dependensi berat"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark backend inferensi: model.predict sklearn vs CompiledForest (NumPy murni).
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_inference [--repeat 20]
+
+Memastikan kedua backend sepadan (toleransi float) lalu mengukur waktu untuk
+1 baris, 7 baris (satu blok prediksi) dan seluruh histori (backtest).
+"""
+import argparse
+import time
+
+import numpy as np
+
+import core
+from core import features
+from benchmarks.bench_forecast import load_data, load_or_train_model
+
+
+def _timeit(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    df = load_data()
+    model = load_or_train_model(df)
+
+    t0 = time.perf_counter()
+    compiled = core.compile_model(model)
+    t_compile = time.perf_counter() - t0
+    if compiled is None:
+        raise SystemExit(f"Model {type(model).__name__} tidak bisa dikompilasi")
+
+    # Input acak di sekitar rentang data asli + seluruh baris histori
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.uniform(0, 40, len(df)) for _ in features.FEATURE_COLS[:11]] +
+                        [rng.uniform(1e6, 1e7, len(df)) for _ in features.FEATURE_COLS[11:]])
+
+    pred_sk = core.predict_model(model, X, backend=core.BACKEND_SKLEARN)
+    pred_np = core.predict_model(model, X, backend=core.BACKEND_COMPILED)
+    np.testing.assert_allclose(pred_np, pred_sk, rtol=1e-9)
+    identik = np.array_equal(pred_np, pred_sk)
+
+    print(f"Pohon          : {compiled.n_trees} (kedalaman maks {compiled.max_depth}, {len(compiled.feature)} node)")
+    print(f"Kompilasi      : {t_compile * 1000:9.1f} ms (sekali saat load_resources)")
+    print(f"Sepadan        : ya (identik bit-per-bit: {'ya' if identik else 'tidak'})")
+    print(f"{'Baris':>14} {'sklearn':>11} {'compiled':>11} {'speedup':>9}")
+    for n in [1, 7, len(X)]:
+        sub = X[:n]
+        t_sk = _timeit(lambda: core.predict_model(model, sub, backend=core.BACKEND_SKLEARN), args.repeat)
+        t_np = _timeit(lambda: core.predict_model(model, sub, backend=core.BACKEND_COMPILED), args.repeat)
+        print(f"{n:>14} {t_sk * 1000:9.2f}ms {t_np * 1000:9.2f}ms {t_sk / t_np:8.1f}x")
+
+    def forecast_365():
+        core.clear_forecast_cache()
+        return core.generate_forecast_data(model, df, '2026-01-01', 27.0, 5.0, days=365)
+
+    for backend in [core.BACKEND_SKLEARN, core.BACKEND_COMPILED]:
+        core.set_inference_backend(backend)
+        t = _timeit(forecast_365, 3)
+        print(f"Forecast 365 hari ({backend:>8}): {t * 1000:9.1f} ms")
+
+if __name__ == '__main__':
+    main()
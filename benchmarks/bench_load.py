@@ -0,0 +1,48 @@
+"""
+Benchmark cold start dataset historis: parsing Excel vs salinan biner (history_cache).
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_load [--path TRAIN_80_ANGKA.xlsx] [--repeat 5]
+"""
+import argparse
+import shutil
+import time
+
+import pandas as pd
+
+import core
+from core import history_cache
+
+
+def _timeit(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default=core.DATA_PATH)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    def excel():
+        shutil.rmtree(history_cache.cache_dir(args.path), ignore_errors=True)
+        return core.rapikan_dataset(pd.read_excel(args.path))
+
+    t_excel, df_excel = _timeit(excel, args.repeat)
+    core.load_dataset(args.path)  # menulis cache
+    t_cache, df_cache = _timeit(lambda: core.load_dataset(args.path), args.repeat)
+
+    pd.testing.assert_frame_equal(df_excel, df_cache, check_index_type=False)
+    print(f"Dataset        : {args.path} ({len(df_cache)} baris)")
+    print(f"Parsing Excel  : {t_excel * 1000:9.1f} ms")
+    print(f"Cache biner    : {t_cache * 1000:9.1f} ms (termasuk hash file sumber)")
+    print(f"Speedup        : {t_excel / t_cache:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark tabel 'Rincian Data Harian' (Perbandingan): iterrows + konkatenasi string
+vs utils.render_tabel_selisih (format per kolom, gabung sekali jalan, per halaman).
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_table [--repeat 5]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import utils
+
+
+def _timeit(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+# --- REFERENSI LAMA ---
+def tabel_lama(df_view, total_aktual, total_prediksi, total_selisih):
+    tabel_show = df_view[['Tanggal', 'Total Omzet', 'Prediksi', 'Selisih']].copy()
+    tabel_show['Tanggal'] = tabel_show['Tanggal'].dt.strftime('%d-%m-%Y')
+    html_table = '<table class="styled-table" style="width:100%">'
+    html_table += '<thead><tr><th>Tanggal</th><th>Aktual (Rp)</th><th>Prediksi (Rp)</th><th>Selisih (Rp)</th></tr></thead>'
+    html_table += '<tbody>'
+    for index, row in tabel_show.iterrows():
+        selisih = row['Selisih']
+        aktual = row['Total Omzet']
+        val_aktual = utils.format_rupiah(aktual)
+        val_pred = utils.format_rupiah(row['Prediksi'])
+        val_selisih_num = utils.format_rupiah(abs(selisih))
+        err_rate = abs(selisih) / aktual if aktual != 0 else 1
+        if err_rate < 0.2:
+            color_style = "color: #166534; font-weight: bold;"
+        else:
+            color_style = "color: #991b1b; font-weight: bold;"
+        tanda = "+" if selisih >= 0 else "-"
+        html_table += f"<tr><td>{row['Tanggal']}</td><td>{val_aktual}</td><td>{val_pred}</td><td style='{color_style}'>{tanda} {val_selisih_num}</td></tr>"
+    html_table += f'<tr style="background-color:#e0e7ff; font-weight:bold;"><td>TOTAL PERIODE INI</td><td>{utils.format_rupiah(total_aktual)}</td><td>{utils.format_rupiah(total_prediksi)}</td><td>{utils.format_rupiah(abs(total_selisih))}</td></tr>'
+    html_table += '</tbody></table>'
+    return html_table
+
+
+def data_sintetis(hari, seed=0):
+    rng = np.random.default_rng(seed)
+    aktual = rng.integers(8_000_000, 25_000_000, hari)
+    prediksi = aktual * rng.normal(1.0, 0.15, hari)
+    return pd.DataFrame({
+        'Tanggal': pd.date_range('2020-01-01', periods=hari, freq='D'),
+        'Total Omzet': aktual,
+        'Prediksi': prediksi,
+        'Selisih': aktual - prediksi,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'Periode':>14} {'iterrows':>11} {'vektor':>10} {'1 halaman':>11}")
+    for label, hari in [('1 bulan', 31), ('1 tahun', 366), ('5 tahun', 1827)]:
+        df = data_sintetis(hari)
+        tot = (df['Total Omzet'].sum(), df['Prediksi'].sum(), df['Selisih'].sum())
+        t_lama, html_lama = _timeit(lambda: tabel_lama(df, *tot), args.repeat)
+        t_baru, html_baru = _timeit(lambda: utils.render_tabel_selisih(df, *tot), args.repeat)
+        t_hal, _ = _timeit(lambda: utils.render_tabel_selisih(df, *tot, halaman=1, per_halaman=31), args.repeat)
+        assert html_lama == html_baru, "HTML berbeda"
+        print(f"{label:>14} {t_lama * 1000:9.2f}ms {t_baru * 1000:8.2f}ms {t_hal * 1000:9.2f}ms")
+    print("HTML identik (tanpa paginasi): ya")
+
+
+if __name__ == '__main__':
+    main()
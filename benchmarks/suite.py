@@ -0,0 +1,270 @@
+"""
+Suite benchmark jalur utama aplikasi, dijalankan tanpa server Streamlit.
+
+Data historis (multi-tahun) dan model RandomForest multi-output dibuat secara
+sintetis dengan seed tetap, lalu diukur:
+  load_cold / load_warm   : load_resources (parsing Excel / salinan biner)
+  forecast_1 ... _365     : generate_forecast_data per horizon (tanpa cache hasil)
+  scenario_1000x30        : 1000 skenario cuaca Monte Carlo x 30 hari (P10/P50/P90)
+  backtest                : backtest seluruh histori (halaman Perbandingan)
+  export_excel            : ekspor laporan prediksi 365 hari ke Excel
+
+Untuk tiap kasus dicatat waktu (median & terbaik), throughput dan memori puncak
+(tracemalloc, pada run terpisah agar tidak mengganggu pengukuran waktu).
+
+Jalankan dari root proyek:
+    python -m benchmarks.suite [--years 5] [--trees 100] [--repeat 5]
+    python -m benchmarks.suite --save laptop          # simpan baseline JSON
+    python -m benchmarks.suite --compare laptop       # bandingkan dengan baseline
+
+Baseline disimpan di benchmarks/baselines/<nama>.json. Dengan --compare, kasus
+yang median-nya lebih lambat dari baseline * (1 + toleransi) ditandai REGRESI
+dan proses keluar dengan kode 1.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+import core
+from core import features, history_cache
+from core import forecast as core_forecast
+from core.history_store import HistoryStore
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+HORIZONS = [1, 7, 30, 365]
+
+
+# --- DATA & MODEL SINTETIS ---
+def synthetic_history(years=5, seed=0, start='2019-01-01', missing=0.02):
+    """Histori harian dengan pola musiman + mingguan, beberapa hari sengaja hilang."""
+    rng = np.random.default_rng(seed)
+    tanggal = pd.date_range(start, periods=int(round(365.25 * years)), freq='D')
+    n = len(tanggal)
+    doy = tanggal.dayofyear.to_numpy()
+    musim = np.sin(2 * np.pi * doy / 365.25)
+    weekend = tanggal.weekday >= 5
+
+    suhu = np.round(27 + 1.5 * musim + rng.normal(0, 0.8, n), 2)
+    hujan = np.round(np.maximum(0, rng.gamma(0.6, 12, n) * (1 - 0.6 * musim)), 2)
+    tren = np.linspace(1.0, 1.3, n)
+    faktor = tren * (1 + 0.15 * weekend) * (1 - 0.004 * hujan)
+    pagi = (4_500_000 * faktor * rng.lognormal(0, 0.12, n)).round(-3).astype(np.int64)
+    siang = (5_500_000 * faktor * rng.lognormal(0, 0.12, n)).round(-3).astype(np.int64)
+    malam = (4_000_000 * faktor * rng.lognormal(0, 0.12, n)).round(-3).astype(np.int64)
+
+    df = pd.DataFrame({
+        'Tanggal': tanggal,
+        'Hari': tanggal.day,
+        'Bulan': tanggal.month,
+        'Minggu ke': tanggal.isocalendar().week.to_numpy(dtype=np.int64),
+        'Weekend': weekend.astype(np.int64),
+        'Suhu': suhu,
+        'Curah Hujan': hujan,
+        'Omzet Pagi': pagi,
+        'Omzet Siang': siang,
+        'Omzet Malam': malam,
+        'Total Omzet': pagi + siang + malam,
+    })
+    return df[rng.random(n) >= missing].reset_index(drop=True)
+
+
+def synthetic_model(df, trees=100, seed=42):
+    """RandomForest multi-output [Pagi, Siang, Malam] dilatih dengan fitur seperti pelatihan asli."""
+    from sklearn.ensemble import RandomForestRegressor
+
+    store = HistoryStore.from_frame(df)
+    tanggal, X, _ = features.backtest_features(store)
+    off = store.offset(tanggal)
+    y = np.column_stack([store.values[c][off] for c in features.SHIFT_COLS])
+    model = RandomForestRegressor(n_estimators=trees, random_state=seed, n_jobs=-1)
+    model.fit(pd.DataFrame(X, columns=features.FEATURE_COLS), y)
+    model.set_params(n_jobs=None)
+    return model
+
+
+# --- PENGUKURAN ---
+def measure(fn, repeat, setup=None):
+    """Jalankan `fn` sebanyak `repeat` kali -> (daftar waktu, hasil terakhir, memori puncak MB)."""
+    waktu = []
+    out = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        out = fn()
+        waktu.append(time.perf_counter() - t0)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return waktu, out, peak / 2**20
+
+
+def ringkas(waktu, jumlah, satuan, peak_mb):
+    median = statistics.median(waktu)
+    return {
+        'median_s': median,
+        'best_s': min(waktu),
+        'runs': len(waktu),
+        'items': jumlah,
+        'unit': satuan,
+        'throughput': jumlah / median if median > 0 else float('inf'),
+        'peak_mb': peak_mb,
+    }
+
+
+def run_suite(workdir, years=5, trees=100, repeat=5, seed=0):
+    data_path = os.path.join(workdir, 'history.xlsx')
+    model_path = os.path.join(workdir, 'model.pkl')
+
+    df_src = synthetic_history(years, seed)
+    df_src.to_excel(data_path, index=False)
+    joblib.dump(synthetic_model(df_src, trees, seed=42), model_path)
+
+    hasil = {}
+
+    # Load dingin: salinan biner dihapus sebelum tiap run -> parsing Excel + tulis sidecar
+    hapus_sidecar = lambda: shutil.rmtree(history_cache.cache_dir(data_path), ignore_errors=True)
+    waktu, (model, df), peak = measure(lambda: core.load_resources_from(model_path, data_path),
+                                       repeat, setup=hapus_sidecar)
+    hasil['load_cold'] = ringkas(waktu, len(df), 'rows', peak)
+    core.load_resources_from(model_path, data_path)
+    waktu, (model, df), peak = measure(lambda: core.load_resources_from(model_path, data_path), repeat)
+    hasil['load_warm'] = ringkas(waktu, len(df), 'rows', peak)
+
+    # Prediksi dimulai sehari setelah data terakhir (kasus dashboard)
+    start = df['Tanggal'].max() + pd.Timedelta(days=1)
+    df_forecast = None
+    for days in HORIZONS:
+        waktu, df_forecast, peak = measure(
+            lambda: core.generate_forecast_data(model, df, start, 27.0, 5.0, days=days),
+            repeat, setup=core.clear_forecast_cache)
+        hasil[f'forecast_{days}'] = ringkas(waktu, days, 'days', peak)
+
+    # 1000 skenario cuaca x 30 hari (mode Monte Carlo di dashboard)
+    waktu, _, peak = measure(
+        lambda: core.generate_scenario_forecast(model, df, start, days=30, n_scenarios=1000).harian(),
+        repeat, setup=core.clear_scenario_cache)
+    hasil['scenario_1000x30'] = ringkas(waktu, 1000 * 30, 'days', peak)
+
+    waktu, bt, peak = measure(lambda: core.get_backtest(model, df), repeat,
+                              setup=core.clear_result_caches)
+    hasil['backtest'] = ringkas(waktu, len(bt.harian), 'rows', peak)
+
+    waktu, _, peak = measure(lambda: core.to_excel(df_forecast), repeat)
+    hasil['export_excel'] = ringkas(waktu, len(df_forecast), 'rows', peak)
+
+    meta = {
+        'years': years,
+        'trees': trees,
+        'repeat': repeat,
+        'seed': seed,
+        'history_rows': len(df),
+        'backend': core_forecast.INFERENCE_BACKEND,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': pd.Timestamp.now().isoformat(timespec='seconds'),
+    }
+    return {'meta': meta, 'results': hasil}
+
+
+# --- BASELINE JSON ---
+def baseline_path(nama):
+    return nama if nama.endswith('.json') else os.path.join(BASELINE_DIR, nama + '.json')
+
+def save_baseline(laporan, nama):
+    path = baseline_path(nama)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(laporan, f, indent=2)
+    return path
+
+def load_baseline(nama):
+    with open(baseline_path(nama)) as f:
+        return json.load(f)
+
+
+def cetak(laporan, baseline=None, toleransi=0.2):
+    """Mencetak tabel hasil; mengembalikan daftar kasus yang regresi terhadap baseline."""
+    meta = laporan['meta']
+    print(f"Histori {meta['history_rows']} baris ({meta['years']} tahun), {meta['trees']} pohon, "
+          f"backend {meta['backend']}, {meta['repeat']} run")
+    kepala = f"{'Kasus':<16} {'median':>10} {'terbaik':>10} {'throughput':>18} {'puncak':>9}"
+    if baseline:
+        kepala += f" {'vs baseline':>12}"
+    print(kepala)
+
+    regresi = []
+    for nama, r in laporan['results'].items():
+        baris = (f"{nama:<16} {r['median_s'] * 1000:8.2f}ms {r['best_s'] * 1000:8.2f}ms "
+                 f"{r['throughput']:>11,.0f} {r['unit'] + '/s':<6} {r['peak_mb']:7.1f}MB")
+        lama = baseline['results'].get(nama) if baseline else None
+        if lama:
+            rasio = r['median_s'] / lama['median_s']
+            tanda = ''
+            if rasio > 1 + toleransi:
+                tanda = ' REGRESI'
+                regresi.append(nama)
+            baris += f" {rasio:10.2f}x{tanda}"
+        print(baris)
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=float, default=5)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', choices=[core.BACKEND_COMPILED, core.BACKEND_SKLEARN], default=None)
+    parser.add_argument('--workdir', default=None, help="Folder data sintetis (default: folder sementara)")
+    parser.add_argument('--save', metavar='NAMA', help="Simpan hasil sebagai baseline JSON")
+    parser.add_argument('--compare', metavar='NAMA', help="Bandingkan dengan baseline JSON")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Batas perlambatan sebelum dianggap regresi")
+    parser.add_argument('--json', metavar='PATH', help="Tulis laporan lengkap ke file JSON")
+    args = parser.parse_args()
+
+    if args.backend:
+        core.set_inference_backend(args.backend)
+
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        laporan = run_suite(args.workdir, args.years, args.trees, args.repeat, args.seed)
+    else:
+        with tempfile.TemporaryDirectory(prefix='prediksirf_bench_') as workdir:
+            laporan = run_suite(workdir, args.years, args.trees, args.repeat, args.seed)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    regresi = cetak(laporan, baseline, args.tolerance)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(laporan, f, indent=2)
+    if args.save:
+        print(f"Baseline disimpan: {save_baseline(laporan, args.save)}")
+    if regresi:
+        print(f"Regresi (> {args.tolerance:.0%} lebih lambat): {', '.join(regresi)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
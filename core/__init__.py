@@ -0,0 +1,26 @@
+"""
+Inti aplikasi tanpa Streamlit: pemuatan data, fitur, prediksi, backtest & metrik.
+
+Dipakai oleh app.py/views (lewat utils.load_resources yang di-cache Streamlit),
+batch_forecast.py, dan benchmark. Dependensi berat (joblib/sklearn, xlsxwriter,
+openpyxl) baru dimuat saat fungsi yang membutuhkannya dipanggil.
+"""
+from .data import (
+    MODEL_PATH, DATA_PATH, DATA_PATH_CSV,
+    rapikan_dataset, load_dataset, save_dataset, load_resources_from, prepare_dataset_cache,
+    lengkapi_kolom, merge_history, read_delta, append_dataset, compact_dataset, upsert_history,
+)
+from .forecast import (
+    LIST_HARI, LIST_BULAN, BACKEND_COMPILED, BACKEND_SKLEARN,
+    set_inference_backend, compile_model, predict_model, predict_per_tree, INTERVAL_KUANTIL,
+    history_store, dataset_fingerprint, model_token,
+    generate_forecast_data, generate_30_days_data, get_backtest,
+    clear_forecast_cache, clear_result_caches,
+)
+from .scenario import generate_scenario_forecast, clear_scenario_cache
+from .climatology import climatology
+from .ingest import normalize_column_names, ingest_file, KolomHilangError, FormatTanggalError
+from .training import fit_model, save_model_atomic, start_retraining, current_job
+from .export import to_excel, to_csv, to_parquet, export_report, export_mime, clear_export_cache
+from .report import build_monthly_report
+from .downsample import MAKS_TITIK, downsample_frame, lttb_indices, minmax_indices
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from . import features
+from . import profiling
+
+
+# --- BACKTEST SELURUH HISTORI ---
+# Dihitung sekali per (dataset, model); halaman Perbandingan cukup memotong hasilnya
+# per tahun/bulan tanpa memanggil model lagi.
+class BacktestResult:
+    def __init__(self, harian, bulanan, tahunan):
+        self.harian = harian    # per hari: Tanggal, Total Omzet, Prediksi (per shift & total), Selisih, Tahun, Bulan_Angka
+        self.bulanan = bulanan  # per (Tahun, Bulan_Angka): total, MAPE, RMSE, R2
+        self.tahunan = tahunan  # per Tahun: total, MAPE, RMSE, R2
+
+    def periode(self, tahun, bulan=None):
+        """Baris harian untuk satu bulan, atau satu tahun penuh jika bulan=None (slice dari cache)."""
+        h = self.harian
+        mask = h['Tahun'] == tahun
+        if bulan is not None:
+            mask &= h['Bulan_Angka'] == bulan
+        return h[mask]
+
+    def metrik(self, tahun, bulan=None):
+        """Satu baris metrik bulanan/tahunan (Series) atau None."""
+        if bulan is None:
+            row = self.tahunan[self.tahunan['Tahun'] == tahun]
+        else:
+            b = self.bulanan
+            row = b[(b['Tahun'] == tahun) & (b['Bulan_Angka'] == bulan)]
+        return None if row.empty else row.iloc[0]
+
+
+def run_backtest(model, store, predict):
+    """
+    Prediksi seluruh histori dengan fitur saat pelatihan (lag berbasis baris).
+    `predict(model, X)` = fungsi inferensi (mis. utils.predict_model).
+    """
+    with profiling.stage('backtest.features'):
+        tanggal, X, total_omzet = features.backtest_features(store)
+    harian = pd.DataFrame({'Tanggal': tanggal, 'Total Omzet': total_omzet})
+    if len(harian) == 0:
+        return BacktestResult(harian, metrics_by(harian, KUNCI_BULAN), metrics_by(harian, KUNCI_TAHUN))
+
+    # Prediksi Multi-Output [Pagi, Siang, Malam]
+    y_pred = np.asarray(predict(model, X)).reshape(len(harian), -1)
+    for j, col in enumerate(features.SHIFT_COLS[:y_pred.shape[1]]):
+        harian['Prediksi ' + col.replace('Omzet ', '')] = y_pred[:, j]
+    harian['Prediksi'] = y_pred.sum(axis=1)
+    harian['Selisih'] = harian['Total Omzet'] - harian['Prediksi']
+    harian['Tahun'] = harian['Tanggal'].dt.year
+    harian['Bulan_Angka'] = harian['Tanggal'].dt.month
+    with profiling.stage('backtest.metrics'):
+        bulanan, tahunan = metrics_by(harian, KUNCI_BULAN), metrics_by(harian, KUNCI_TAHUN)
+    return BacktestResult(harian, bulanan, tahunan)
+
+
+# --- METRIK EVALUASI PER PERIODE (VEKTOR) ---
+# Rumus mengikuti sklearn.metrics (mean_squared_error, mean_absolute_percentage_error,
+# r2_score) tetapi dihitung untuk semua periode sekaligus dengan groupby.
+KUNCI_BULAN = ['Tahun', 'Bulan_Angka']
+KUNCI_TAHUN = ['Tahun']
+
+def metrics_by(harian, kunci):
+    kolom = kunci + ['Jumlah Hari', 'Total Aktual', 'Total Prediksi', 'MAPE', 'RMSE', 'R2']
+    if len(harian) == 0:
+        return pd.DataFrame(columns=kolom)
+
+    y = harian['Total Omzet'].to_numpy(dtype=float)
+    p = harian['Prediksi'].to_numpy(dtype=float)
+    d = pd.DataFrame({
+        **{k: harian[k].to_numpy() for k in kunci},
+        'y': y,
+        'p': p,
+        'se': (y - p) ** 2,
+        'ape': np.abs(y - p) / np.maximum(np.abs(y), np.finfo(np.float64).eps),
+    })
+    g = d.groupby(kunci, sort=True)
+    hasil = g.agg(n=('y', 'size'), total_y=('y', 'sum'), total_p=('p', 'sum'),
+                  mse=('se', 'mean'), mape=('ape', 'mean'), ss_res=('se', 'sum'))
+    d['dev2'] = (d['y'] - g['y'].transform('mean')) ** 2
+    ss_tot = d.groupby(kunci, sort=True)['dev2'].sum()
+
+    # R2 (force_finite seperti sklearn): varians nol -> 1.0 jika sempurna, selain itu 0.0
+    ss_res = hasil['ss_res'].to_numpy()
+    ss_tot = ss_tot.to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(ss_tot != 0, 1 - ss_res / ss_tot, np.where(ss_res == 0, 1.0, 0.0))
+    r2 = np.where(hasil['n'].to_numpy() < 2, np.nan, r2)
+
+    hasil = hasil.reset_index()
+    return pd.DataFrame({
+        **{k: hasil[k] for k in kunci},
+        'Jumlah Hari': hasil['n'],
+        'Total Aktual': hasil['total_y'],
+        'Total Prediksi': hasil['total_p'],
+        'MAPE': hasil['mape'],
+        'RMSE': np.sqrt(hasil['mse']),
+        'R2': r2,
+    })[kolom]
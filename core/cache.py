@@ -0,0 +1,47 @@
+import threading
+from collections import OrderedDict
+
+
+# --- CACHE LRU DENGAN BATAS UKURAN ---
+# Dipakai untuk hasil komputasi yang mahal (prediksi, dll.) di luar st.cache_*,
+# karena kuncinya butuh sidik jari dataset/model yang dihitung sendiri.
+# Streamlit menjalankan tiap sesi di thread terpisah -> akses dikunci.
+class LRUCache:
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def items(self):
+        """Salinan (kunci, nilai) dari yang terlama ke terbaru."""
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .cache import LRUCache
+from .forecast import history_store
+
+
+# --- KLIMATOLOGI BULANAN ---
+# Ringkasan per bulan kalender untuk tiap variabel cuaca: rata-rata, simpangan baku,
+# jumlah hari dan korelasi dengan Total Omzet. Yang disimpan adalah jumlah-jumlah
+# (n, Σx, Σx², Σy, Σy², Σxy) per bulan; jumlah bisa dikurangi/ditambah, jadi upsert
+# histori cukup memproses hari yang berubah tanpa menghitung ulang seluruh dataset.
+# Indeks bulan 0 = seluruh histori (fallback bila data bulan tsb terlalu sedikit).
+KOLOM_CUACA = ['Suhu', 'Curah Hujan']
+KOLOM_TARGET = 'Total Omzet'
+MIN_HARI_BULAN = 10
+
+# Urutan kolom array jumlah (13, 9): statistik x sendiri, lalu pasangan (x, y) lengkap
+N_X, SX, SXX, N_P, PX, PY, PXX, PYY, PXY = range(9)
+
+
+def _kontribusi(bulan, x, y):
+    """Jumlah-jumlah (13, 9) per bulan dari nilai x, y (sudah digeser acuan); NaN dilewati."""
+    ada_x = ~np.isnan(x)
+    pasangan = ada_x & ~np.isnan(y)
+    x0 = np.where(ada_x, x, 0.0)
+    xp = np.where(pasangan, x, 0.0)
+    yp = np.where(pasangan, y, 0.0)
+    bobot = [ada_x, x0, x0 * x0, pasangan, xp, yp, xp * xp, yp * yp, xp * yp]
+    out = np.stack([np.bincount(bulan, weights=w.astype(float), minlength=13) for w in bobot], axis=1)
+    out[0] = out[1:].sum(axis=0)
+    return out
+
+def _hari_per_bulan(bulan):
+    hari = np.bincount(bulan, minlength=13).astype(float)
+    hari[0] = hari[1:].sum()
+    return hari
+
+def _baris_store(store, offsets):
+    """Bulan & nilai kolom pada hari `offsets` yang ada di store (hari kosong dibuang)."""
+    offsets = np.asarray(offsets, dtype=np.intp)
+    offsets = offsets[(offsets >= 0) & (offsets < store.n_days)]
+    offsets = offsets[store.valid[offsets]]
+    bulan = (store.start + pd.to_timedelta(offsets, unit='D')).month.to_numpy() if len(offsets) else np.zeros(0, dtype=np.intp)
+    kosong = np.full(len(offsets), np.nan)
+    nilai = {col: (store.values[col][offsets] if col in store.values else kosong)
+             for col in KOLOM_CUACA + [KOLOM_TARGET]}
+    return bulan, nilai
+
+
+class Climatology:
+    def __init__(self, hari, jumlah, acuan):
+        self.hari = hari        # (13,) jumlah hari histori per bulan (indeks 0 = seluruh)
+        self.jumlah = jumlah    # {kolom cuaca: (13, 9) jumlah tergeser, lihat _kontribusi}
+        self.acuan = acuan      # {kolom: nilai geser} agar Σx² tidak kehilangan presisi
+        self._hitung_statistik()
+
+    @classmethod
+    def from_store(cls, store):
+        if store.start is None:
+            bulan, nilai = np.zeros(0, dtype=np.intp), {c: np.zeros(0) for c in KOLOM_CUACA + [KOLOM_TARGET]}
+        else:
+            bulan, nilai = _baris_store(store, np.arange(store.n_days))
+        acuan = {col: float(np.nanmean(v)) if np.isfinite(v).any() else 0.0 for col, v in nilai.items()}
+        y = nilai[KOLOM_TARGET] - acuan[KOLOM_TARGET]
+        jumlah = {col: _kontribusi(bulan, nilai[col] - acuan[col], y) for col in KOLOM_CUACA}
+        return cls(_hari_per_bulan(bulan), jumlah, acuan)
+
+    def upsert(self, store_lama, store_baru, tanggal):
+        """
+        Klimatologi untuk `store_baru`, yang berbeda dari `store_lama` hanya pada `tanggal`.
+        Kontribusi hari lama dikurangi, hari baru ditambah; objek ini tidak diubah.
+        """
+        tanggal = pd.DatetimeIndex(tanggal).normalize().unique()
+        hari, jumlah = self.hari.copy(), {col: arr.copy() for col, arr in self.jumlah.items()}
+        for store, tanda in ((store_lama, -1.0), (store_baru, 1.0)):
+            if store.start is None:
+                continue
+            bulan, nilai = _baris_store(store, store.offset(tanggal))
+            hari += tanda * _hari_per_bulan(bulan)
+            y = nilai[KOLOM_TARGET] - self.acuan[KOLOM_TARGET]
+            for col in KOLOM_CUACA:
+                jumlah[col] += tanda * _kontribusi(bulan, nilai[col] - self.acuan[col], y)
+        return Climatology(hari, jumlah, self.acuan)
+
+    def _hitung_statistik(self):
+        # Semua bulan & variabel dihitung sekali; ringkasan() tinggal mengambil elemen
+        self._stat = {}
+        for col, j in self.jumlah.items():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                n = j[:, N_X]
+                rata = j[:, SX] / n + self.acuan[col]
+                var = np.maximum(j[:, SXX] - j[:, SX] ** 2 / n, 0) / (n - 1)
+                std = np.where(n >= 2, np.sqrt(var), np.nan)
+
+                n_p = j[:, N_P]
+                vx = j[:, PXX] - j[:, PX] ** 2 / n_p
+                vy = j[:, PYY] - j[:, PY] ** 2 / n_p
+                cov = j[:, PXY] - j[:, PX] * j[:, PY] / n_p
+                korelasi = np.clip(cov / np.sqrt(vx * vy), -1.0, 1.0)
+                # Variabel konstan tidak punya korelasi -> 0 (sisa pembulatan diabaikan)
+                konstan = (vx <= 1e-10 * j[:, PXX]) | (vy <= 1e-10 * j[:, PYY])
+                korelasi = np.where(n_p < 2, np.nan, np.where(konstan, 0.0, korelasi))
+            self._stat[col] = (n, rata, std, korelasi)
+
+    def ringkasan(self, bulan, kolom):
+        """
+        Statistik `kolom` untuk bulan kalender `bulan` (dict). Bila bulan tsb punya kurang
+        dari MIN_HARI_BULAN hari, dipakai seluruh histori ('bulan' = 0).
+        """
+        if self.hari[bulan] < MIN_HARI_BULAN:
+            bulan = 0
+        n, rata, std, korelasi = self._stat[kolom]
+        return {'bulan': bulan, 'hari': int(self.hari[bulan]), 'n': int(n[bulan]),
+                'mean': float(rata[bulan]), 'std': float(std[bulan]), 'corr': float(korelasi[bulan])}
+
+    def tabel(self):
+        """Tabel per (Bulan, Variabel): Jumlah Hari, Rata-rata, Simpangan Baku, Korelasi Omzet."""
+        baris = []
+        for col, (n, rata, std, korelasi) in self._stat.items():
+            baris.append(pd.DataFrame({
+                'Bulan': np.arange(1, 13), 'Variabel': col, 'Jumlah Hari': n[1:].astype('int64'),
+                'Rata-rata': rata[1:], 'Simpangan Baku': std[1:], 'Korelasi Omzet': korelasi[1:],
+            }))
+        return pd.concat(baris, ignore_index=True)
+
+
+# --- CACHE PER VERSI DATASET ---
+CLIMATOLOGY_CACHE_SIZE = 4
+_climatology_cache = LRUCache(maxsize=CLIMATOLOGY_CACHE_SIZE)
+
+def climatology(df_historis):
+    """Klimatologi bulanan `df_historis`; dibangun sekali per versi dataset."""
+    store = history_store(df_historis)
+    hasil = _climatology_cache.get(store.versi)
+    if hasil is None:
+        with profiling.stage('climatology'):
+            hasil = Climatology.from_store(store)
+        _climatology_cache.put(store.versi, hasil)
+    return hasil
+
+def carry_over_climatology(store_lama, store_baru, tanggal):
+    """Dipanggil setelah upsert: perbarui klimatologi versi lama (jika ada) untuk versi baru."""
+    lama = _climatology_cache.get(store_lama.versi)
+    if lama is not None:
+        with profiling.stage('climatology.upsert'):
+            _climatology_cache.put(store_baru.versi, lama.upsert(store_lama, store_baru, tanggal))
@@ -0,0 +1,107 @@
+import numpy as np
+
+
+# --- INFERENSI RANDOM FOREST TANPA SKLEARN (NUMPY MURNI) ---
+# Semua pohon diratakan menjadi array node yang bersebelahan (contiguous) sekali saja,
+# lalu baris input ditelusuri secara vektor untuk semua pohon sekaligus.
+# Tujuannya menghilangkan biaya tetap model.predict (validasi input, dispatch joblib
+# per pohon) yang mendominasi pemanggilan dengan sedikit baris.
+class CompiledForest:
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, max_depth, n_features):
+        self.feature = feature            # (total_node,) indeks fitur, 0 untuk daun
+        self.threshold = threshold        # (total_node,) ambang split, +inf untuk daun
+        self.left = left                  # (total_node,) indeks global anak kiri (daun -> dirinya sendiri)
+        self.right = right                # (total_node,) indeks global anak kanan (daun -> dirinya sendiri)
+        self.missing_left = missing_left  # (total_node,) arah nilai NaN
+        self.value = value                # (total_node, n_outputs) nilai prediksi tiap node
+        self.roots = roots                # (n_trees,) indeks global akar tiap pohon
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.is_leaf = left == np.arange(len(left))
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_outputs(self):
+        return self.value.shape[1]
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        Meratakan RandomForestRegressor / ExtraTreesRegressor (termasuk multi-output).
+        Melempar TypeError jika model bukan forest regresi sklearn.
+        """
+        estimators = getattr(model, 'estimators_', None)
+        if not estimators or not all(hasattr(est, 'tree_') for est in estimators):
+            raise TypeError(f"Model {type(model).__name__} tidak didukung untuk inferensi terkompilasi")
+
+        feature, threshold, left, right, missing_left, value, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for est in estimators:
+            tree = est.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            idx = np.arange(n)
+
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, idx, tree.children_left) + offset)
+            right.append(np.where(is_leaf, idx, tree.children_right) + offset)
+            mgl = getattr(tree, 'missing_go_to_left', None)
+            missing_left.append(np.zeros(n, dtype=bool) if mgl is None else mgl.astype(bool))
+            # tree_.value berbentuk (node, n_outputs, 1) untuk regresi
+            value.append(tree.value[:, :, 0])
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(feature), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(left), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(right), dtype=np.intp),
+            missing_left=np.concatenate(missing_left),
+            value=np.ascontiguousarray(np.concatenate(value), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+        )
+
+    def apply(self, X):
+        """Indeks global daun untuk tiap (pohon, baris) -> array (n_trees, n_rows)."""
+        # sklearn membandingkan input float32 dengan threshold float64
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Input harus berbentuk (n, {self.n_features}), diterima {X.shape}")
+
+        n_rows = X.shape[0]
+        # Pasangan (pohon, baris) diratakan; hanya pasangan yang belum sampai daun diproses
+        node = np.repeat(self.roots, n_rows)
+        rows = np.tile(np.arange(n_rows), self.n_trees)
+        aktif = np.flatnonzero(~self.is_leaf[node])
+        ada_nan = np.isnan(X).any()
+        while aktif.size:
+            n = node[aktif]
+            x = X[rows[aktif], self.feature[n]]
+            go_left = x <= self.threshold[n]
+            if ada_nan:
+                go_left = np.where(np.isnan(x), self.missing_left[n], go_left)
+            n = np.where(go_left, self.left[n], self.right[n])
+            node[aktif] = n
+            aktif = aktif[~self.is_leaf[n]]
+        return node.reshape(self.n_trees, n_rows)
+
+    def predict_per_tree(self, X):
+        """Prediksi tiap pohon -> array (n_trees, n_rows, n_outputs)."""
+        return self.value[self.apply(X)]
+
+    def predict(self, X):
+        """Rata-rata seluruh pohon, bentuk keluaran sama dengan model.predict sklearn."""
+        # Penjumlahan berurutan per pohon (sama seperti akumulasi di sklearn)
+        out = self.predict_per_tree(X).sum(axis=0)
+        out /= self.n_trees
+        return out[:, 0] if self.n_outputs == 1 else out
@@ -0,0 +1,215 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from . import history_cache
+from . import profiling
+from .climatology import carry_over_climatology
+from .forecast import compile_model, history_store, remember_history_store, carry_over_caches
+from .history_store import fingerprint_frame
+
+
+# --- LOAD RESOURCES (TANPA STREAMLIT) ---
+MODEL_PATH = 'model_skripsi_multishift.pkl'
+DATA_PATH = 'TRAIN_80_ANGKA.xlsx'
+DATA_PATH_CSV = 'train_datas (1).csv'
+
+def rapikan_dataset(df_db):
+    """Normalisasi dataset mentah: nama kolom, tipe Tanggal, urutan tanggal."""
+    df_db.columns = [c.strip() for c in df_db.columns]
+    if 'Tanggal' in df_db.columns:
+        df_db['Tanggal'] = pd.to_datetime(df_db['Tanggal'])
+        df_db = df_db.sort_values('Tanggal')
+    return df_db
+
+def lengkapi_kolom(df):
+    """Mengisi kolom turunan Tanggal & Total Omzet yang tidak ada di file upload."""
+    tanggal = pd.to_datetime(df['Tanggal'])
+    turunan = {
+        'Hari': lambda: (tanggal.dt.weekday + 1).astype('int64'),  # Senin = 1
+        'Bulan': lambda: tanggal.dt.month.astype('int64'),
+        'Minggu ke': lambda: tanggal.dt.isocalendar().week.astype('int64'),
+        'Weekend': lambda: (tanggal.dt.weekday >= 5).astype('int64'),
+        'Total Omzet': lambda: df['Omzet Pagi'] + df['Omzet Siang'] + df['Omzet Malam'],
+    }
+    for col, hitung in turunan.items():
+        if col not in df.columns:
+            df[col] = hitung()
+    return df
+
+def merge_history(df_db, df_baru):
+    """Gabung per Tanggal: baris `df_baru` menggantikan tanggal yang sama, sisanya ditambah."""
+    if df_db is None or df_db.empty:
+        return rapikan_dataset(df_baru.copy()).reset_index(drop=True)
+    df_baru = df_baru[[c for c in df_db.columns if c in df_baru.columns]]
+    gabung = pd.concat([df_db, df_baru], ignore_index=True)
+    gabung = gabung[~gabung['Tanggal'].dt.normalize().duplicated(keep='last')]
+    return gabung.sort_values('Tanggal', kind='stable').reset_index(drop=True)
+
+# --- JURNAL UPSERT ---
+# Mode tambah/perbarui tidak menulis ulang Excel: baris baru di-append ke
+# '<file>.delta.csv'. Saat dimuat, jurnal digabung ke data dasar per Tanggal
+# (baris jurnal yang menang). Simpan penuh (save_dataset) menghapus jurnal.
+DELTA_SUFFIX = '.delta.csv'
+
+def delta_path(path):
+    return path + DELTA_SUFFIX
+
+def read_delta(path=DATA_PATH):
+    """Isi jurnal upsert untuk dataset `path` (None jika belum ada)."""
+    try:
+        return pd.read_csv(delta_path(path), parse_dates=['Tanggal'])
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return None
+
+def append_dataset(df_baru, path=DATA_PATH):
+    """Menambahkan baris `df_baru` ke jurnal upsert tanpa menyentuh file Excel."""
+    df_baru = lengkapi_kolom(rapikan_dataset(df_baru.copy()))
+    jurnal = delta_path(path)
+    ada = os.path.exists(jurnal) and os.path.getsize(jurnal) > 0
+    if ada:
+        # Kolom jurnal mengikuti header yang sudah ada
+        kolom = pd.read_csv(jurnal, nrows=0).columns
+        df_baru = df_baru.reindex(columns=kolom)
+    df_baru.to_csv(jurnal, mode='a', header=not ada, index=False, date_format='%Y-%m-%d')
+    return df_baru
+
+def compact_dataset(path=DATA_PATH):
+    """Melebur jurnal ke file Excel (tulis ulang penuh sekali) lalu menghapus jurnal."""
+    df_db = load_dataset(path)
+    if df_db is not None:
+        save_dataset(df_db, path)
+    return df_db
+
+def upsert_history(df_historis, df_baru):
+    """
+    Gabungan `df_historis` + `df_baru` di memori. History store diperbarui per hari
+    (tanpa hash ulang seluruh dataset) dan cache prediksi yang jendela datanya tidak
+    menyentuh tanggal yang berubah tetap dipakai.
+    """
+    df_baru = lengkapi_kolom(rapikan_dataset(df_baru.copy()))
+    if df_baru.empty:
+        return df_historis
+    store_lama = history_store(df_historis)
+    df_gabung = merge_history(df_historis, df_baru)
+
+    # Versi baru = hash(versi lama + isi baris baru), bukan hash seluruh dataset
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(store_lama.versi).encode())
+    h.update(fingerprint_frame(df_baru).encode())
+    versi = h.hexdigest()
+    with profiling.stage('history_store.upsert'):
+        store = store_lama.upsert(df_baru, versi)
+    remember_history_store(df_gabung, store)
+
+    tanggal = df_baru['Tanggal'].dt.normalize()
+    carry_over_caches(store_lama.versi, versi, tanggal.min(), tanggal.max())
+    carry_over_climatology(store_lama, store, tanggal)
+    return df_gabung
+
+def _baca_file(path):
+    """File dataset mentah sesuai ekstensi (.csv atau Excel)."""
+    if str(path).lower().endswith('.csv'):
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+@profiling.timed('load_dataset')
+def load_dataset(path=DATA_PATH, write_cache=True):
+    """
+    Membaca dataset historis. Salinan biner (history_cache) dipakai jika hash-nya
+    cocok dengan file; jika tidak, file (Excel/CSV) diparsing lalu cache ditulis ulang.
+    `write_cache=False` = hanya membaca (mis. proses worker yang berbagi satu sidecar).
+    Hanya dataset bawaan (DATA_PATH) yang jatuh ke DATA_PATH_CSV bila tidak terbaca;
+    path lain yang tidak terbaca -> None.
+    """
+    try:
+        source_hash = history_cache.file_hash(path)
+    except OSError:
+        source_hash = None
+
+    if source_hash is not None:
+        with profiling.stage('read_sidecar'):
+            df_db = history_cache.read_history_cache(path, source_hash)
+        if df_db is not None:
+            return _terapkan_jurnal(df_db, path)
+        try:
+            # Prioritas baca file yang baru diupload
+            with profiling.stage('parse_excel'):
+                df_db = rapikan_dataset(_baca_file(path))
+        except:
+            df_db = None
+        if df_db is not None and write_cache:
+            try:
+                with profiling.stage('write_sidecar'):
+                    history_cache.write_history_cache(df_db, path, source_hash)
+            except OSError:
+                pass
+        if df_db is not None:
+            return _terapkan_jurnal(df_db, path)
+
+    if path != DATA_PATH:
+        return None
+    try:
+        return rapikan_dataset(pd.read_csv(DATA_PATH_CSV))
+    except:
+        return None
+
+def prepare_dataset_cache(path=DATA_PATH):
+    """
+    Pastikan salinan biner `path` ada & sesuai hash file. Dipanggil sekali oleh proses
+    induk sebelum worker paralel memuat dataset secara read-only (tanpa saling menimpa).
+    Mengembalikan True jika sidecar siap dipakai.
+    """
+    try:
+        source_hash = history_cache.file_hash(path)
+    except OSError:
+        return False
+    if history_cache.cache_is_current(path, source_hash):
+        return True
+    try:
+        df_db = rapikan_dataset(_baca_file(path))
+        return history_cache.write_history_cache(df_db, path, source_hash)
+    except Exception:
+        return False
+
+def _terapkan_jurnal(df_db, path):
+    delta = read_delta(path)
+    if delta is None:
+        return df_db
+    with profiling.stage('apply_delta'):
+        return merge_history(df_db, delta)
+
+def save_dataset(df_new, path=DATA_PATH):
+    """Menyimpan dataset ke Excel sekaligus memperbarui salinan binernya (jurnal dihapus)."""
+    df_new.to_excel(path, index=False)
+    try:
+        os.remove(delta_path(path))
+    except FileNotFoundError:
+        pass
+    try:
+        history_cache.write_history_cache(rapikan_dataset(df_new.copy()), path)
+    except OSError:
+        pass
+
+@profiling.timed('load_resources')
+def load_resources_from(model_path=MODEL_PATH, data_path=DATA_PATH, write_cache=True):
+    """
+    Memuat (model, dataset) tanpa cache Streamlit (dipakai juga oleh skrip/benchmark).
+    `write_cache=False`: sidecar dataset hanya dibaca, tidak pernah ditulis.
+    """
+    import joblib  # impor berat (ikut memuat sklearn saat unpickle) -> hanya saat dipakai
+
+    try:
+        with profiling.stage('load_model'):
+            model = joblib.load(model_path)
+    except FileNotFoundError:
+        return None, None
+
+    # Ratakan seluruh pohon sekali saja agar prediksi berikutnya tidak lewat sklearn
+    compile_model(model)
+
+    df_db = load_dataset(data_path, write_cache)
+    # Bangun history store sekali per pemuatan dataset
+    history_store(df_db)
+    return model, df_db
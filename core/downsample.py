@@ -0,0 +1,87 @@
+import numpy as np
+
+
+# --- PENYEDERHANAAN DATA GRAFIK (SISI SERVER) ---
+# Grafik rentang panjang (bertahun-tahun data harian) dikirim ke browser sebagai JSON
+# Plotly; tiap titik ikut membawa nilai x, y dan data hover. Di atas MAKS_TITIK titik,
+# deret dipangkas dengan LTTB (Largest-Triangle-Three-Buckets) atau min/max per ember.
+# Indeks nilai tertinggi & terendah tiap kolom selalu disertakan agar puncak tetap tampil.
+MAKS_TITIK = 500
+METODE = ('lttb', 'minmax')
+
+
+def _sumbu_x(x):
+    """Nilai x sebagai float (tanggal -> hari) untuk perhitungan luas segitiga."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[s]').astype(np.int64) / 86_400.0
+    return x.astype(float)
+
+def lttb_indices(x, y, n):
+    """Indeks `n` titik terpilih LTTB (titik pertama & terakhir selalu ikut)."""
+    y = np.asarray(y, dtype=float)
+    N = len(y)
+    if n >= N:
+        return np.arange(N)
+    if n < 3:
+        return np.array([0, N - 1], dtype=np.int64)
+    x = _sumbu_x(x)
+    # Batas ember: titik 1..N-2 dibagi rata ke n-2 ember
+    batas = (np.arange(n - 1) * ((N - 2) / (n - 2))).astype(np.int64) + 1
+    batas[-1] = N - 1
+
+    # Titik acuan tiap ember = rata-rata ember berikutnya (ember terakhir -> titik akhir),
+    # dihitung sekaligus; yang berurutan hanya pemilihan titik antar ember.
+    ukuran = np.diff(batas)
+    rata_x = np.append(np.add.reduceat(x[:N - 1], batas[:-1]) / ukuran, x[N - 1])
+    rata_y = np.append(np.add.reduceat(y[:N - 1], batas[:-1]) / ukuran, y[N - 1])
+
+    terpilih = np.empty(n, dtype=np.int64)
+    terpilih[0], terpilih[-1] = 0, N - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = batas[i], batas[i + 1]
+        nx, ny = rata_x[i + 1], rata_y[i + 1]
+        luas = np.abs((x[a] - nx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (ny - y[a]))
+        a = lo + int(np.nanargmax(luas)) if np.isfinite(luas).any() else lo
+        terpilih[i + 1] = a
+    return terpilih
+
+def _indeks_ekstrem_per_ember(y, batas, ufunc):
+    """Indeks pertama yang mencapai nilai ekstrem (ufunc.reduceat) di tiap ember."""
+    ekstrem = ufunc.reduceat(y, batas[:-1])
+    ember = np.repeat(np.arange(len(ekstrem)), np.diff(batas))
+    cocok = np.flatnonzero(y == ekstrem[ember])
+    return cocok[np.unique(ember[cocok], return_index=True)[1]]
+
+def minmax_indices(y, n):
+    """Indeks minimum & maksimum tiap ember (n // 2 ember) plus titik pertama & terakhir."""
+    y = np.asarray(y, dtype=float)
+    N = len(y)
+    if n >= N:
+        return np.arange(N)
+    ember = max(n // 2 - 1, 1)
+    batas = np.linspace(0, N, ember + 1).astype(np.int64)
+    y = np.where(np.isfinite(y), y, np.nan)
+    rendah = _indeks_ekstrem_per_ember(np.where(np.isnan(y), np.inf, y), batas, np.minimum)
+    tinggi = _indeks_ekstrem_per_ember(np.where(np.isnan(y), -np.inf, y), batas, np.maximum)
+    return np.unique(np.concatenate([[0, N - 1], rendah, tinggi]))
+
+def downsample_frame(df, x_col, y_cols, max_points=MAKS_TITIK, metode='lttb'):
+    """
+    Baris `df` yang cukup untuk menggambar `y_cols` terhadap `x_col` dengan paling
+    banyak ~`max_points` titik. Tabel pendek dikembalikan apa adanya.
+    """
+    if metode not in METODE:
+        raise ValueError(f"Metode penyederhanaan tidak dikenal: {metode}")
+    if len(df) <= max_points:
+        return df
+    jatah = max(max_points // len(y_cols), 3)
+    x = df[x_col].to_numpy()
+    idx = []
+    for col in y_cols:
+        y = df[col].to_numpy(dtype=float, na_value=np.nan)
+        idx.append(lttb_indices(x, y, jatah) if metode == 'lttb' else minmax_indices(y, jatah))
+        if np.isfinite(y).any():
+            idx.append([np.nanargmax(y), np.nanargmin(y)])
+    return df.iloc[np.unique(np.concatenate(idx))]
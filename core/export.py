@@ -0,0 +1,92 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .cache import LRUCache
+from .history_store import fingerprint_frame
+
+
+# --- LEBAR KOLOM (BERDASARKAN TIPE DATA) ---
+# Lebar dihitung dari nilai ekstrem per kolom (jumlah digit), bukan dengan mengubah
+# setiap sel menjadi teks. Hanya kolom teks yang perlu dipindai panjangnya.
+LEBAR_TANGGAL = 19   # 'YYYY-MM-DD HH:MM:SS' (format tanggal bawaan ExcelWriter)
+
+def _digit(x):
+    return int(np.floor(np.log10(x))) + 1 if x >= 1 else 1
+
+def column_width(series):
+    """Perkiraan lebar tampilan isi kolom (karakter) tanpa konversi seluruh sel ke str."""
+    if series.empty:
+        return 0
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return LEBAR_TANGGAL
+    if pd.api.types.is_bool_dtype(series):
+        return 5
+    if pd.api.types.is_numeric_dtype(series):
+        arr = series.to_numpy(dtype=float, na_value=np.nan)
+        arr = arr[np.isfinite(arr)]
+        if len(arr) == 0:
+            return 3
+        lebar = _digit(np.abs(arr).max()) + int(arr.min() < 0)
+        if pd.api.types.is_float_dtype(series) and np.any(arr != np.round(arr)):
+            lebar += 7   # titik desimal + pecahan yang biasanya tampil
+        return lebar
+    return int(series.astype(str).str.len().max())
+
+def column_widths(df):
+    return [max(column_width(df[col]), len(str(col))) + 2 for col in df.columns]
+
+
+# --- EKSPOR LAPORAN ---
+@profiling.timed('export_excel')
+def to_excel(df, sheet_name='Laporan_Prediksi'):
+    """Laporan Excel (bytes) dengan lebar kolom menyesuaikan isi. xlsxwriter dimuat saat menulis."""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+        worksheet = writer.sheets[sheet_name]
+        for i, lebar in enumerate(column_widths(df)):
+            worksheet.set_column(i, i, lebar)
+    processed_data = output.getvalue()
+    return processed_data
+
+@profiling.timed('export_csv')
+def to_csv(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+@profiling.timed('export_parquet')
+def to_parquet(df):
+    output = io.BytesIO()
+    df.to_parquet(output, index=False)
+    return output.getvalue()
+
+
+# --- EKSPOR MALAS + CACHE BYTES ---
+# Tombol unduh memanggil export_report hanya saat diklik; hasilnya di-cache per isi
+# tabel sehingga klik berikutnya (atau format yang sama di sesi lain) tidak menulis ulang.
+FORMAT_EKSPOR = {
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', to_excel),
+    'csv': ('text/csv', to_csv),
+    'parquet': ('application/vnd.apache.parquet', to_parquet),
+}
+EXPORT_CACHE_SIZE = 16
+_export_cache = LRUCache(maxsize=EXPORT_CACHE_SIZE)
+
+def export_mime(fmt):
+    return FORMAT_EKSPOR[fmt][0]
+
+def export_report(df, fmt='xlsx'):
+    """Bytes laporan `df` dalam format 'xlsx' | 'csv' | 'parquet' (di-cache per isi tabel)."""
+    if fmt not in FORMAT_EKSPOR:
+        raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+    key = (fingerprint_frame(df), fmt)
+    data = _export_cache.get(key)
+    if data is None:
+        data = FORMAT_EKSPOR[fmt][1](df)
+        _export_cache.put(key, data)
+    return data
+
+def clear_export_cache():
+    _export_cache.clear()
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+
+# --- KONFIGURASI FITUR MODEL ---
+# Urutan kolom harus konsisten dengan model latih
+FEATURE_COLS = [
+    'Hari', 'Bulan', 'Minggu ke', 'Weekend',
+    'Suhu', 'Curah Hujan',
+    'Hujan_t-3', 'Hujan_t-7', 'Hujan_t-14', 'Suhu_t-3', 'Suhu_t-7',
+    'Omzet Pagi_t-7', 'Omzet Pagi_t-30',
+    'Omzet Siang_t-7', 'Omzet Siang_t-30',
+    'Omzet Malam_t-7', 'Omzet Malam_t-30'
+]
+SHIFT_COLS = ['Omzet Pagi', 'Omzet Siang', 'Omzet Malam']
+LAG_HUJAN = [3, 7, 14]
+LAG_SUHU = [3, 7]
+LAG_OMZET = [7, 30]
+DEFAULT_OMZET = 5000000
+
+# Posisi kelompok kolom di FEATURE_COLS
+COL_WAKTU = slice(0, 4)
+COL_CUACA = slice(4, 11)
+COL_OMZET = slice(11, 17)
+MAX_LAG = max(LAG_HUJAN + LAG_SUHU + LAG_OMZET)
+
+
+# --- PEMBANGUN FITUR (VEKTOR) ---
+# Semua fitur dihitung dari "timeline": array nilai per posisi, dan `pos` = posisi
+# hari target di timeline. Lag l cukup berupa timeline[pos - l].
+# Timeline boleh punya sumbu skenario: (posisi, N) untuk cuaca dan (posisi, N, shift)
+# untuk omzet, dengan X berbentuk (hari, N, fitur). Tanpa skenario: (posisi,) dan X (hari, fitur).
+def fill_time_features(X, tanggal):
+    tanggal = pd.DatetimeIndex(tanggal)
+    bentuk = (-1,) + (1,) * (X.ndim - 2)
+    X[..., 0] = tanggal.day.to_numpy().reshape(bentuk)
+    X[..., 1] = tanggal.month.to_numpy().reshape(bentuk)
+    X[..., 2] = tanggal.isocalendar().week.to_numpy(dtype=float).reshape(bentuk)
+    X[..., 3] = (tanggal.weekday >= 5).reshape(bentuk)
+
+def fill_weather_features(X, suhu, hujan, pos):
+    X[..., 4] = suhu[pos]
+    X[..., 5] = hujan[pos]
+    for k, l in enumerate(LAG_HUJAN):
+        X[..., 6 + k] = hujan[pos - l]
+    for k, l in enumerate(LAG_SUHU):
+        X[..., 9 + k] = suhu[pos - l]
+
+def fill_omzet_lags(X, omzet, pos):
+    """`omzet` berbentuk (timeline, [N,] shift) dengan urutan SHIFT_COLS."""
+    k = COL_OMZET.start
+    for j in range(len(SHIFT_COLS)):
+        for l in LAG_OMZET:
+            X[..., k] = omzet[pos - l, ..., j]
+            k += 1
+
+def build_feature_matrix(tanggal, suhu, hujan, omzet, pos):
+    """Matriks fitur lengkap (n_hari, 17) untuk hari-hari pada posisi `pos`."""
+    X = np.empty((len(pos), len(FEATURE_COLS)), dtype=float)
+    fill_time_features(X, tanggal)
+    fill_weather_features(X, suhu, hujan, pos)
+    fill_omzet_lags(X, omzet, pos)
+    return X
+
+
+# --- TIMELINE UNTUK PREDIKSI (BERBASIS TANGGAL) ---
+def forecast_timelines(store, start, days, base_suhu, base_hujan):
+    """
+    Timeline [start - 30 hari, start + days) dari HistoryStore. Hari tanpa data memakai
+    asumsi cuaca / DEFAULT_OMZET. Mengembalikan (tanggal, pos, suhu, hujan, omzet).
+    """
+    tanggal = pd.date_range(start, periods=days, freq='D')
+    axis = store.offset(start) - MAX_LAG + np.arange(MAX_LAG + days)
+    suhu = store.window('Suhu', axis, base_suhu)
+    hujan = store.window('Curah Hujan', axis, base_hujan)
+    omzet = np.column_stack([store.window(s, axis, DEFAULT_OMZET) for s in SHIFT_COLS])
+    pos = MAX_LAG + np.arange(days)
+    return tanggal, pos, suhu, hujan, omzet
+
+
+# --- FITUR UNTUK BACKTEST & PELATIHAN (BERBASIS BARIS) ---
+def _row_features(store):
+    """Fitur per baris histori -> (tanggal, X, target shift (n, 3), total_omzet), belum difilter."""
+    rows = np.flatnonzero(store.valid)
+    n = len(rows)
+    tanggal = store.start + pd.to_timedelta(rows, unit='D')
+
+    def kolom(col):
+        arr = store.values.get(col)
+        return np.full(n, np.nan) if arr is None else arr[rows]
+
+    # Padding NaN di depan agar pos - lag selalu valid (hasilnya NaN seperti shift)
+    pad = np.full(MAX_LAG, np.nan)
+    suhu = np.concatenate([pad, kolom('Suhu')])
+    hujan = np.concatenate([pad, kolom('Curah Hujan')])
+    omzet = np.column_stack([np.concatenate([pad, kolom(s)]) for s in SHIFT_COLS])
+    pos = MAX_LAG + np.arange(n)
+
+    X = build_feature_matrix(tanggal, suhu, hujan, omzet, pos)
+    return tanggal, X, omzet[pos], kolom('Total Omzet')
+
+def backtest_features(store):
+    """
+    Fitur seluruh histori seperti saat pelatihan: lag = pergeseran baris (shift),
+    baris dengan lag/target kosong dibuang. Mengembalikan (tanggal, X, total_omzet).
+    """
+    tanggal, X, target, total = _row_features(store)
+    siap = ~np.isnan(X).any(axis=1) & ~np.isnan(total) & ~np.isnan(target).any(axis=1)
+    return tanggal[siap], X[siap], total[siap]
+
+def training_features(store):
+    """Data latih (tanggal, X (n, 17), y (n, [Pagi, Siang, Malam])) dari baris yang lengkap."""
+    tanggal, X, target, _ = _row_features(store)
+    siap = ~np.isnan(X).any(axis=1) & ~np.isnan(target).any(axis=1)
+    return tanggal[siap], X[siap], target[siap]
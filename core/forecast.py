@@ -0,0 +1,308 @@
+import itertools
+import os
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from . import backtest
+from . import features
+from . import profiling
+from .cache import LRUCache
+from .compiled_forest import CompiledForest
+from .features import FEATURE_COLS, SHIFT_COLS, LAG_OMZET, MAX_LAG
+from .history_store import HistoryStore, fingerprint_frame
+
+
+# --- NAMA HARI & BULAN UNTUK KOLOM HASIL ---
+LIST_HARI = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+LIST_BULAN = ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agt", "Sep", "Okt", "Nov", "Des"]
+
+# --- BACKEND INFERENSI ---
+# 'compiled' : traversal pohon dengan NumPy murni (lihat compiled_forest.py)
+# 'sklearn'  : model.predict bawaan scikit-learn
+BACKEND_COMPILED = 'compiled'
+BACKEND_SKLEARN = 'sklearn'
+INFERENCE_BACKEND = os.environ.get('PREDIKSIRF_BACKEND', BACKEND_COMPILED)
+
+_compiled_models = weakref.WeakKeyDictionary()
+
+def set_inference_backend(backend):
+    global INFERENCE_BACKEND
+    if backend not in (BACKEND_COMPILED, BACKEND_SKLEARN):
+        raise ValueError(f"Backend inferensi tidak dikenal: {backend}")
+    INFERENCE_BACKEND = backend
+
+def compile_model(model):
+    """
+    Mengompilasi model forest menjadi CompiledForest (sekali per objek model).
+    Mengembalikan None jika model tidak didukung -> otomatis memakai sklearn.
+    """
+    try:
+        return _compiled_models[model]
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+    try:
+        with profiling.stage('compile_model'):
+            compiled = CompiledForest.from_sklearn(model)
+    except TypeError:
+        compiled = None
+    _compiled_models[model] = compiled
+    return compiled
+
+# Batch besar (mis. ribuan skenario per blok) lebih cepat lewat loop Cython sklearn;
+# hasil kedua backend identik, jadi backend default berpindah otomatis di atas batas ini.
+COMPILED_MAX_ROWS = 512
+
+@profiling.timed('predict')
+def predict_model(model, X, backend=None):
+    """
+    Prediksi dengan backend terpilih. X berupa array/DataFrame dengan urutan FEATURE_COLS.
+    Tanpa `backend` eksplisit, batch > COMPILED_MAX_ROWS baris memakai sklearn.
+    """
+    if backend is None:
+        backend = INFERENCE_BACKEND
+        if len(X) > COMPILED_MAX_ROWS:
+            backend = BACKEND_SKLEARN
+    if backend == BACKEND_COMPILED:
+        compiled = compile_model(model)
+        if compiled is not None:
+            return compiled.predict(np.asarray(X, dtype=float))
+    if not isinstance(X, pd.DataFrame) and hasattr(model, 'feature_names_in_'):
+        X = pd.DataFrame(X, columns=FEATURE_COLS)
+    return model.predict(X)
+
+# --- INTERVAL ANTAR POHON ---
+# Sebaran prediksi antar pohon forest memberi batas bawah/atas tanpa model tambahan.
+# Rata-rata per pohon identik dengan predict_model, jadi lintasan rekursif tidak berubah.
+INTERVAL_KUANTIL = (0.1, 0.9)
+
+@profiling.timed('predict_per_tree')
+def predict_per_tree(model, X, backend=None):
+    """Prediksi tiap pohon sekaligus -> array (pohon, baris, shift)."""
+    X = np.asarray(X, dtype=float)
+    if backend is None:
+        backend = INFERENCE_BACKEND
+        if len(X) > COMPILED_MAX_ROWS:
+            backend = BACKEND_SKLEARN
+    if backend == BACKEND_COMPILED:
+        compiled = compile_model(model)
+        if compiled is not None:
+            return compiled.predict_per_tree(X)
+    estimators = getattr(model, 'estimators_', None)
+    if estimators is None:
+        raise TypeError(f"Model {type(model).__name__} tidak punya prediksi per pohon")
+    out = np.stack([est.predict(X) for est in estimators])
+    return out[..., None] if out.ndim == 2 else out
+
+# --- HISTORY STORE & SIDIK JARI (KUNCI CACHE) ---
+# Store dibangun sekali per objek DataFrame (objek dari load_resources sama di setiap rerun)
+_store_memo = (None, None)
+_model_tokens = weakref.WeakKeyDictionary()
+_token_counter = itertools.count(1)
+
+def history_store(df_historis):
+    """HistoryStore untuk `df_historis` (array padat per kolom, berindeks hari)."""
+    global _store_memo
+    memo_df, memo_store = _store_memo
+    if memo_store is not None and memo_df is df_historis:
+        return memo_store
+    with profiling.stage('history_store'):
+        versi = fingerprint_frame(df_historis) if df_historis is not None else None
+        store = HistoryStore.from_frame(df_historis, versi)
+    _store_memo = (df_historis, store)
+    return store
+
+def remember_history_store(df_historis, store):
+    """Daftarkan store yang sudah dibangun (mis. hasil upsert) untuk objek `df_historis`."""
+    global _store_memo
+    _store_memo = (df_historis, store)
+
+def dataset_fingerprint(df_historis):
+    """Hash isi dataset historis (versi dataset untuk kunci cache)."""
+    return history_store(df_historis).versi
+
+def model_token(model):
+    """Nomor unik per objek model (model baru setelah cache_resource.clear -> token baru)."""
+    try:
+        return _model_tokens.setdefault(model, next(_token_counter))
+    except TypeError:
+        return id(model)
+
+# --- CACHE HASIL PREDIKSI ---
+# Kunci: (model, dataset, tanggal awal, horizon, suhu, hujan, interval) -> DataFrame hasil
+FORECAST_CACHE_SIZE = 64
+_forecast_cache = LRUCache(maxsize=FORECAST_CACHE_SIZE)
+
+# Buffer prediksi per (model, dataset, asumsi cuaca, tanggal awal, interval)
+# -> (array (hari, shift), batas interval atau None).
+# Prediksi rekursif hari ke-i hanya bergantung pada hari-hari sebelumnya dari tanggal
+# awal yang sama, sehingga horizon yang lebih pendek adalah prefix dari horizon yang
+# lebih panjang: cukup hitung hari yang belum ada di buffer.
+PREDICTION_BUFFER_SIZE = 32
+_prediction_buffers = LRUCache(maxsize=PREDICTION_BUFFER_SIZE)
+
+def clear_forecast_cache():
+    _forecast_cache.clear()
+    _prediction_buffers.clear()
+
+# --- CACHE BACKTEST (HALAMAN PERBANDINGAN) ---
+# Kunci: (model, dataset) -> BacktestResult seluruh histori
+BACKTEST_CACHE_SIZE = 4
+_backtest_cache = LRUCache(maxsize=BACKTEST_CACHE_SIZE)
+
+@profiling.timed('backtest')
+def get_backtest(model, df_historis):
+    """Backtest seluruh histori, dihitung sekali per versi dataset & model."""
+    store = history_store(df_historis)
+    key = (model_token(model), store.versi)
+    hasil = _backtest_cache.get(key)
+    if hasil is None:
+        hasil = backtest.run_backtest(model, store, predict_model)
+        _backtest_cache.put(key, hasil)
+    return hasil
+
+def clear_result_caches():
+    """Dipanggil saat dataset berubah (upload) -> buang semua hasil turunan."""
+    from .scenario import clear_scenario_cache  # scenario.py mengimpor modul ini
+    clear_forecast_cache()
+    _backtest_cache.clear()
+    clear_scenario_cache()
+
+def carry_over_caches(versi_lama, versi_baru, awal, akhir):
+    """
+    Dipanggil setelah upsert yang hanya mengubah tanggal [awal, akhir]. Prediksi dari
+    `start` hanya membaca histori [start - MAX_LAG, start + days), jadi hasil & buffer
+    yang jendelanya tidak menyentuh rentang tersebut dipindah ke versi baru.
+    Backtest & skenario cuaca memakai seluruh histori -> dibuang.
+    """
+    from .scenario import clear_scenario_cache
+
+    def aman(start, days):
+        return start + pd.Timedelta(days=days - 1) < awal or start - pd.Timedelta(days=MAX_LAG) > akhir
+
+    for key, hasil in _forecast_cache.items():
+        if key[1] == versi_lama and aman(key[2], key[3]):
+            _forecast_cache.put(key[:1] + (versi_baru,) + key[2:], hasil)
+    for key, buf in _prediction_buffers.items():
+        if key[1] == versi_lama and aman(key[2], len(buf[0])):
+            _prediction_buffers.put(key[:1] + (versi_baru,) + key[2:], buf)
+    _backtest_cache.clear()
+    clear_scenario_cache()
+
+# --- PREDIKSI (DENGAN CACHE) ---
+@profiling.timed('forecast')
+def generate_forecast_data(model, df_historis, start_date, base_suhu, base_hujan, days=30, interval=False):
+    """
+    Tabel prediksi harian. Dengan `interval=True` ditambah kolom 'Prediksi <shift> Bawah/Atas'
+    (kuantil INTERVAL_KUANTIL antar pohon) untuk tiap shift dan total.
+    """
+    start = pd.to_datetime(start_date)
+    store = history_store(df_historis)
+    key = (model_token(model), store.versi, start, int(days), float(base_suhu), float(base_hujan), bool(interval))
+    hasil = _forecast_cache.get(key)
+    if hasil is None:
+        buf_key = key[:3] + key[4:]
+        awal = _prediction_buffers.get(buf_key)
+        hasil, pred, batas = _hitung_forecast(model, store, start, base_suhu, base_hujan, days, awal, interval)
+        if awal is None or len(pred) > len(awal[0]):
+            _prediction_buffers.put(buf_key, (pred, batas))
+        _forecast_cache.put(key, hasil)
+    # Salinan agar halaman yang menambah kolom (mis. 'Periode') tidak mengubah isi cache
+    return hasil.copy()
+
+# --- LOGIKA PREDIKSI FLEKSIBEL (BATCH PER BLOK 7 HARI) ---
+# Lag omzet terpendek adalah t-7, sehingga 7 hari berturut-turut tidak saling
+# bergantung satu sama lain: satu blok cukup diprediksi dengan satu panggilan model.
+def predict_recursive(model, X, omzet, pos, pred, n_awal=0, batas=None, kuantil=INTERVAL_KUANTIL):
+    """
+    Mengisi `pred` (hari, [N,] shift) per blok mulai hari ke-`n_awal`. X (hari, [N,] fitur)
+    sudah berisi fitur waktu & cuaca; lag omzet diisi dari timeline `omzet` yang ikut
+    diperbarui dengan hasil prediksi. Dengan sumbu skenario N, semua skenario dalam
+    satu blok diprediksi dengan satu panggilan model.
+
+    Jika `batas` (kuantil, hari, [N,] shift + total) diberikan, tiap blok memakai satu
+    panggilan predict_per_tree: rata-ratanya menjadi `pred`, kuantil antar pohon masuk `batas`.
+    """
+    blok = min(LAG_OMZET)
+    days = len(pos)
+    for a in range(n_awal, days, blok):
+        b = min(a + blok, days)
+        p = pos[a:b]
+        Xb = X[a:b]
+        features.fill_omzet_lags(Xb, omzet, p)
+        X2 = Xb.reshape(-1, Xb.shape[-1])
+        if batas is None:
+            pred[a:b] = np.asarray(predict_model(model, X2)).reshape(pred[a:b].shape)
+        else:
+            per_pohon = predict_per_tree(model, X2)                  # (pohon, baris, shift)
+            # Penjumlahan berurutan per pohon -> sama persis dengan predict_model
+            rata = per_pohon.sum(axis=0)
+            rata /= len(per_pohon)
+            pred[a:b] = rata.reshape(pred[a:b].shape)
+            # Kuantil total dari total per pohon, bukan jumlah kuantil per shift
+            per_pohon = np.concatenate([per_pohon, per_pohon.sum(axis=2, keepdims=True)], axis=2)
+            q = np.quantile(per_pohon, kuantil, axis=0)
+            batas[:, a:b] = q.reshape(batas[:, a:b].shape)
+        omzet[p] = pred[a:b]
+    return pred
+
+def kolom_kalender(tanggal):
+    """Kolom tanggal di tabel hasil (Tanggal, Hari_Nama, Bulan, Bulan_Nama, Tahun)."""
+    wd = tanggal.weekday
+    bulan = tanggal.month
+    return {
+        'Tanggal': tanggal,
+        'Hari_Nama': np.array(LIST_HARI, dtype=object)[wd],
+        'Bulan': bulan.astype('int64'),                  # PENTING: Untuk grouping bulanan
+        'Bulan_Nama': np.array(LIST_BULAN, dtype=object)[bulan - 1],
+        'Tahun': tanggal.year.astype('int64'),
+    }
+
+# `awal` = (pred, batas) yang sudah pernah dihitung dari tanggal awal yang sama (prefix).
+@profiling.timed('forecast.compute')
+def _hitung_forecast(model, store, start, base_suhu, base_hujan, days, awal=None, interval=False):
+    # 1. TIMELINE [start - 30 hari, start + days) dari history store
+    # Omzet per shift: histori untuk hari sebelum start, lalu ditimpa hasil prediksi
+    with profiling.stage('forecast.features'):
+        tanggal, pos, suhu, hujan, omzet = features.forecast_timelines(store, start, days, base_suhu, base_hujan)
+
+        # 2. FITUR YANG TIDAK BERGANTUNG PREDIKSI (Waktu & Cuaca) -> sekali jalan
+        X = np.empty((days, len(FEATURE_COLS)), dtype=float)
+        features.fill_time_features(X, tanggal)
+        features.fill_weather_features(X, suhu, hujan, pos)
+
+    # 3. PREDIKSI REKURSIF PER BLOK (lanjut dari prefix yang sudah ada)
+    pred = np.empty((days, len(SHIFT_COLS)), dtype=float)
+    batas = np.empty((len(INTERVAL_KUANTIL), days, len(SHIFT_COLS) + 1), dtype=float) if interval else None
+    n_awal = 0
+    if awal is not None:
+        pred_awal, batas_awal = awal
+        n_awal = min(len(pred_awal), days)
+        pred[:n_awal] = pred_awal[:n_awal]
+        if interval:
+            batas[:, :n_awal] = batas_awal[:, :n_awal]
+        omzet[pos[:n_awal]] = pred[:n_awal]
+    predict_recursive(model, X, omzet, pos, pred, n_awal, batas)
+
+    # 4. SUSUN HASIL
+    data = {
+        **kolom_kalender(tanggal),
+        'Prediksi Pagi': pred[:, 0],
+        'Prediksi Siang': pred[:, 1],
+        'Prediksi Malam': pred[:, 2],
+        'Prediksi Total': pred[:, 0] + pred[:, 1] + pred[:, 2],
+    }
+    if interval:
+        for j, nama in enumerate(['Pagi', 'Siang', 'Malam', 'Total']):
+            data[f'Prediksi {nama} Bawah'] = batas[0, :, j]
+            data[f'Prediksi {nama} Atas'] = batas[-1, :, j]
+    data['Suhu'] = X[:, 4]
+    data['Hujan'] = X[:, 5]
+    return pd.DataFrame(data), pred, batas
+
+# Wrapper agar kode lama tidak error
+def generate_30_days_data(model, df_historis, start_date, base_suhu, base_hujan, interval=False):
+    return generate_forecast_data(model, df_historis, start_date, base_suhu, base_hujan, days=30, interval=interval)
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# --- CACHE BINER DATASET HISTORIS (SIDECAR) ---
+# Parsing Excel adalah bagian paling lambat saat start. Salinan kolumnar disimpan
+# di folder '<file>.cache/': satu file .npy per kolom (bisa di-memory-map) dan
+# 'meta.json' berisi hash file sumber. Cache hanya dipakai jika hash masih cocok.
+CACHE_SUFFIX = '.cache'
+META_FILE = 'meta.json'
+
+
+def cache_dir(source_path):
+    return source_path + CACHE_SUFFIX
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _kolom_didukung(series):
+    return pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)
+
+
+def write_history_cache(df, source_path, source_hash=None):
+    """
+    Menulis salinan kolumnar `df` untuk file `source_path`.
+    Mengembalikan False (tanpa menulis) jika ada kolom non-numerik/non-tanggal.
+    """
+    if not all(_kolom_didukung(df[c]) for c in df.columns):
+        return False
+    source_hash = source_hash or file_hash(source_path)
+    folder = cache_dir(source_path)
+    os.makedirs(folder, exist_ok=True)
+
+    # Nama file memakai hash sumber, meta.json ditulis terakhir (atomik via os.replace)
+    # sehingga pembaca tidak pernah melihat campuran kolom lama dan baru.
+    tag = source_hash[:12]
+    columns = []
+    for i, col in enumerate(df.columns):
+        arr = df[col].to_numpy()
+        fname = f'{tag}_c{i}.npy'
+        np.save(os.path.join(folder, fname), arr, allow_pickle=False)
+        columns.append({'name': str(col), 'file': fname})
+    index_file = f'{tag}_index.npy'
+    np.save(os.path.join(folder, index_file), df.index.to_numpy(), allow_pickle=False)
+
+    meta = {'source_hash': source_hash, 'columns': columns, 'index': index_file, 'rows': len(df)}
+    tmp = os.path.join(folder, META_FILE + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(folder, META_FILE))
+
+    # Bersihkan file dari versi sebelumnya
+    dipakai = {c['file'] for c in columns} | {index_file, META_FILE}
+    for fname in os.listdir(folder):
+        if fname not in dipakai:
+            try:
+                os.remove(os.path.join(folder, fname))
+            except OSError:
+                pass
+    return True
+
+
+def cache_is_current(source_path, source_hash=None):
+    """True jika meta.json sidecar ada dan hash sumbernya cocok (tanpa membaca kolom)."""
+    try:
+        with open(os.path.join(cache_dir(source_path), META_FILE)) as f:
+            meta = json.load(f)
+        return meta.get('source_hash') == (source_hash or file_hash(source_path))
+    except (OSError, ValueError):
+        return False
+
+
+def read_history_cache(source_path, source_hash=None):
+    """
+    Membaca salinan kolumnar untuk `source_path`.
+    Mengembalikan None jika cache tidak ada, rusak, atau hash file sumber berbeda.
+    """
+    meta_path = os.path.join(cache_dir(source_path), META_FILE)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        source_hash = source_hash or file_hash(source_path)
+        if meta.get('source_hash') != source_hash:
+            return None
+        folder = cache_dir(source_path)
+        data = {c['name']: np.load(os.path.join(folder, c['file']), mmap_mode='r', allow_pickle=False)
+                for c in meta['columns']}
+        index = np.load(os.path.join(folder, meta['index']), allow_pickle=False)
+    except (OSError, ValueError, KeyError):
+        return None
+    return pd.DataFrame(data, index=index, copy=True)
@@ -0,0 +1,131 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+# --- PENYIMPANAN HISTORI BERINDEKS HARI ---
+# Setiap kolom disimpan sebagai array NumPy padat dengan indeks = selisih hari dari
+# tanggal pertama. Hari yang tidak ada di dataset ditandai oleh `valid` (False) dan
+# bernilai NaN, sehingga pencarian lag cukup berupa indexing integer (bisa vektor).
+STORE_COLUMNS = ['Suhu', 'Curah Hujan', 'Omzet Pagi', 'Omzet Siang', 'Omzet Malam', 'Total Omzet']
+
+
+def fingerprint_frame(df):
+    """Hash isi DataFrame (kolom + nilai) sebagai versi dataset."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class HistoryStore:
+    def __init__(self, start, valid, values, versi=None):
+        self.start = start      # pd.Timestamp hari pertama (None jika kosong)
+        self.valid = valid      # (n_days,) bool: ada baris untuk hari tersebut
+        self.values = values    # {kolom: (n_days,) float, NaN jika kosong}
+        self.versi = versi      # sidik jari dataset
+
+    @property
+    def n_days(self):
+        return len(self.valid)
+
+    @property
+    def end(self):
+        """Hari terakhir di histori (inklusif)."""
+        if self.start is None:
+            return None
+        return self.start + pd.Timedelta(days=self.n_days - 1)
+
+    @classmethod
+    def from_frame(cls, df, versi=None):
+        if df is None or 'Tanggal' not in df.columns or df.empty:
+            return cls(None, np.zeros(0, dtype=bool), {}, versi)
+
+        # Tanggal duplikat: baris terakhir yang dipakai
+        df = df[~pd.to_datetime(df['Tanggal']).dt.normalize().duplicated(keep='last')]
+        tanggal = pd.to_datetime(df['Tanggal']).dt.normalize()
+        start = tanggal.min()
+        offset = ((tanggal - start) // pd.Timedelta(days=1)).to_numpy(dtype=np.intp)
+        n_days = int(offset.max()) + 1
+
+        valid = np.zeros(n_days, dtype=bool)
+        valid[offset] = True
+        values = {}
+        for col in STORE_COLUMNS:
+            if col not in df.columns:
+                continue
+            arr = np.full(n_days, np.nan)
+            arr[offset] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            values[col] = arr
+        return cls(start, valid, values, versi)
+
+    def upsert(self, df, versi=None):
+        """
+        Store baru dengan baris `df` (per Tanggal) menggantikan/menambah hari di store ini.
+        Hanya hari di `df` yang ditulis; array diperlebar bila tanggalnya di luar rentang.
+        Store lama tidak diubah (masih bisa dipakai sesi lain).
+        """
+        baru = HistoryStore.from_frame(df)
+        if baru.start is None:
+            return HistoryStore(self.start, self.valid, self.values, versi or self.versi)
+        if self.start is None:
+            baru.versi = versi
+            return baru
+
+        start = min(self.start, baru.start)
+        end = max(self.end, baru.end)
+        n_days = (end - start).days + 1
+        geser = (self.start - start).days
+        off = (baru.start - start).days + np.flatnonzero(baru.valid)
+
+        valid = np.zeros(n_days, dtype=bool)
+        valid[geser:geser + self.n_days] = self.valid
+        valid[off] = True
+        values = {}
+        for col in STORE_COLUMNS:
+            if col not in self.values and col not in baru.values:
+                continue
+            arr = np.full(n_days, np.nan)
+            if col in self.values:
+                arr[geser:geser + self.n_days] = self.values[col]
+            # Hari yang di-upsert diganti seluruhnya (kolom yang tidak ada -> NaN)
+            arr[off] = baru.values[col][baru.valid] if col in baru.values else np.nan
+            values[col] = arr
+        return HistoryStore(start, valid, values, versi)
+
+    def offset(self, tanggal):
+        """Selisih hari `tanggal` (Timestamp atau DatetimeIndex) terhadap hari pertama."""
+        if self.start is None:
+            return 0
+        delta = pd.to_datetime(tanggal) - self.start
+        if isinstance(delta, pd.Timedelta):
+            return delta.days
+        return (delta // pd.Timedelta(days=1)).to_numpy(dtype=np.intp)
+
+    def lookup(self, tanggal):
+        """
+        Nilai semua kolom pada satu hari (dict kolom -> float), atau None jika hari
+        tersebut tidak ada di histori. O(1): cukup selisih hari, tanpa scan.
+        """
+        if self.start is None:
+            return None
+        i = self.offset(pd.Timestamp(tanggal).normalize())
+        if not 0 <= i < self.n_days or not self.valid[i]:
+            return None
+        return {col: float(arr[i]) for col, arr in self.values.items()}
+
+    def window(self, col, offsets, default):
+        """
+        Nilai `col` pada offset hari `offsets` (array int). Offset di luar histori,
+        hari yang hilang, atau nilai NaN diganti `default`.
+        """
+        offsets = np.asarray(offsets, dtype=np.intp)
+        out = np.full(offsets.shape, default, dtype=float)
+        arr = self.values.get(col)
+        if arr is None:
+            return out
+        inside = (offsets >= 0) & (offsets < self.n_days)
+        vals = arr[offsets[inside]]
+        out[inside] = np.where(np.isnan(vals), default, vals)
+        return out
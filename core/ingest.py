@@ -0,0 +1,359 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from . import profiling
+from .data import lengkapi_kolom
+
+
+# --- INGESTI BERTAHAP (STREAMING) ---
+# File upload dibaca per potongan (CSV: pd.read_csv chunksize, Excel: openpyxl
+# read-only) lalu langsung diringkas per hari. Memori puncak mengikuti ukuran
+# potongan + jumlah hari, bukan jumlah baris file.
+REQUIRED_COLUMNS = ['Tanggal', 'Suhu', 'Curah Hujan', 'Omzet Pagi', 'Omzet Siang', 'Omzet Malam']
+OMZET_COLUMNS = ['Omzet Pagi', 'Omzet Siang', 'Omzet Malam']
+CUACA_COLUMNS = ['Suhu', 'Curah Hujan']
+# Urutan kolom sama dengan dataset historis (TRAIN_80_ANGKA.xlsx)
+DATASET_COLUMNS = ['Tanggal', 'Hari', 'Bulan', 'Minggu ke', 'Weekend'] + CUACA_COLUMNS + OMZET_COLUMNS + ['Total Omzet']
+CHUNK_ROWS = 50_000
+
+# --- SHIFT OPERASIONAL (SAMA DENGAN DASHBOARD) ---
+# Pagi 08:00-14:00, Siang 14:00-19:00, Malam 19:00-tutup. Transaksi setelah tengah
+# malam (sebelum 08:00) masih dihitung Malam hari operasional sebelumnya.
+JAM_BUKA = 8
+BATAS_SHIFT_JAM = [14, 19]   # awal Siang & Malam
+
+
+# --- KESALAHAN FILE UPLOAD ---
+# Turunan ValueError agar UI bisa memberi petunjuk yang tepat untuk tiap jenis kesalahan.
+class KolomHilangError(ValueError):
+    """Kolom wajib tidak ditemukan (header tidak dikenali)."""
+
+class FormatTanggalError(ValueError):
+    """Teks tanggal tidak cocok dengan format yang dikenali."""
+
+
+def normalize_column_name(col):
+    """
+    Nama kolom baku untuk satu header:
+    'suhu', 'Suhu (C)', 'temp' -> 'Suhu'; 'hujan', 'curah hujan', 'CH' -> 'Curah Hujan'.
+    """
+    c_lower = str(col).lower().strip()
+    if 'tanggal' in c_lower or 'date' in c_lower:
+        return 'Tanggal'
+    if 'suhu' in c_lower or 'temp' in c_lower:
+        return 'Suhu'
+    if 'hujan' in c_lower or 'rain' in c_lower or 'curah' in c_lower:
+        return 'Curah Hujan'
+    if 'pagi' in c_lower:
+        return 'Omzet Pagi'
+    if 'siang' in c_lower:
+        return 'Omzet Siang'
+    if 'malam' in c_lower:
+        return 'Omzet Malam'
+    if 'total' in c_lower and 'omzet' in c_lower:
+        return 'Total Omzet'
+    # Kolom ekspor transaksi POS
+    if 'jam' in c_lower or 'waktu' in c_lower or 'time' in c_lower:
+        return 'Waktu'
+    if c_lower in ('total', 'grand total', 'subtotal') or any(k in c_lower for k in ('nominal', 'amount', 'jumlah bayar')):
+        return 'Nominal'
+    return col  # Biarkan apa adanya jika tidak dikenali
+
+def normalize_column_names(df):
+    """Memperbaiki seluruh nama kolom `df` secara otomatis (in-place)."""
+    df.columns = [normalize_column_name(c) for c in df.columns]
+    return df
+
+
+# --- PEMBACA PER POTONGAN ---
+def _nama_file(source, name):
+    return (name or getattr(source, 'name', None) or str(source)).lower()
+
+def _excel_chunks(source, chunk_rows):
+    from openpyxl import load_workbook  # hanya saat membaca Excel
+
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [c if c is not None else f'Kolom {i + 1}' for i, c in enumerate(header)]
+        buf = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            buf.append(row)
+            if len(buf) >= chunk_rows:
+                yield pd.DataFrame(buf, columns=header)
+                buf = []
+        if buf:
+            yield pd.DataFrame(buf, columns=header)
+    finally:
+        wb.close()
+
+def read_chunks(source, name=None, chunk_rows=CHUNK_ROWS):
+    """
+    Membaca file (path atau file-like, mis. upload Streamlit) per `chunk_rows` baris
+    -> iterator DataFrame dengan nama kolom yang sudah dinormalisasi.
+    """
+    nama = _nama_file(source, name)
+    if nama.endswith('.csv'):
+        chunks = pd.read_csv(source, chunksize=chunk_rows)
+    elif nama.endswith('.xls'):
+        # Format lama tidak didukung openpyxl -> dibaca sekaligus
+        chunks = [pd.read_excel(source)]
+    else:
+        chunks = _excel_chunks(source, chunk_rows)
+    for chunk in chunks:
+        yield normalize_column_names(chunk)
+
+
+# --- FORMAT TANGGAL (SATU UNTUK SELURUH FILE) ---
+# Format ditebak sekali lalu dipakai untuk semua potongan, sehingga '02/01/2024' tidak
+# dibaca 1 Feb di satu baris dan '13/01/2024' 13 Jan di baris lain. Selama potongan
+# hanya berisi hari <= 12 (DD/MM & MM/DD sama-sama cocok), potongan ditahan sampai ada
+# nilai yang memastikan urutannya; bila tidak pernah ada, dipakai hari di depan (DD/MM).
+# Baris yang tidak cocok dengan format tsb dianggap tidak valid (dihitung & dilaporkan).
+FORMAT_ISO = 'ISO8601'     # tahun di depan (2024-01-02, dengan/tanpa jam/detik) -> tidak ambigu
+SAMPEL_FORMAT = 1_000
+CONTOH_INVALID = 5
+
+def _cocok(sampel, fmt):
+    return int(pd.to_datetime(sampel, errors='coerce', format=fmt).notna().sum())
+
+def _sampel_tanggal(col):
+    """Maks. SAMPEL_FORMAT nilai teks unik, tersebar merata di sepanjang kolom."""
+    sampel = col.dropna()
+    if pd.api.types.is_numeric_dtype(sampel):
+        sampel = sampel.astype('Int64').astype(str)
+    sampel = sampel[sampel.map(lambda v: isinstance(v, str))].astype(str).str.strip().drop_duplicates()
+    if len(sampel) > SAMPEL_FORMAT:
+        sampel = sampel.iloc[np.linspace(0, len(sampel) - 1, SAMPEL_FORMAT).astype(np.int64)]
+    return sampel
+
+def tebak_format_tanggal(col):
+    """
+    (format, ambigu) untuk kolom tanggal teks. Kandidat dari guess_datetime_format dengan
+    lalu tanpa dayfirst; dipilih yang cocok dengan paling banyak nilai sampel (seri ->
+    hari di depan). `ambigu` = kedua urutan (DD/MM & MM/DD) cocok dengan seluruh sampel.
+    FormatTanggalError jika tidak ada format yang dikenali.
+    """
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return None, False
+    sampel = _sampel_tanggal(col)
+    if sampel.empty:
+        return None, False
+    kandidat = []
+    for nilai in sampel.head(100):
+        fmt = guess_datetime_format(nilai)
+        if fmt and fmt.startswith('%Y'):
+            return fmt, False
+        for f in (guess_datetime_format(nilai, dayfirst=True), fmt):
+            if f and f not in kandidat:
+                kandidat.append(f)
+        if kandidat:
+            break
+    if not kandidat:
+        raise FormatTanggalError(f"Format tanggal tidak dikenali (contoh: '{sampel.iloc[0]}'). Gunakan mis. DD/MM/YYYY atau YYYY-MM-DD.")
+    skor = [_cocok(sampel, f) for f in kandidat]
+    terbaik = int(np.argmax(skor))    # seri -> kandidat pertama (dayfirst)
+    ambigu = len(kandidat) > 1 and min(skor) == len(sampel)
+    return kandidat[terbaik], ambigu
+
+def parse_tanggal(col, fmt=None):
+    """
+    Kolom tanggal -> datetime dengan satu format `fmt` (NaT jika tidak cocok).
+    Tanpa `fmt`, format ditebak dari kolom ini (lihat tebak_format_tanggal).
+    """
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col
+    if fmt is None:
+        fmt, _ = tebak_format_tanggal(col)
+    if fmt is None:
+        # Tanpa teks tanggal: sel tanggal Excel (datetime) atau kosong
+        return pd.to_datetime(col, errors='coerce')
+    if pd.api.types.is_numeric_dtype(col):
+        col = col.astype('Int64').astype(str)   # mis. 20240102 terbaca sebagai angka
+    hasil = pd.to_datetime(col, errors='coerce', format=fmt)
+    if fmt.startswith('%Y-'):
+        # Tahun-bulan-hari tidak bisa tertukar: sisa baris dengan presisi jam berbeda
+        # (mis. tanpa detik) dibaca sebagai ISO 8601, bukan format campuran
+        gagal = hasil.isna() & col.notna()
+        if gagal.any():
+            hasil[gagal] = pd.to_datetime(col[gagal], errors='coerce', format=FORMAT_ISO)
+    return hasil
+
+def parse_waktu(col):
+    """Kolom jam ('14:30', '14:30:15', datetime.time, atau datetime) -> Timedelta sejak 00:00."""
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col - col.dt.normalize()
+    # Jam transaksi berulang (maks. 86.400 nilai unik) -> cukup parsing nilai uniknya
+    kode, unik = pd.factorize(col)
+    teks = pd.Series(unik).astype(str).str.strip()
+    # Ambil bagian jam saja jika berisi tanggal + jam
+    teks = teks.str.extract(r'(\d{1,2}:\d{2}(?::\d{2})?)', expand=False)
+    teks = teks.where(teks.str.count(':') == 2, teks + ':00')
+    td = np.append(pd.to_timedelta(teks, errors='coerce').to_numpy(), np.timedelta64('NaT', 'ns'))
+    return pd.Series(td[kode], index=col.index)   # kode -1 (kosong) -> NaT di akhir
+
+def is_transaction_chunk(chunk):
+    """Ekspor transaksi: ada kolom Nominal tetapi tidak ada kolom Omzet per shift."""
+    return 'Nominal' in chunk.columns and not any(c in chunk.columns for c in OMZET_COLUMNS)
+
+def bin_transactions(waktu, nominal):
+    """
+    Transaksi (timestamp, nominal) -> (hari operasional, kolom Omzet per shift) secara vektor.
+    Waktu digeser -JAM_BUKA jam sehingga satu hari operasional = satu hari kalender.
+    """
+    geser = waktu - pd.Timedelta(hours=JAM_BUKA)
+    hari = geser.dt.normalize()
+    menit = ((geser - hari) // pd.Timedelta(minutes=1)).to_numpy()
+    batas = (np.array(BATAS_SHIFT_JAM) - JAM_BUKA) * 60
+    shift = np.searchsorted(batas, menit, side='right')        # 0 Pagi, 1 Siang, 2 Malam
+    nominal = nominal.to_numpy(dtype=float)
+    kolom = {col: np.where(shift == j, nominal, 0.0) for j, col in enumerate(OMZET_COLUMNS)}
+    return hari, kolom
+
+def kolom_tanggal(chunk):
+    """Kolom sumber tanggal: 'Tanggal', atau satu kolom timestamp transaksi ('Waktu')."""
+    if 'Tanggal' in chunk.columns:
+        return chunk['Tanggal']
+    if is_transaction_chunk(chunk) and 'Waktu' in chunk.columns:
+        return chunk['Waktu']
+    return None
+
+def _transaksi_ke_shift(chunk, tanggal):
+    if 'Waktu' in chunk.columns and 'Tanggal' in chunk.columns:
+        waktu = tanggal.dt.normalize() + parse_waktu(chunk['Waktu'])
+    elif (tanggal.dropna() == tanggal.dropna().dt.normalize()).all():
+        raise ValueError("File transaksi harus memiliki jam transaksi (kolom 'Jam'/'Waktu' atau Tanggal berisi jam).")
+    else:
+        waktu = tanggal
+    hari, kolom = bin_transactions(waktu, pd.to_numeric(chunk['Nominal'], errors='coerce').fillna(0))
+    out = pd.DataFrame({'Tanggal': hari, **kolom}, index=chunk.index)
+    # Ekspor POS umumnya tanpa cuaca -> dibiarkan kosong bila tidak ada
+    for col in CUACA_COLUMNS:
+        out[col] = pd.to_numeric(chunk[col], errors='coerce') if col in chunk.columns else np.nan
+    return out
+
+def validate_chunk(chunk, fmt=None):
+    """
+    Tipe kolom wajib dirapikan; baris tanpa Tanggal valid (kosong atau tidak cocok
+    dengan format `fmt`) dibuang. Omzet & cuaca kosong tetap NaN (bukan 0); hanya nominal
+    transaksi kosong yang dihitung 0. File transaksi (Tanggal/Jam + Nominal) lebih dulu dibagi ke shift.
+    Mengembalikan (potongan bersih, jumlah baris dibuang, nilai tanggal yang tidak valid).
+    """
+    sumber = kolom_tanggal(chunk)
+    if is_transaction_chunk(chunk):
+        if sumber is None:
+            raise KolomHilangError("Masih ada kolom yang hilang: Tanggal")
+        tanggal = parse_tanggal(sumber, fmt)
+        out = _transaksi_ke_shift(chunk, tanggal)
+    else:
+        hilang = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+        if hilang:
+            raise KolomHilangError(f"Masih ada kolom yang hilang: {', '.join(hilang)}")
+        tanggal = parse_tanggal(sumber, fmt)
+        out = pd.DataFrame({'Tanggal': tanggal.dt.normalize()})
+        for col in CUACA_COLUMNS:
+            out[col] = pd.to_numeric(chunk[col], errors='coerce')
+        for col in OMZET_COLUMNS:
+            out[col] = pd.to_numeric(chunk[col], errors='coerce')
+    valid = out['Tanggal'].notna()
+    salah = tanggal.isna().to_numpy() & sumber.notna().to_numpy()
+    return out[valid], int((~valid).sum()), sumber[salah]
+
+
+class DailyAccumulator:
+    """Menjumlahkan potongan baris per hari; memori sebanding jumlah hari, bukan baris."""
+    MAX_PARTS = 32
+    MAX_TERTUNDA = 8    # potongan berformat ambigu yang ditahan sebelum format diputuskan
+
+    def __init__(self, format_tanggal=None):
+        self._parts = []
+        self._tertunda = []     # potongan mentah menunggu format tanggal pasti
+        self.rows = 0
+        self.dropped = 0
+        self.chunks = 0
+        self.transaksi = False  # True jika sumbernya ekspor transaksi (dibagi per shift)
+        self.format_tanggal = format_tanggal  # format tebakan (atau yang diberikan), dipakai semua potongan
+        self.format_ambigu = False  # DD/MM & MM/DD sama-sama cocok dengan seluruh isi file
+        self.tanggal_invalid = 0    # baris berisi teks tanggal yang tidak cocok dengan format
+        self.contoh_invalid = []
+
+    @staticmethod
+    def _ringkas(df):
+        # Cuaca: simpan jumlah & banyak nilai agar rata-rata harian tetap benar antar potongan
+        for col in CUACA_COLUMNS:
+            df[col + ' n'] = df[col].notna().astype(np.int64)
+            df[col] = df[col].fillna(0)
+        # min_count=1: hari yang seluruh Omzet-nya kosong tetap NaN, bukan omzet 0
+        return df.groupby('Tanggal', sort=False).sum(min_count=1)
+
+    def add(self, chunk):
+        self.transaksi = self.transaksi or is_transaction_chunk(chunk)
+        self.rows += len(chunk)
+        self.chunks += 1
+        sumber = kolom_tanggal(chunk)
+        if self.format_tanggal is None and sumber is not None:
+            fmt, ambigu = tebak_format_tanggal(sumber)
+            self._tertunda.append(chunk)
+            if ambigu and len(self._tertunda) < self.MAX_TERTUNDA:
+                return  # belum ada hari > 12: tunggu potongan berikutnya memastikan urutan
+            self._putuskan_format(fmt, ambigu)
+        else:
+            self._proses(chunk)
+
+    def _putuskan_format(self, fmt, ambigu):
+        self.format_tanggal, self.format_ambigu = fmt, ambigu
+        tertunda, self._tertunda = self._tertunda, []
+        for chunk in tertunda:
+            self._proses(chunk)
+
+    def _proses(self, chunk):
+        bersih, dibuang, invalid = validate_chunk(chunk, self.format_tanggal)
+        self.dropped += dibuang
+        self.tanggal_invalid += len(invalid)
+        self.contoh_invalid = (self.contoh_invalid + invalid.astype(str).head(CONTOH_INVALID).tolist())[:CONTOH_INVALID]
+        self._parts.append(self._ringkas(bersih))
+        if len(self._parts) > self.MAX_PARTS:
+            self._parts = [pd.concat(self._parts).groupby(level=0).sum(min_count=1)]
+
+    def finish(self):
+        """Akhir file: potongan yang masih ambigu dibaca dengan tebakan terakhir (hari di depan)."""
+        if self._tertunda:
+            fmt, _ = tebak_format_tanggal(kolom_tanggal(self._tertunda[-1]))
+            self._putuskan_format(fmt, True)
+        return self
+
+    def result(self):
+        """DataFrame harian (urut Tanggal) dengan kolom turunan & Total Omzet."""
+        if not self._parts:
+            return pd.DataFrame(columns=DATASET_COLUMNS)
+        total = pd.concat(self._parts).groupby(level=0).sum(min_count=1).sort_index()
+        df = pd.DataFrame({'Tanggal': total.index})
+        for col in CUACA_COLUMNS:
+            n = total[col + ' n'].to_numpy()
+            df[col] = np.where(n > 0, total[col].to_numpy() / np.maximum(n, 1), np.nan)
+        for col in OMZET_COLUMNS:
+            arr = total[col].to_numpy()
+            # Rupiah bulat tetap integer seperti dataset historis
+            df[col] = arr.astype(np.int64) if np.array_equal(arr, np.round(arr)) else arr
+        return lengkapi_kolom(df)[DATASET_COLUMNS]
+
+
+@profiling.timed('ingest')
+def ingest_file(source, name=None, chunk_rows=CHUNK_ROWS, format_tanggal=None):
+    """
+    Membaca & meringkas file upload secara bertahap -> (DataFrame harian, DailyAccumulator).
+    `format_tanggal` (mis. '%d/%m/%Y') dipakai untuk seluruh file; tanpa itu ditebak dari
+    potongan awal (ditunda selama urutan hari/bulan belum pasti). Accumulator berisi statistik: rows, dropped, chunks, transaksi,
+    format_tanggal, format_ambigu, tanggal_invalid, contoh_invalid.
+    KolomHilangError jika kolom wajib hilang, FormatTanggalError jika format tanggal tidak dikenali.
+    """
+    acc = DailyAccumulator(format_tanggal)
+    for chunk in read_chunks(source, name, chunk_rows):
+        acc.add(chunk)
+    return acc.finish().result(), acc
@@ -0,0 +1,155 @@
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+# --- INSTRUMENTASI JALUR UTAMA ---
+# Mencatat waktu (wall time) per tahap: load dataset, fitur, predict, grafik, ekspor.
+# Setiap rerun Streamlit berjalan di thread sendiri -> status rerun disimpan per thread.
+# Saat nonaktif, stage() hanya mengembalikan context kosong (biaya ~nol).
+PROFILE_ENABLED = os.environ.get('PREDIKSIRF_PROFILE', '') not in ('', '0')
+MAX_EVENTS = 5000
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        self.parent = stack[-1] if stack else None
+        self.depth = len(stack)
+        stack.append(self.name)
+        self.t_wall = time.time()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        durasi = time.perf_counter() - self.t0
+        self.profiler._stack().pop()
+        self.profiler._record({
+            'rerun': getattr(self.profiler._local, 'rerun', 0),
+            'sesi': getattr(self.profiler._local, 'sesi', None),
+            'stage': self.name,
+            'parent': self.parent,
+            'depth': self.depth,
+            'start': self.t_wall,
+            'ms': durasi * 1000,
+            'error': exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled=False, max_events=MAX_EVENTS):
+        self.enabled = enabled          # default untuk thread yang tidak memanggil begin_rerun
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._reruns = itertools.count(1)
+
+    # --- STATUS PER RERUN ---
+    def begin_rerun(self, enabled=None, sesi=None):
+        """Dipanggil di awal script (app.py). Mengembalikan id rerun untuk panel debug."""
+        loc = self._local
+        loc.rerun = next(self._reruns)
+        loc.sesi = sesi
+        loc.enabled = self.enabled if enabled is None else bool(enabled)
+        loc.stack = []
+        loc.t_mulai = time.perf_counter()
+        return loc.rerun
+
+    def is_enabled(self):
+        return getattr(self._local, 'enabled', self.enabled)
+
+    def elapsed_ms(self):
+        """Waktu sejak begin_rerun pada thread ini (ms), atau None."""
+        t = getattr(self._local, 't_mulai', None)
+        return None if t is None else (time.perf_counter() - t) * 1000
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, event):
+        with self._lock:
+            self._events.append(event)
+
+    # --- PENCATATAN ---
+    def stage(self, name):
+        """Context manager: `with profiler.stage('predict'): ...`"""
+        if not self.is_enabled():
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name=None):
+        """Decorator: mencatat seluruh pemanggilan fungsi sebagai satu tahap."""
+        def deco(fn):
+            label = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.is_enabled():
+                    return fn(*args, **kwargs)
+                with _Stage(self, label):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    # --- MEMBACA & EKSPOR ---
+    def events(self, rerun=None, sesi=None):
+        with self._lock:
+            data = list(self._events)
+        if rerun is not None:
+            data = [e for e in data if e['rerun'] == rerun]
+        if sesi is not None:
+            data = [e for e in data if e['sesi'] == sesi]
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    def to_frame(self, events=None):
+        import pandas as pd
+        cols = ['rerun', 'sesi', 'stage', 'parent', 'depth', 'start', 'ms', 'error']
+        df = pd.DataFrame(self.events() if events is None else events, columns=cols)
+        df['start'] = pd.to_datetime(df['start'], unit='s')
+        return df
+
+    def summary(self, events=None):
+        """Per tahap: jumlah panggilan, total/rata-rata/maks waktu (ms), urut total terbesar."""
+        df = self.to_frame(events)
+        ringkas = df.groupby('stage')['ms'].agg(calls='size', total_ms='sum', mean_ms='mean', max_ms='max')
+        return ringkas.sort_values('total_ms', ascending=False).reset_index()
+
+    def export_jsonl(self, path, events=None):
+        """Menulis event (satu JSON per baris) untuk dianalisis offline."""
+        with open(path, 'w') as f:
+            for e in (self.events() if events is None else events):
+                f.write(json.dumps(e) + '\n')
+
+
+PROFILER = Profiler(PROFILE_ENABLED)
+
+# Pintasan untuk instance global
+stage = PROFILER.stage
+timed = PROFILER.timed
+begin_rerun = PROFILER.begin_rerun
@@ -0,0 +1,155 @@
+import calendar
+import io
+from itertools import zip_longest
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .export import column_widths
+from .forecast import generate_forecast_data, get_backtest
+
+
+# --- LAPORAN BULANAN GABUNGAN (MULTI-SHEET) ---
+# Satu workbook per bulan: prediksi harian bulan tsb, agregat bulanan setahun (mode
+# Per Tahun), backtest harian seluruh histori, dan metrik MAPE/RMSE/R2 (Perbandingan).
+# Semua tabel diambil dari cache prediksi/backtest yang sama dengan halaman aplikasi.
+# Workbook ditulis dengan xlsxwriter constant_memory: baris langsung di-flush ke file
+# sementara, jadi memori tidak bertambah walau backtest berisi bertahun-tahun data.
+SHEET_HARIAN = 'Prediksi Harian'
+SHEET_AGREGAT = 'Agregat Bulanan'
+SHEET_BACKTEST = 'Backtest Harian'
+SHEET_METRIK = 'Metrik'
+KOLOM_SHIFT = ['Prediksi Pagi', 'Prediksi Siang', 'Prediksi Malam', 'Prediksi Total']
+
+FORMAT_RUPIAH = '#,##0'
+FORMAT_PERSEN = '0.00%'
+FORMAT_DESIMAL = '0.0000'
+FORMAT_TANGGAL = 'yyyy-mm-dd'
+BARIS_PER_POTONGAN = 5_000
+
+
+def _format_kolom(col, series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return FORMAT_TANGGAL
+    if col == 'MAPE':
+        return FORMAT_PERSEN
+    if col == 'R2':
+        return FORMAT_DESIMAL
+    if pd.api.types.is_float_dtype(series) and col not in ('Suhu', 'Hujan', 'Suhu P50', 'Hujan P50'):
+        return FORMAT_RUPIAH
+    return None
+
+def write_frame(workbook, worksheet, df, baris_awal=0, judul=None):
+    """
+    Menulis `df` baris demi baris (urut, sesuai syarat constant_memory).
+    NaN dibiarkan kosong. Mengembalikan baris berikutnya yang masih kosong.
+    """
+    tebal = workbook.add_format({'bold': True})
+    r = baris_awal
+    if judul:
+        worksheet.write_string(r, 0, judul, tebal)
+        r += 1
+    worksheet.write_row(r, 0, [str(c) for c in df.columns], tebal)
+    r += 1
+
+    jenis, formats = [], []
+    for col in df.columns:
+        s = df[col]
+        fmt = _format_kolom(col, s)
+        formats.append(workbook.add_format({'num_format': fmt}) if fmt else None)
+        if pd.api.types.is_datetime64_any_dtype(s):
+            jenis.append('tanggal')
+        elif pd.api.types.is_numeric_dtype(s):
+            jenis.append('angka')
+        else:
+            jenis.append('teks')
+
+    # Konversi ke objek Python per potongan agar memori tambahan tidak sebanding jumlah baris
+    for a in range(0, len(df), BARIS_PER_POTONGAN):
+        potongan = df.iloc[a:a + BARIS_PER_POTONGAN]
+        kolom = []
+        for j, col in enumerate(df.columns):
+            s = potongan[col]
+            if jenis[j] == 'tanggal':
+                kolom.append((s.dt.to_pydatetime(), s.isna().to_numpy()))
+            elif jenis[j] == 'angka':
+                nilai = s.to_numpy(dtype=float, na_value=np.nan)
+                kolom.append((nilai.tolist(), ~np.isfinite(nilai)))
+            else:
+                kolom.append((s.astype(object).tolist(), s.isna().to_numpy()))
+
+        for i in range(len(potongan)):
+            for j, (nilai, kosong) in enumerate(kolom):
+                if kosong[i]:
+                    continue
+                if jenis[j] == 'tanggal':
+                    worksheet.write_datetime(r, j, nilai[i], formats[j])
+                elif jenis[j] == 'angka':
+                    worksheet.write_number(r, j, nilai[i], formats[j])
+                else:
+                    worksheet.write_string(r, j, str(nilai[i]), formats[j])
+            r += 1
+    return r
+
+
+def monthly_aggregates(df_tahun):
+    """Total per bulan dari prediksi setahun (sama dengan tabel mode Per Tahun di dashboard)."""
+    kolom = [c for c in df_tahun.columns if c in KOLOM_SHIFT]
+    return df_tahun.groupby(['Tahun', 'Bulan', 'Bulan_Nama'], sort=False)[kolom].sum().reset_index()
+
+
+def _metrik_bulan(backtest, awal_bulan):
+    b = backtest.bulanan
+    return b[(b['Tahun'] == awal_bulan.year) & (b['Bulan_Angka'] == awal_bulan.month)]
+
+
+@profiling.timed('report')
+def build_monthly_report(model, df_historis, tahun, bulan, output=None, base_suhu=27.0, base_hujan=5.0):
+    """
+    Workbook laporan bulan `bulan`/`tahun`. `output` = path file atau file-like;
+    tanpa `output` dikembalikan bytes. Prediksi & backtest memakai cache yang sama
+    dengan dashboard/Perbandingan sehingga tidak dihitung ulang bila sudah ada.
+    """
+    import xlsxwriter
+
+    awal_bulan = pd.Timestamp(year=int(tahun), month=int(bulan), day=1)
+    awal_tahun = awal_bulan.replace(month=1)
+    with profiling.stage('report.data'):
+        df_harian = generate_forecast_data(model, df_historis, awal_bulan, base_suhu, base_hujan,
+                                           days=calendar.monthrange(awal_bulan.year, awal_bulan.month)[1],
+                                           interval=True)
+        df_tahun = generate_forecast_data(model, df_historis, awal_tahun, base_suhu, base_hujan,
+                                          days=366 if calendar.isleap(awal_tahun.year) else 365,
+                                          interval=True)
+        backtest = get_backtest(model, df_historis)
+
+    kembalikan_bytes = output is None
+    if kembalikan_bytes:
+        output = io.BytesIO()
+
+    with profiling.stage('report.write'):
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'in_memory': False})
+        try:
+            tabel = [
+                (SHEET_HARIAN, [(None, df_harian)]),
+                (SHEET_AGREGAT, [(None, monthly_aggregates(df_tahun))]),
+                (SHEET_BACKTEST, [(None, backtest.harian)]),
+                (SHEET_METRIK, [(f'Metrik {awal_bulan:%m/%Y}', _metrik_bulan(backtest, awal_bulan)),
+                                ('Metrik per Bulan', backtest.bulanan),
+                                ('Metrik per Tahun', backtest.tahunan)]),
+            ]
+            for nama, bagian in tabel:
+                worksheet = workbook.add_worksheet(nama)
+                lebar = [max(w) for w in zip_longest(*(column_widths(df) for _, df in bagian), fillvalue=0)]
+                for i, w in enumerate(lebar):
+                    worksheet.set_column(i, i, w)
+                r = 0
+                for judul, df in bagian:
+                    r = write_frame(workbook, worksheet, df, r, judul) + 1
+        finally:
+            workbook.close()
+
+    if kembalikan_bytes:
+        return output.getvalue()
+    return output
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from . import features
+from . import profiling
+from .cache import LRUCache
+from .features import FEATURE_COLS, SHIFT_COLS, MAX_LAG, DEFAULT_OMZET
+from .forecast import history_store, model_token, predict_recursive, kolom_kalender
+
+
+# --- SKENARIO CUACA MONTE CARLO ---
+# Di luar histori, cuaca tidak diketahui. Alih-alih satu asumsi konstan, diambil N
+# lintasan cuaca: tiap hari mengambil pasangan (Suhu, Curah Hujan) acak dari hari-hari
+# historis pada bulan kalender yang sama. Hari yang ada di histori tetap memakai data asli.
+# Seluruh N skenario diprediksi bersama: satu panggilan model per blok 7 hari.
+KUANTIL = (0.1, 0.5, 0.9)
+LABEL_KUANTIL = ('P10', 'P50', 'P90')
+
+
+class ScenarioResult:
+    def __init__(self, tanggal, pred, suhu, hujan):
+        self.tanggal = tanggal  # DatetimeIndex (hari,)
+        self.pred = pred        # (hari, N, shift) prediksi per skenario
+        self.suhu = suhu        # (hari, N) cuaca yang dipakai tiap skenario
+        self.hujan = hujan
+
+    @property
+    def n_scenarios(self):
+        return self.pred.shape[1]
+
+    @property
+    def total(self):
+        """(hari, N) total omzet per skenario."""
+        return self.pred.sum(axis=2)
+
+    def harian(self):
+        """Per hari: P10/P50/P90 tiap shift & total, plus median cuaca."""
+        data = kolom_kalender(self.tanggal)
+        q = np.quantile(self.pred, KUANTIL, axis=1)    # (kuantil, hari, shift)
+        q_total = np.quantile(self.total, KUANTIL, axis=1)
+        for j, col in enumerate(SHIFT_COLS):
+            nama = 'Prediksi ' + col.replace('Omzet ', '')
+            for k, label in enumerate(LABEL_KUANTIL):
+                data[f'{nama} {label}'] = q[k, :, j]
+        for k, label in enumerate(LABEL_KUANTIL):
+            data[f'Prediksi Total {label}'] = q_total[k]
+        data['Suhu P50'] = np.median(self.suhu, axis=1)
+        data['Hujan P50'] = np.median(self.hujan, axis=1)
+        return pd.DataFrame(data)
+
+    def per_bulan(self):
+        """
+        Total bulanan P10/P50/P90. Kuantil dihitung dari jumlah per skenario
+        (bukan jumlah kuantil harian) agar rentangnya benar untuk periode panjang.
+        """
+        periode = self.tanggal.to_period('M')
+        kunci, idx = np.unique(periode.asi8, return_inverse=True)
+        jumlah = np.zeros((len(kunci), self.n_scenarios))
+        np.add.at(jumlah, idx, self.total)
+        q = np.quantile(jumlah, KUANTIL, axis=1)
+        awal = pd.PeriodIndex.from_ordinals(kunci, freq='M').to_timestamp()
+        data = {'Tahun': awal.year.astype('int64'), 'Bulan': awal.month.astype('int64')}
+        for k, label in enumerate(LABEL_KUANTIL):
+            data[f'Prediksi Total {label}'] = q[k]
+        return pd.DataFrame(data)
+
+
+def sample_weather(store, tanggal, n, rng, base_suhu, base_hujan):
+    """
+    N lintasan cuaca untuk `tanggal` (DatetimeIndex) -> (suhu, hujan) berbentuk (hari, N).
+    Diambil dari hari historis dengan bulan yang sama; bulan tanpa data memakai seluruh
+    histori, histori kosong memakai asumsi konstan.
+    """
+    suhu_h = store.values.get('Suhu')
+    hujan_h = store.values.get('Curah Hujan')
+    if suhu_h is None or hujan_h is None:
+        ada = np.zeros(0, dtype=bool)
+    else:
+        ada = store.valid & ~np.isnan(suhu_h) & ~np.isnan(hujan_h)
+    hari = np.flatnonzero(ada)
+    if len(hari) == 0:
+        bentuk = (len(tanggal), n)
+        return np.full(bentuk, float(base_suhu)), np.full(bentuk, float(base_hujan))
+
+    # Kolam nilai historis diurutkan per bulan -> tiap bulan = potongan [awal, awal + jumlah)
+    bulan_h = (store.start + pd.to_timedelta(hari, unit='D')).month.to_numpy()
+    urut = np.argsort(bulan_h, kind='stable')
+    kolam_suhu, kolam_hujan = suhu_h[hari][urut], hujan_h[hari][urut]
+    jumlah = np.bincount(bulan_h, minlength=13)
+    awal = np.concatenate([[0], np.cumsum(jumlah)[:-1]])
+    kosong = jumlah == 0
+    jumlah[kosong] = len(hari)
+    awal[kosong] = 0
+
+    bulan = tanggal.month.to_numpy()
+    pilih = awal[bulan][:, None] + (rng.random((len(tanggal), n)) * jumlah[bulan][:, None]).astype(np.intp)
+    return kolam_suhu[pilih], kolam_hujan[pilih]
+
+
+@profiling.timed('scenario.compute')
+def _hitung_skenario(model, store, start, base_suhu, base_hujan, days, n, seed):
+    rng = np.random.default_rng(seed)
+    tanggal = pd.date_range(start, periods=days, freq='D')
+    axis = store.offset(start) - MAX_LAG + np.arange(MAX_LAG + days)
+    tanggal_timeline = pd.date_range(start - pd.Timedelta(days=MAX_LAG), periods=MAX_LAG + days, freq='D')
+    pos = MAX_LAG + np.arange(days)
+
+    with profiling.stage('scenario.features'):
+        # Timeline cuaca (posisi, N): data asli jika ada, selain itu sampel skenario
+        sampel_suhu, sampel_hujan = sample_weather(store, tanggal_timeline, n, rng, base_suhu, base_hujan)
+        asli_suhu = store.window('Suhu', axis, np.nan)[:, None]
+        asli_hujan = store.window('Curah Hujan', axis, np.nan)[:, None]
+        suhu = np.where(np.isnan(asli_suhu), sampel_suhu, asli_suhu)
+        hujan = np.where(np.isnan(asli_hujan), sampel_hujan, asli_hujan)
+
+        # Timeline omzet (posisi, N, shift): histori / DEFAULT_OMZET, lalu ditimpa prediksi
+        omzet = np.column_stack([store.window(s, axis, DEFAULT_OMZET) for s in SHIFT_COLS])
+        omzet = np.repeat(omzet[:, None, :], n, axis=1)
+
+        X = np.empty((days, n, len(FEATURE_COLS)), dtype=float)
+        features.fill_time_features(X, tanggal)
+        features.fill_weather_features(X, suhu, hujan, pos)
+
+    pred = np.empty((days, n, len(SHIFT_COLS)), dtype=float)
+    predict_recursive(model, X, omzet, pos, pred)
+    return ScenarioResult(tanggal, pred, X[..., 4].copy(), X[..., 5].copy())
+
+
+# --- CACHE HASIL SKENARIO ---
+# Kunci: (model, dataset, tanggal awal, horizon, jumlah skenario, seed, asumsi cuaca)
+SCENARIO_CACHE_SIZE = 8
+_scenario_cache = LRUCache(maxsize=SCENARIO_CACHE_SIZE)
+
+def clear_scenario_cache():
+    _scenario_cache.clear()
+
+@profiling.timed('scenario')
+def generate_scenario_forecast(model, df_historis, start_date, base_suhu=27.0, base_hujan=5.0,
+                               days=30, n_scenarios=1000, seed=0):
+    """
+    Prediksi `days` hari untuk `n_scenarios` lintasan cuaca Monte Carlo -> ScenarioResult.
+    `base_suhu`/`base_hujan` hanya dipakai bila histori tidak punya data cuaca sama sekali.
+    """
+    start = pd.to_datetime(start_date)
+    store = history_store(df_historis)
+    key = (model_token(model), store.versi, start, int(days), int(n_scenarios), int(seed),
+           float(base_suhu), float(base_hujan))
+    hasil = _scenario_cache.get(key)
+    if hasil is None:
+        hasil = _hitung_skenario(model, store, start, base_suhu, base_hujan, int(days), int(n_scenarios), seed)
+        _scenario_cache.put(key, hasil)
+    return hasil
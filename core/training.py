@@ -0,0 +1,193 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from . import features
+from . import profiling
+from .data import MODEL_PATH
+from .features import FEATURE_COLS
+from .forecast import compile_model
+from .history_store import HistoryStore
+
+
+# --- PELATIHAN ULANG MODEL ---
+# Model multi-output [Pagi, Siang, Malam] dilatih ulang dari histori terbaru dengan
+# 17 fitur yang sama seperti prediksi & backtest. Hyperparameter diambil dari model
+# yang sedang aktif (default: seperti model_skripsi_multishift.pkl).
+DEFAULT_PARAMS = {'n_estimators': 100, 'random_state': 42}
+MIN_TRAINING_ROWS = 30
+
+
+class TrainingReport:
+    def __init__(self, rows, durasi_s, peak_mb, model_mb, n_estimators, n_jobs):
+        self.rows = rows                  # jumlah baris latih (setelah baris tak lengkap dibuang)
+        self.durasi_s = durasi_s          # waktu fit
+        self.peak_mb = peak_mb            # kenaikan RSS puncak selama fit, None jika tak tersedia
+        self.model_mb = model_mb          # ukuran file model
+        self.n_estimators = n_estimators
+        self.n_jobs = n_jobs
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
+# --- MEMORI SELAMA FIT ---
+# Alokasi C sklearn tidak terlihat oleh tracemalloc, dan ru_maxrss adalah puncak seumur
+# proses server. Karena itu RSS diambil sampelnya oleh thread selama fit; yang dilaporkan
+# kenaikan puncak terhadap RSS sesaat sebelum fit (termasuk alokasi thread lain di proses).
+INTERVAL_SAMPEL_S = 0.01
+
+def rss_mb():
+    """RSS proses saat ini dalam MB (Linux, dari /proc); None jika tidak tersedia."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class MemoryProbe:
+    """`with MemoryProbe() as m:` -> m.peak_mb = kenaikan RSS puncak selama blok (MB) atau None."""
+
+    def __init__(self, interval=INTERVAL_SAMPEL_S):
+        self.interval = interval
+        self.peak_mb = None
+        self._awal = None
+        self._puncak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sampel, name='memory-probe', daemon=True)
+
+    def _sampel(self):
+        while not self._stop.wait(self.interval):
+            self._puncak = max(self._puncak, rss_mb())
+
+    def __enter__(self):
+        self._awal = rss_mb()
+        if self._awal is not None:
+            self._puncak = self._awal
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._awal is not None:
+            self._stop.set()
+            self._thread.join()
+            self._puncak = max(self._puncak, rss_mb())
+            self.peak_mb = self._puncak - self._awal
+        return False
+
+def model_params(base_model=None):
+    """Hyperparameter untuk model baru: dari `base_model` jika ada, selain itu DEFAULT_PARAMS."""
+    if base_model is not None and hasattr(base_model, 'get_params'):
+        return base_model.get_params()
+    return dict(DEFAULT_PARAMS)
+
+@profiling.timed('train')
+def fit_model(df_historis, base_model=None, n_jobs=-1):
+    """Melatih RandomForestRegressor multi-output -> (model, TrainingReport tanpa model_mb)."""
+    from sklearn.ensemble import RandomForestRegressor  # impor berat -> hanya saat melatih
+
+    # Store sendiri (bukan history_store) agar memo milik UI tidak tergeser thread latar
+    store = HistoryStore.from_frame(df_historis)
+    with profiling.stage('train.features'):
+        _, X, y = features.training_features(store)
+    if len(X) < MIN_TRAINING_ROWS:
+        raise ValueError(f"Data latih terlalu sedikit: {len(X)} baris lengkap (minimal {MIN_TRAINING_ROWS})")
+
+    params = model_params(base_model)
+    params['n_jobs'] = n_jobs
+    model = RandomForestRegressor(**params)
+
+    t0 = time.perf_counter()
+    with profiling.stage('train.fit'), MemoryProbe() as memori:
+        model.fit(pd.DataFrame(X, columns=FEATURE_COLS), y)
+    durasi = time.perf_counter() - t0
+
+    # Inferensi tetap satu thread seperti model asli (lihat compiled_forest untuk kecepatan)
+    model.set_params(n_jobs=None)
+    return model, TrainingReport(len(X), durasi, memori.peak_mb, None, params['n_estimators'], n_jobs)
+
+def save_model_atomic(model, path=MODEL_PATH):
+    """Tulis model ke file sementara lalu os.replace -> pembaca tidak pernah melihat file setengah jadi."""
+    import joblib
+
+    tmp = f'{path}.tmp-{os.getpid()}-{threading.get_ident()}'
+    try:
+        joblib.dump(model, tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return os.path.getsize(path) / 2**20
+
+
+# --- JOB LATAR BELAKANG ---
+# Satu pelatihan per proses server; UI cukup membaca status job tanpa menunggu.
+class RetrainJob:
+    def __init__(self, df_historis, model_path=MODEL_PATH, base_model=None, on_done=None, n_jobs=-1):
+        self.df_historis = df_historis
+        self.model_path = model_path
+        self.base_model = base_model
+        self.on_done = on_done          # dipanggil dengan model baru setelah tersimpan
+        self.n_jobs = n_jobs
+        self.status = 'menunggu'        # menunggu | berjalan | selesai | gagal
+        self.model = None
+        self.report = None
+        self.error = None
+        self.mulai = None
+        self.selesai = None
+        self._thread = threading.Thread(target=self._run, name='retrain-model', daemon=True)
+
+    @property
+    def berjalan(self):
+        return self.status in ('menunggu', 'berjalan')
+
+    @property
+    def elapsed(self):
+        if self.mulai is None:
+            return 0.0
+        return (self.selesai or time.perf_counter()) - self.mulai
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+        return self
+
+    def _run(self):
+        self.mulai = time.perf_counter()
+        self.status = 'berjalan'
+        try:
+            model, report = fit_model(self.df_historis, self.base_model, self.n_jobs)
+            compile_model(model)    # siap pakai sebelum ditukar -> prediksi pertama tidak lambat
+            report.model_mb = save_model_atomic(model, self.model_path)
+            self.model, self.report = model, report
+            if self.on_done is not None:
+                self.on_done(model)
+            self.status = 'selesai'
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.status = 'gagal'
+        finally:
+            self.selesai = time.perf_counter()
+            self.df_historis = None
+
+
+_job = None
+_job_lock = threading.Lock()
+
+def start_retraining(df_historis, model_path=MODEL_PATH, base_model=None, on_done=None, n_jobs=-1):
+    """Mulai pelatihan ulang di thread latar. Jika masih ada yang berjalan, job itu yang dikembalikan."""
+    global _job
+    with _job_lock:
+        if _job is not None and _job.berjalan:
+            return _job
+        _job = RetrainJob(df_historis, model_path, base_model, on_done, n_jobs).start()
+        return _job
+
+def current_job():
+    """Job pelatihan terakhir (None jika belum pernah dijalankan)."""
+    return _job
@@ -0,0 +1,51 @@
+"""
+Laporan bulanan gabungan tanpa Streamlit (bisa dijadwalkan, mis. lewat cron).
+
+    python monthly_report.py [--month 2025-01] [--months 3] [--out-dir laporan]
+
+Satu workbook per bulan berisi sheet: Prediksi Harian, Agregat Bulanan (setahun),
+Backtest Harian dan Metrik (MAPE/RMSE/R2). Tanpa --month dipakai bulan berjalan;
+--months N membuat laporan untuk N bulan berturut-turut mulai --month.
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+import core
+from core.report import build_monthly_report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--month', default=None, help="Bulan awal YYYY-MM (default: bulan berjalan)")
+    parser.add_argument('--months', type=int, default=1)
+    parser.add_argument('--out-dir', default='.')
+    parser.add_argument('--model', default=core.MODEL_PATH)
+    parser.add_argument('--dataset', default=core.DATA_PATH)
+    parser.add_argument('--suhu', type=float, default=27.0, help="Asumsi suhu untuk hari di luar histori")
+    parser.add_argument('--hujan', type=float, default=5.0, help="Asumsi curah hujan untuk hari di luar histori")
+    args = parser.parse_args(argv)
+
+    model, df = core.load_resources_from(args.model, args.dataset)
+    if model is None:
+        print(f"Model tidak ditemukan: {args.model}", file=sys.stderr)
+        return 1
+    if df is None:
+        print(f"Dataset tidak dapat dibaca: {args.dataset}", file=sys.stderr)
+        return 1
+
+    awal = pd.Period(args.month, freq='M') if args.month else pd.Timestamp.today().to_period('M')
+    os.makedirs(args.out_dir, exist_ok=True)
+    for periode in pd.period_range(awal, periods=args.months, freq='M'):
+        path = os.path.join(args.out_dir, f"Laporan_Bulanan_{periode.year}-{periode.month:02d}.xlsx")
+        t0 = time.perf_counter()
+        build_monthly_report(model, df, periode.year, periode.month, path, args.suhu, args.hujan)
+        print(f"{path} ({time.perf_counter() - t0:.2f} s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
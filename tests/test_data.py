@@ -0,0 +1,32 @@
+"""
+Pemuatan dataset per path: fallback CSV bawaan hanya untuk dataset bawaan.
+
+Jalankan dari root proyek:
+    python -m pytest tests
+"""
+import pandas as pd
+
+import core
+
+
+def dataset(hari=10):
+    return pd.DataFrame({
+        'Tanggal': pd.date_range('2024-01-01', periods=hari, freq='D'),
+        'Suhu': 27.0, 'Curah Hujan': 1.0,
+        'Omzet Pagi': 1_000, 'Omzet Siang': 2_000, 'Omzet Malam': 3_000,
+    })
+
+
+def test_path_eksplisit_tidak_jatuh_ke_csv_bawaan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dataset(5).to_csv(core.DATA_PATH_CSV, index=False)
+    assert core.load_dataset('outlet_tidak_ada.xlsx') is None
+    assert len(core.load_dataset(core.DATA_PATH)) == 5     # dataset bawaan tetap punya fallback
+
+
+def test_dataset_csv_dibaca_sebagai_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dataset(10).to_csv('outlet_a.csv', index=False)
+    df = core.load_dataset('outlet_a.csv', write_cache=False)
+    assert len(df) == 10
+    assert pd.api.types.is_datetime64_any_dtype(df['Tanggal'])
@@ -0,0 +1,132 @@
+"""
+Ingesti upload: format tanggal teks dipilih sekali per file dan berlaku lintas potongan.
+
+Jalankan dari root proyek:
+    python -m pytest tests
+"""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.ingest import FormatTanggalError, KolomHilangError, ingest_file
+
+HARI = 90   # melewati beberapa batas potongan (chunk_rows kecil) dan hari > 12
+
+
+def histori(hari=HARI, start='2024-01-01'):
+    tanggal = pd.date_range(start, periods=hari, freq='D')
+    n = np.arange(hari)
+    return pd.DataFrame({
+        'Tanggal': tanggal,
+        'Suhu': 27.0 + (n % 5) * 0.5,
+        'Curah Hujan': (n % 7) * 1.0,
+        'Omzet Pagi': 1_000_000 + n * 1_000,
+        'Omzet Siang': 2_000_000 + n * 1_000,
+        'Omzet Malam': 3_000_000 + n * 1_000,
+    })
+
+
+def sebagai_teks(df, fmt):
+    out = df.copy()
+    out['Tanggal'] = out['Tanggal'].dt.strftime(fmt)
+    return out
+
+
+def unggah(df, ekstensi):
+    buf = io.BytesIO()
+    if ekstensi == 'csv':
+        buf.write(df.to_csv(index=False).encode())
+    else:
+        df.to_excel(buf, index=False)
+    buf.seek(0)
+    return buf, f'upload.{ekstensi}'
+
+
+def cek_sama(hasil, asli):
+    assert len(hasil) == len(asli)
+    assert (hasil['Tanggal'].to_numpy() == asli['Tanggal'].to_numpy()).all()
+    for col in ['Omzet Pagi', 'Omzet Siang', 'Omzet Malam']:
+        assert (hasil[col].to_numpy() == asli[col].to_numpy()).all()
+
+
+@pytest.mark.parametrize('ekstensi', ['csv', 'xlsx'])
+@pytest.mark.parametrize('fmt', ['%d/%m/%Y', '%m/%d/%Y'])
+def test_format_satu_untuk_seluruh_file(fmt, ekstensi):
+    asli = histori()
+    hasil, acc = ingest_file(*unggah(sebagai_teks(asli, fmt), ekstensi), chunk_rows=20)
+    assert acc.chunks > 1
+    assert acc.format_tanggal == fmt
+    assert acc.dropped == 0 and acc.tanggal_invalid == 0
+    cek_sama(hasil, asli)
+
+
+@pytest.mark.parametrize('ekstensi', ['csv', 'xlsx'])
+def test_format_eksplisit(ekstensi):
+    # Hanya tanggal 1-12 -> DD/MM & MM/DD sama-sama cocok; format dipilih pengguna
+    asli = histori(12)
+    hasil, acc = ingest_file(*unggah(sebagai_teks(asli, '%d/%m/%Y'), ekstensi), chunk_rows=5,
+                             format_tanggal='%d/%m/%Y')
+    cek_sama(hasil, asli)
+
+
+def test_format_ambigu_ditandai_dan_hari_di_depan():
+    # Seluruh file hanya berisi hari <= 12 -> tidak bisa dipastikan; dibaca DD/MM
+    asli = histori(12)
+    hasil, acc = ingest_file(*unggah(sebagai_teks(asli, '%d/%m/%Y'), 'csv'), chunk_rows=5)
+    assert acc.format_ambigu
+    assert acc.format_tanggal == '%d/%m/%Y'
+    cek_sama(hasil, asli)
+
+
+def test_baris_tidak_cocok_dihitung_dan_dilaporkan():
+    teks = sebagai_teks(histori(), '%d/%m/%Y')
+    teks.loc[30, 'Tanggal'] = '2024-02-31'
+    teks.loc[60, 'Tanggal'] = 'bukan tanggal'
+    hasil, acc = ingest_file(*unggah(teks, 'csv'), chunk_rows=20)
+    assert acc.format_tanggal == '%d/%m/%Y'
+    assert acc.dropped == 2 and acc.tanggal_invalid == 2
+    assert acc.contoh_invalid == ['2024-02-31', 'bukan tanggal']
+    assert len(hasil) == HARI - 2
+
+
+@pytest.mark.parametrize('ekstensi', ['csv', 'xlsx'])
+@pytest.mark.parametrize('fmt', ['%d/%m/%Y', '%m/%d/%Y'])
+def test_potongan_awal_ambigu_ditunda_sampai_pasti(fmt, ekstensi):
+    # Potongan pertama hanya berisi hari <= 12; format baru diputuskan setelah potongan
+    # berikutnya memuat hari > 12, lalu berlaku juga untuk potongan yang ditahan.
+    asli = histori(31)
+    hasil, acc = ingest_file(*unggah(sebagai_teks(asli, fmt), ekstensi), chunk_rows=10)
+    assert acc.format_tanggal == fmt
+    assert not acc.format_ambigu
+    assert acc.dropped == 0 and acc.tanggal_invalid == 0
+    cek_sama(hasil, asli)
+
+
+def test_omzet_kosong_tetap_nan():
+    teks = sebagai_teks(histori(30), '%d/%m/%Y')
+    teks.loc[5, 'Omzet Pagi'] = np.nan                      # hari tanpa data Omzet Pagi
+    ulang = teks.loc[[9]].assign(**{'Omzet Siang': np.nan})  # hari 10 muncul lagi di potongan lain
+    teks = pd.concat([teks, ulang], ignore_index=True)
+    hasil, _ = ingest_file(*unggah(teks, 'csv'), chunk_rows=8)
+    assert np.isnan(hasil.loc[5, 'Omzet Pagi']) and np.isnan(hasil.loc[5, 'Total Omzet'])
+    assert hasil.loc[9, 'Omzet Siang'] == teks.loc[9, 'Omzet Siang']
+    assert hasil.drop(index=5)['Total Omzet'].notna().all()
+
+
+def test_tanggal_iso_dengan_dan_tanpa_detik():
+    df = pd.DataFrame({'Timestamp': ['2024-01-01 08:00', '2024-01-01 14:00:30', '2024-01-02 19:15'],
+                       'Nominal': [100, 200, 300]})
+    hasil, acc = ingest_file(*unggah(df, 'csv'))
+    assert acc.tanggal_invalid == 0
+    assert hasil['Total Omzet'].sum() == 600
+
+
+def test_jenis_kesalahan_dibedakan():
+    teks = sebagai_teks(histori(), '%d/%m/%Y')
+    with pytest.raises(KolomHilangError):
+        ingest_file(*unggah(teks.drop(columns=['Omzet Malam']), 'csv'))
+    teks['Tanggal'] = 'kemarin'
+    with pytest.raises(FormatTanggalError):
+        ingest_file(*unggah(teks, 'csv'))
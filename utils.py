@@ -1,7 +1,7 @@
-import pandas as pd
-import joblib
 import streamlit as st
 import numpy as np
+import core
+from core import profiling
 
 # --- HELPER FUNCTIONS UI ---
 def format_rupiah(nilai):
@@ -17,147 +17,89 @@ def create_card_html(title, value, sub_text="", color_class="border-primary"):
     """
     return html
 
-# --- LOAD RESOURCES ---
-@st.cache_resource
-def load_resources():
-    try:
-        model = joblib.load('model_skripsi_multishift.pkl')
-    except FileNotFoundError:
-        return None, None
+def format_rupiah_array(nilai):
+    """
+    Versi vektor format_rupiah untuk satu kolom sekaligus (hasil string identik).
+    Pemisah ribuan disusun per grup 3 digit dengan operasi string NumPy.
+    """
+    v = np.asarray(nilai, dtype=float).ravel()
+    hingga = np.isfinite(v)
+    r = np.rint(np.abs(np.where(hingga, v, 0))).astype(np.int64)
 
-    try:
-        # Prioritas baca file yang baru diupload
-        df_db = pd.read_excel('TRAIN_80_ANGKA.xlsx')
-    except:
-        try:
-            df_db = pd.read_csv('train_datas (1).csv') 
-        except:
-            df_db = None
-            
-    if df_db is not None:
-        df_db.columns = [c.strip() for c in df_db.columns]
-        if 'Tanggal' in df_db.columns:
-            df_db['Tanggal'] = pd.to_datetime(df_db['Tanggal'])
-            df_db = df_db.sort_values('Tanggal')
-        
-    return model, df_db
+    grup = r % 1000
+    sisa = r // 1000
+    ekor = np.full(len(v), '', dtype=object)
+    while (sisa > 0).any():
+        ada = sisa > 0
+        # Ada grup yang lebih tinggi -> grup saat ini diberi nol di depan (mis. 5.007)
+        ekor = np.where(ada, '.' + np.char.zfill(grup.astype(str), 3).astype(object) + ekor, ekor)
+        grup = np.where(ada, sisa % 1000, grup)
+        sisa = sisa // 1000
 
-# --- HELPER AMBIL DATA CEPAT (OPTIMIZED) ---
-# Mengambil data dari dictionary (O(1)) bukan filter dataframe (O(N))
-def get_val_fast(history_lookup, date_key, col, default):
-    if date_key in history_lookup:
-        val = history_lookup[date_key].get(col)
-        return float(val) if val is not None and pd.notnull(val) else default
-    return default
+    teks = 'Rp ' + np.where(np.signbit(v), '-', '').astype(object) + grup.astype(str).astype(object) + ekor
+    if not hingga.all():
+        teks[~hingga] = [format_rupiah(x) for x in v[~hingga]]
+    return teks
 
-# --- LOGIKA PREDIKSI FLEKSIBEL (OPTIMIZED LOOP) ---
-def generate_forecast_data(model, df_historis, start_date, base_suhu, base_hujan, days=30):
-    results = []
-    list_hari = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
-    list_bulan = ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agt", "Sep", "Okt", "Nov", "Des"]
-    
-    # 1. PERSIAPAN DATA CEPAT (PRE-COMPUTE)
-    # Mengubah DataFrame menjadi Dictionary agar pencarian data masa lalu INSTAN
-    history_lookup = {}
-    if df_historis is not None:
-        temp_df = df_historis.set_index('Tanggal')
-        # Ambil kolom yang relevan saja agar ringan
-        cols_needed = [c for c in temp_df.columns if c in ['Suhu', 'Curah Hujan', 'Omzet Pagi', 'Omzet Siang', 'Omzet Malam', 'Total Omzet']]
-        # Convert ke dictionary: {Timestamp('2024-01-01'): {'Suhu': 27, ...}, ...}
-        history_lookup = temp_df[cols_needed].to_dict('index')
+# --- TABEL HTML SELISIH AKTUAL vs PREDIKSI ---
+WARNA_AKURAT = "color: #166534; font-weight: bold;" # Hijau
+WARNA_DEVIASI = "color: #991b1b; font-weight: bold;" # Merah
 
-    prediction_buffer = {} 
+@profiling.timed('tabel_selisih')
+def render_tabel_selisih(tabel, total_aktual, total_prediksi, total_selisih, halaman=1, per_halaman=None):
+    """
+    Tabel HTML harian (Tanggal, Total Omzet, Prediksi, Selisih). Semua sel diformat per kolom
+    sekaligus lalu baris digabung sekali jalan. `per_halaman` membatasi baris yang dirender;
+    baris total di bawah tetap untuk seluruh periode.
+    """
+    if per_halaman:
+        awal = (halaman - 1) * per_halaman
+        tabel = tabel.iloc[awal:awal + per_halaman]
 
-    # Loop hari
-    for i in range(days):
-        tgt = pd.to_datetime(start_date) + pd.Timedelta(days=i)
-        
-        # 1. Fitur Waktu
-        h, b, mk, wd = tgt.day, tgt.month, tgt.isocalendar()[1], tgt.weekday()
-        is_wk = 1 if wd >= 5 else 0
-        
-        # 2. FITUR CUACA (Cek Lookup Dulu)
-        curr_s = get_val_fast(history_lookup, tgt, 'Suhu', base_suhu)
-        curr_h = get_val_fast(history_lookup, tgt, 'Curah Hujan', base_hujan)
-        
-        # 3. LAG CUACA (Ambil dari lookup dictionary)
-        h_t3 = get_val_fast(history_lookup, tgt - pd.Timedelta(days=3), 'Curah Hujan', base_hujan)
-        h_t7 = get_val_fast(history_lookup, tgt - pd.Timedelta(days=7), 'Curah Hujan', base_hujan)
-        h_t14 = get_val_fast(history_lookup, tgt - pd.Timedelta(days=14), 'Curah Hujan', base_hujan)
-        
-        s_t3 = get_val_fast(history_lookup, tgt - pd.Timedelta(days=3), 'Suhu', base_suhu)
-        s_t7 = get_val_fast(history_lookup, tgt - pd.Timedelta(days=7), 'Suhu', base_suhu)
+    aktual = tabel['Total Omzet'].to_numpy(dtype=float)
+    selisih = tabel['Selisih'].to_numpy(dtype=float)
+    # LOGIKA WARNA TEKS: deviasi < 20% dari aktual -> hijau
+    err_rate = np.divide(np.abs(selisih), aktual, out=np.ones_like(aktual), where=aktual != 0)
+    warna = np.where(err_rate < 0.2, WARNA_AKURAT, WARNA_DEVIASI).astype(object)
+    tanda = np.where(selisih >= 0, "+", "-").astype(object)
 
-        # 4. LAG OMZET (PAGI, SIANG, MALAM)
-        shifts = ['Omzet Pagi', 'Omzet Siang', 'Omzet Malam']
-        lags = [7, 30]
-        lag_values = {}
-        
-        for shift in shifts:
-            for l in lags:
-                lag_date = tgt - pd.Timedelta(days=l)
-                
-                # Cek buffer prediksi (masa depan) -> Cepat
-                if lag_date in prediction_buffer:
-                    val = prediction_buffer[lag_date][shift]
-                else:
-                    # Ambil dari history lookup -> Cepat
-                    val = get_val_fast(history_lookup, lag_date, shift, 5000000) 
-                
-                lag_values[f'{shift}_t-{l}'] = val
+    baris = ("<tr><td>" + tabel['Tanggal'].dt.strftime('%d-%m-%Y').to_numpy(dtype=object)
+             + "</td><td>" + format_rupiah_array(aktual)
+             + "</td><td>" + format_rupiah_array(tabel['Prediksi'])
+             + "</td><td style='" + warna + "'>" + tanda + " " + format_rupiah_array(np.abs(selisih))
+             + "</td></tr>")
+
+    return ''.join([
+        '<table class="styled-table" style="width:100%">',
+        '<thead><tr><th>Tanggal</th><th>Aktual (Rp)</th><th>Prediksi (Rp)</th><th>Selisih (Rp)</th></tr></thead>',
+        '<tbody>',
+        ''.join(baris.tolist()),
+        # Footer Total
+        f'<tr style="background-color:#e0e7ff; font-weight:bold;"><td>TOTAL PERIODE INI</td><td>{format_rupiah(total_aktual)}</td><td>{format_rupiah(total_prediksi)}</td><td>{format_rupiah(abs(total_selisih))}</td></tr>',
+        '</tbody></table>',
+    ])
+
+# --- LOAD RESOURCES (ADAPTER STREAMLIT) ---
+# Logika pemuatan ada di core.load_resources_from; di sini hanya di-cache per server.
+# Disimpan dalam dict agar dataset bisa diganti hasil upsert tanpa memuat ulang model.
+@st.cache_resource
+def _resources():
+    return {'data': core.load_resources_from(core.MODEL_PATH, core.DATA_PATH)}
+
+def load_resources():
+    return _resources()['data']
 
-        # 5. Susun Input
-        row_data = {
-            'Hari': h, 'Bulan': b, 'Minggu ke': mk, 'Weekend': is_wk,
-            'Suhu': curr_s, 'Curah Hujan': curr_h,
-            'Hujan_t-3': h_t3, 'Hujan_t-7': h_t7, 'Hujan_t-14': h_t14,
-            'Suhu_t-3': s_t3, 'Suhu_t-7': s_t7,
-            'Omzet Pagi_t-7': lag_values['Omzet Pagi_t-7'], 
-            'Omzet Pagi_t-30': lag_values['Omzet Pagi_t-30'],
-            'Omzet Siang_t-7': lag_values['Omzet Siang_t-7'], 
-            'Omzet Siang_t-30': lag_values['Omzet Siang_t-30'],
-            'Omzet Malam_t-7': lag_values['Omzet Malam_t-7'], 
-            'Omzet Malam_t-30': lag_values['Omzet Malam_t-30']
-        }
-        
-        cols = [
-            'Hari', 'Bulan', 'Minggu ke', 'Weekend',
-            'Suhu', 'Curah Hujan',
-            'Hujan_t-3', 'Hujan_t-7', 'Hujan_t-14', 'Suhu_t-3', 'Suhu_t-7',
-            'Omzet Pagi_t-7', 'Omzet Pagi_t-30',
-            'Omzet Siang_t-7', 'Omzet Siang_t-30',
-            'Omzet Malam_t-7', 'Omzet Malam_t-30'
-        ]
-        
-        row_df = pd.DataFrame([row_data])[cols]
-        
-        # 6. PREDIKSI
-        pred = model.predict(row_df)[0]
-        
-        p_pagi, p_siang, p_malam = pred[0], pred[1], pred[2]
-        p_total = p_pagi + p_siang + p_malam
-        
-        prediction_buffer[tgt] = {'Omzet Pagi': p_pagi, 'Omzet Siang': p_siang, 'Omzet Malam': p_malam}
-        
-        results.append({
-            'Tanggal': tgt, 
-            'Hari_Nama': list_hari[wd],
-            'Bulan': b,                  # PENTING: Untuk grouping bulanan
-            'Bulan_Nama': list_bulan[b-1], 
-            'Tahun': tgt.year,
-            'Prediksi Pagi': p_pagi,
-            'Prediksi Siang': p_siang,
-            'Prediksi Malam': p_malam,
-            'Prediksi Total': p_total,
-            'Suhu': curr_s,
-            'Hujan': curr_h
-        })
-        
-    return pd.DataFrame(results)
+def ganti_dataset(df_baru):
+    """Pakai `df_baru` (mis. hasil core.upsert_history) untuk semua sesi berikutnya."""
+    res = _resources()
+    model, _ = res['data']
+    res['data'] = (model, df_baru)
 
-# Wrapper agar kode lama tidak error
-def generate_30_days_data(model, df_historis, start_date, base_suhu, base_hujan):
-    return generate_forecast_data(model, df_historis, start_date, base_suhu, base_hujan, days=30)
+def ganti_model(model_baru):
+    """Tukar model aktif (dipanggil thread pelatihan); pasangan (model, data) diganti sekaligus."""
+    res = _resources()
+    _, df = res['data']
+    res['data'] = (model_baru, df)
 
 def hitung_mape_otomatis(model, df):
-    return "Tersedia"
\ No newline at end of file
+    return "Tersedia"
@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
 import utils 
+import core
+from core import profiling
 import calendar
 import plotly.graph_objects as go
 import plotly.express as px
-import io 
 import streamlit.components.v1 as components 
 
 # --- KONFIGURASI WARNA ---
@@ -13,18 +14,30 @@ COLOR_SIANG = '#e67e22'
 COLOR_MALAM = '#2980b9'  
 COLOR_TOTAL = '#009688'  
 COLOR_GRID  = '#ecf0f1'  
+COLOR_PITA  = 'rgba(0, 150, 136, 0.18)'
 
-# --- FUNGSI HELPER EXPORT ---
-def to_excel(df):
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Laporan_Prediksi')
-        worksheet = writer.sheets['Laporan_Prediksi']
-        for i, col in enumerate(df.columns):
-            column_len = max(df[col].astype(str).map(len).max(), len(col)) + 2
-            worksheet.set_column(i, i, column_len)
-    processed_data = output.getvalue()
-    return processed_data
+# --- SKENARIO CUACA (MONTE CARLO) ---
+OPSI_JUMLAH_SKENARIO = [100, 500, 1000, 2000]
+
+def tambah_pita_skenario(fig, x, p10, p50, p90):
+    """Pita P10-P90 dan garis median (P50) total omzet dari skenario cuaca."""
+    fig.add_trace(go.Scatter(x=x, y=p90, mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(
+        x=x, y=p10, mode='lines', line=dict(width=0), fill='tonexty', fillcolor=COLOR_PITA,
+        name='Rentang Skenario (P10-P90)', hoverinfo='skip'
+    ))
+    fig.add_trace(go.Scatter(
+        x=x, y=p50, mode='lines', name='Median Skenario (P50)',
+        line=dict(color=COLOR_TOTAL, width=1.5, dash='dash'),
+        hovertemplate='P50: <b>Rp %{y:,.0f}</b><extra></extra>'
+    ))
+
+# --- INTERVAL ANTAR POHON (P10-P90 prediksi tiap pohon Random Forest) ---
+def galat_antar_pohon(bawah, tengah, atas):
+    """error_y Plotly asimetris dari batas bawah/atas antar pohon."""
+    return dict(type='data', symmetric=False, color='#94a3b8', thickness=1.2,
+                array=[max(a - t, 0) for a, t in zip(atas, tengah)],
+                arrayminus=[max(t - b, 0) for b, t in zip(bawah, tengah)])
 
 def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan):
     st.markdown(f"## Dashboard Prediksi")
@@ -51,6 +64,13 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan):
                                   "Per Bulan (Tanggal 1 - Akhir Bulan)", 
                                   "Per Tahun (Januari - Desember)"])
     
+    col_sk1, col_sk2 = st.columns([2, 1])
+    with col_sk1:
+        pakai_skenario = st.checkbox("Tampilkan rentang skenario cuaca (Monte Carlo P10-P90)",
+                                     help="Cuaca tiap hari diambil acak dari data historis bulan yang sama, lalu diprediksi untuk banyak skenario sekaligus.")
+    with col_sk2:
+        jumlah_skenario = st.select_slider("Jumlah Skenario", options=OPSI_JUMLAH_SKENARIO, value=1000, disabled=not pakai_skenario)
+    
     st.markdown("---")
 
     if st.button("Proses Prediksi", type="primary"):
@@ -72,33 +92,49 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan):
                 start_date_run = pd.to_datetime(tanggal_pilihan).replace(month=1, day=1)
                 days_to_predict = 366 if calendar.isleap(start_date_run.year) else 365
 
-            df_forecast = utils.generate_forecast_data(model, df_historis, start_date_run, input_suhu, input_hujan, days=days_to_predict)
+            df_forecast = core.generate_forecast_data(model, df_historis, start_date_run, input_suhu, input_hujan, days=days_to_predict, interval=True)
+            
+            hasil_skenario = None
+            if pakai_skenario:
+                hasil_skenario = core.generate_scenario_forecast(model, df_historis, start_date_run, input_suhu, input_hujan,
+                                                                 days=days_to_predict, n_scenarios=jumlah_skenario)
             
             st.session_state['hasil_prediksi'] = df_forecast
+            st.session_state['hasil_skenario'] = hasil_skenario
             st.session_state['mode_terakhir'] = mode_prediksi
 
     if st.session_state['hasil_prediksi'] is not None:
         df_forecast = st.session_state['hasil_prediksi']
         mode_current = st.session_state.get('mode_terakhir', mode_prediksi)
+        skenario = st.session_state.get('hasil_skenario')
+        df_skenario = skenario.harian() if skenario is not None else None
         
         st.success("Prediksi Selesai. Silakan unduh laporan di bawah ini.")
         
         col_dl1, col_dl2, col_dl3 = st.columns(3)
         
-        # 1. DOWNLOAD EXCEL
-        excel_data = to_excel(df_forecast)
-        file_name_xl = f"Laporan_Prediksi_{df_forecast['Tanggal'].iloc[0].strftime('%d%b%Y')}.xlsx"
+        # 1. DOWNLOAD (EXCEL / CSV / PARQUET)
+        # File baru dibuat saat tombol diklik (callable) dan bytes-nya di-cache per hasil
+        # prediksi, sehingga rerun biasa tidak lagi menulis ulang laporan.
+        df_export = df_forecast
+        if df_skenario is not None:
+            kolom_pita = ['Prediksi Total P10', 'Prediksi Total P50', 'Prediksi Total P90']
+            df_export = df_forecast.assign(**{c: df_skenario[c].to_numpy() for c in kolom_pita})
+        nama_file = f"Laporan_Prediksi_{df_forecast['Tanggal'].iloc[0].strftime('%d%b%Y')}"
         
-        with col_dl1:
-            st.download_button(
-                label="Unduh Excel (.xlsx)",
-                data=excel_data,
-                file_name=file_name_xl,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
+        for kolom, fmt, label in [(col_dl1, 'xlsx', "Unduh Excel (.xlsx)"),
+                                  (col_dl2, 'csv', "Unduh CSV (.csv)"),
+                                  (col_dl3, 'parquet', "Unduh Parquet (.parquet)")]:
+            with kolom:
+                st.download_button(
+                    label=label,
+                    data=lambda fmt=fmt: core.export_report(df_export, fmt),
+                    file_name=f"{nama_file}.{fmt}",
+                    mime=core.export_mime(fmt),
+                    on_click='ignore',
+                    use_container_width=True
+                )
 
-        
         st.markdown("---")
         
         # =========================================================
@@ -113,6 +149,14 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan):
             with c2: st.markdown(utils.create_card_html("Shift Pagi", utils.format_rupiah(row['Prediksi Pagi']), "08:00 - 14:00", "border-warning"), unsafe_allow_html=True)
             with c3: st.markdown(utils.create_card_html("Shift Siang", utils.format_rupiah(row['Prediksi Siang']), "14:00 - 19:00", "border-warning"), unsafe_allow_html=True)
             with c4: st.markdown(utils.create_card_html("Shift Malam", utils.format_rupiah(row['Prediksi Malam']), "19:00 - Tutup", "border-primary"), unsafe_allow_html=True)
+            if df_skenario is not None:
+                sk = df_skenario.iloc[0]
+                st.caption(f"Rentang skenario cuaca ({skenario.n_scenarios} skenario): "
+                           f"P10 {utils.format_rupiah(sk['Prediksi Total P10'])} \u2013 P90 {utils.format_rupiah(sk['Prediksi Total P90'])}, "
+                           f"median {utils.format_rupiah(sk['Prediksi Total P50'])}.")
+            if 'Prediksi Total Bawah' in df_forecast:
+                st.caption(f"Rentang antar pohon model (P10-P90): {utils.format_rupiah(row['Prediksi Total Bawah'])} "
+                           f"\u2013 {utils.format_rupiah(row['Prediksi Total Atas'])}.")
             
             st.write("")
             st.markdown("### Distribusi Omzet per Shift")
@@ -121,17 +165,27 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan):
             values = [row['Prediksi Pagi'], row['Prediksi Siang'], row['Prediksi Malam']]
             colors = [COLOR_PAGI, COLOR_SIANG, COLOR_MALAM]
             
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=shifts, y=values, marker_color=colors,
-                text=[utils.format_rupiah(v) for v in values], textposition='auto',
-                hovertemplate='Shift %{x}: <b>Rp %{y:,.0f}</b><extra></extra>'
-            ))
-            fig.add_trace(go.Scatter(
-                x=shifts, y=values, mode='lines+markers', line=dict(color='gray', width=2, dash='dot'), hoverinfo='skip'
-            ))
-            fig.update_layout(plot_bgcolor='white', height=400, yaxis=dict(title='Rupiah (Rp)', gridcolor=COLOR_GRID), showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            with profiling.stage('chart.dashboard'):
+                fig = go.Figure()
+                fig.add_trace(go.Bar(
+                    x=shifts, y=values, marker_color=colors,
+                    text=[utils.format_rupiah(v) for v in values], textposition='auto',
+                    hovertemplate='Shift %{x}: <b>Rp %{y:,.0f}</b><extra></extra>'
+                ))
+                fig.add_trace(go.Scatter(
+                    x=shifts, y=values, mode='lines+markers', line=dict(color='gray', width=2, dash='dot'), hoverinfo='skip'
+                ))
+                fig.update_layout(plot_bgcolor='white', height=400, yaxis=dict(title='Rupiah (Rp)', gridcolor=COLOR_GRID), showlegend=False)
+                if df_skenario is not None:
+                    # Garis galat = rentang P10-P90 skenario cuaca per shift
+                    fig.update_traces(selector=dict(type='bar'), error_y=dict(
+                        type='data', symmetric=False, color='#475569',
+                        array=[max(sk[f'Prediksi {s} P90'] - v, 0) for s, v in zip(shifts, values)],
+                        arrayminus=[max(v - sk[f'Prediksi {s} P10'], 0) for s, v in zip(shifts, values)]))
+                elif 'Prediksi Total Bawah' in df_forecast:
+                    fig.update_traces(selector=dict(type='bar'), error_y=galat_antar_pohon(
+                        [row[f'Prediksi {s} Bawah'] for s in shifts], values, [row[f'Prediksi {s} Atas'] for s in shifts]))
+                st.plotly_chart(fig, use_container_width=True)
 
         # =========================================================
         # TAMPILAN 2: PER MINGGU
@@ -153,32 +207,39 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan):
             st.write("")
             st.markdown("### Tren Omzet Harian (Senin - Minggu)")
             
-            fig = go.Figure()
-            fig.add_trace(go.Bar(x=df_forecast['Hari_Nama'], y=df_forecast['Prediksi Pagi'], name='Pagi', marker_color=COLOR_PAGI))
-            fig.add_trace(go.Bar(x=df_forecast['Hari_Nama'], y=df_forecast['Prediksi Siang'], name='Siang', marker_color=COLOR_SIANG))
-            fig.add_trace(go.Bar(x=df_forecast['Hari_Nama'], y=df_forecast['Prediksi Malam'], name='Malam', marker_color=COLOR_MALAM))
+            with profiling.stage('chart.dashboard'):
+                fig = go.Figure()
+                fig.add_trace(go.Bar(x=df_forecast['Hari_Nama'], y=df_forecast['Prediksi Pagi'], name='Pagi', marker_color=COLOR_PAGI))
+                fig.add_trace(go.Bar(x=df_forecast['Hari_Nama'], y=df_forecast['Prediksi Siang'], name='Siang', marker_color=COLOR_SIANG))
+                fig.add_trace(go.Bar(x=df_forecast['Hari_Nama'], y=df_forecast['Prediksi Malam'], name='Malam', marker_color=COLOR_MALAM))
             
-            fig.add_trace(go.Scatter(
-                x=df_forecast['Hari_Nama'], y=df_forecast['Prediksi Total'],
-                mode='lines+markers', name='TOTAL',
-                line=dict(color=COLOR_TOTAL, width=3, dash='dot')
-            ))
+                fig.add_trace(go.Scatter(
+                    x=df_forecast['Hari_Nama'], y=df_forecast['Prediksi Total'],
+                    mode='lines+markers', name='TOTAL',
+                    line=dict(color=COLOR_TOTAL, width=3, dash='dot')
+                ))
+                if 'Prediksi Total Bawah' in df_forecast:
+                    fig.update_traces(selector=dict(name='TOTAL'), error_y=galat_antar_pohon(
+                        df_forecast['Prediksi Total Bawah'], df_forecast['Prediksi Total'], df_forecast['Prediksi Total Atas']))
 
-            fig.update_layout(
-                barmode='group', 
-                hovermode="x unified", 
-                plot_bgcolor='white', 
-                height=450, 
-                xaxis=dict(showgrid=False), 
-                yaxis=dict(gridcolor=COLOR_GRID, tickprefix="Rp "), 
-                legend=dict(orientation="h", y=1.1)
-            )
-            st.plotly_chart(fig, use_container_width=True)
+                fig.update_layout(
+                    barmode='group', 
+                    hovermode="x unified", 
+                    plot_bgcolor='white', 
+                    height=450, 
+                    xaxis=dict(showgrid=False), 
+                    yaxis=dict(gridcolor=COLOR_GRID, tickprefix="Rp "), 
+                    legend=dict(orientation="h", y=1.1)
+                )
+                if df_skenario is not None:
+                    tambah_pita_skenario(fig, df_forecast['Hari_Nama'], df_skenario['Prediksi Total P10'], df_skenario['Prediksi Total P50'], df_skenario['Prediksi Total P90'])
+                st.plotly_chart(fig, use_container_width=True)
             
             with st.expander("Lihat Rincian Mingguan"):
-                st.dataframe(df_forecast[['Hari_Nama', 'Tanggal', 'Prediksi Pagi', 'Prediksi Siang', 'Prediksi Malam', 'Prediksi Total']].style.format({
+                st.dataframe(df_forecast[['Hari_Nama', 'Tanggal', 'Prediksi Pagi', 'Prediksi Siang', 'Prediksi Malam', 'Prediksi Total', 'Prediksi Total Bawah', 'Prediksi Total Atas']].style.format({
                     'Prediksi Pagi': "Rp {:,.0f}", 'Prediksi Siang': "Rp {:,.0f}", 
-                    'Prediksi Malam': "Rp {:,.0f}", 'Prediksi Total': "Rp {:,.0f}"
+                    'Prediksi Malam': "Rp {:,.0f}", 'Prediksi Total': "Rp {:,.0f}",
+                    'Prediksi Total Bawah': "Rp {:,.0f}", 'Prediksi Total Atas': "Rp {:,.0f}"
                 }), use_container_width=True)
 
         # =========================================================
@@ -202,45 +263,65 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan):
             st.markdown(f"### Tren Omzet Harian ({bulan_nama})")
             
             # --- GRAFIK BATANG VERTIKAL TOTAL OMZET ---
-            fig = go.Figure()
+            with profiling.stage('chart.dashboard'):
+                fig = go.Figure()
             
-            # Batang Total Omzet Harian
-            fig.add_trace(go.Bar(
-                x=df_forecast['Tanggal'], 
-                y=df_forecast['Prediksi Total'], 
-                name='Total Omzet', 
-                marker_color=COLOR_TOTAL, # Warna Hijau Tosca Vmedis
-                hovertemplate='Tanggal: %{x|%d %b %Y}<br>Total: <b>Rp %{y:,.0f}</b><extra></extra>'
-            ))
+                # Batang Total Omzet Harian
+                fig.add_trace(go.Bar(
+                    x=df_forecast['Tanggal'], 
+                    y=df_forecast['Prediksi Total'], 
+                    name='Total Omzet', 
+                    marker_color=COLOR_TOTAL, # Warna Hijau Tosca Vmedis
+                    hovertemplate='Tanggal: %{x|%d %b %Y}<br>Total: <b>Rp %{y:,.0f}</b><extra></extra>'
+                ))
             
-            # Menghitung batas atas untuk grafik agar proporsional
-            max_omzet = df_forecast['Prediksi Total'].max()
+                # Menghitung batas atas untuk grafik agar proporsional
+                max_omzet = df_forecast['Prediksi Total'].max()
+                if 'Prediksi Total Bawah' in df_forecast:
+                    fig.update_traces(selector=dict(type='bar'), error_y=galat_antar_pohon(
+                        df_forecast['Prediksi Total Bawah'], df_forecast['Prediksi Total'], df_forecast['Prediksi Total Atas']))
+                    max_omzet = df_forecast['Prediksi Total Atas'].max()
             
-            fig.update_layout(
-                plot_bgcolor='white',
-                height=500,
-                xaxis=dict(
-                    showgrid=False, 
-                    tickformat="%d %b", # Format tanggal sumbu X (contoh: 01 Jan)
-                    title="Tanggal"
-                ),
-                yaxis=dict(
-                    gridcolor=COLOR_GRID, 
-                    tickprefix="Rp ", 
-                    title="Total Omzet (Rp)",
-                    # --- PENGATURAN SKALA ---
-                    # Memulai sumbu Y dari 10 Juta agar fluktuasi terlihat jelas
-                    range=[10000000, max_omzet * 1.00] 
-                ),
-                showlegend=False
-            )
-            st.plotly_chart(fig, use_container_width=True)
+                fig.update_layout(
+                    plot_bgcolor='white',
+                    height=500,
+                    xaxis=dict(
+                        showgrid=False, 
+                        tickformat="%d %b", # Format tanggal sumbu X (contoh: 01 Jan)
+                        title="Tanggal"
+                    ),
+                    yaxis=dict(
+                        gridcolor=COLOR_GRID, 
+                        tickprefix="Rp ", 
+                        title="Total Omzet (Rp)",
+                        # --- PENGATURAN SKALA ---
+                        # Memulai sumbu Y dari 10 Juta agar fluktuasi terlihat jelas
+                        range=[10000000, max_omzet * 1.00] 
+                    ),
+                    showlegend=False
+                )
+                if df_skenario is not None:
+                    tambah_pita_skenario(fig, df_forecast['Tanggal'], df_skenario['Prediksi Total P10'], df_skenario['Prediksi Total P50'], df_skenario['Prediksi Total P90'])
+                    fig.update_yaxes(range=[10000000, max(max_omzet, df_skenario['Prediksi Total P90'].max())])
+                st.plotly_chart(fig, use_container_width=True)
             
             with st.expander("Lihat Rincian Harian"):
-                st.dataframe(df_forecast[['Tanggal', 'Hari_Nama', 'Prediksi Pagi', 'Prediksi Siang', 'Prediksi Malam', 'Prediksi Total']].style.format({
+                st.dataframe(df_forecast[['Tanggal', 'Hari_Nama', 'Prediksi Pagi', 'Prediksi Siang', 'Prediksi Malam', 'Prediksi Total', 'Prediksi Total Bawah', 'Prediksi Total Atas']].style.format({
                     'Prediksi Pagi': "Rp {:,.0f}", 'Prediksi Siang': "Rp {:,.0f}", 
-                    'Prediksi Malam': "Rp {:,.0f}", 'Prediksi Total': "Rp {:,.0f}"
+                    'Prediksi Malam': "Rp {:,.0f}", 'Prediksi Total': "Rp {:,.0f}",
+                    'Prediksi Total Bawah': "Rp {:,.0f}", 'Prediksi Total Atas': "Rp {:,.0f}"
                 }), use_container_width=True)
+            
+            # Laporan gabungan: prediksi harian, agregat setahun, backtest & metrik (dibuat saat diklik)
+            bulan_angka = int(df_forecast['Bulan'].iloc[0])
+            st.download_button(
+                label="Unduh Laporan Lengkap Bulan Ini (.xlsx)",
+                data=lambda: core.build_monthly_report(model, df_historis, tahun, bulan_angka,
+                                                       base_suhu=input_suhu, base_hujan=input_hujan),
+                file_name=f"Laporan_Bulanan_{tahun}-{bulan_angka:02d}.xlsx",
+                mime=core.export_mime('xlsx'),
+                on_click='ignore'
+            )
 
         # =========================================================
         # TAMPILAN 4: PER TAHUN
@@ -249,8 +330,9 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan):
             tahun = df_forecast['Tahun'].iloc[0]
             st.markdown(f"### Analisis Per Tahun: {tahun}")
             
-            df_forecast['Periode'] = df_forecast['Tahun'].astype(str) + "-" + df_forecast['Bulan'].astype(str).str.zfill(2)
-            df_monthly = df_forecast.groupby(['Periode', 'Tahun', 'Bulan_Nama'], sort=False)[['Prediksi Pagi', 'Prediksi Siang', 'Prediksi Malam', 'Prediksi Total']].sum().reset_index()
+            # Kolom bantu di salinan: df_forecast juga dipakai tombol unduh (dibuat saat diklik)
+            df_bulanan = df_forecast.assign(Periode=df_forecast['Tahun'].astype(str) + "-" + df_forecast['Bulan'].astype(str).str.zfill(2))
+            df_monthly = df_bulanan.groupby(['Periode', 'Tahun', 'Bulan_Nama'], sort=False)[['Prediksi Pagi', 'Prediksi Siang', 'Prediksi Malam', 'Prediksi Total']].sum().reset_index()
             
             total_setahun = df_monthly['Prediksi Total'].sum()
             avg_bulanan = df_monthly['Prediksi Total'].mean()
@@ -264,11 +346,15 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan):
             st.write("")
             st.markdown(f"### Akumulasi Omzet per Bulan ({tahun})")
             
-            fig = go.Figure()
-            fig.add_trace(go.Bar(x=df_monthly['Bulan_Nama'], y=df_monthly['Prediksi Total'], name='Total Omzet', marker_color=COLOR_TOTAL, text=[f"{v/1000000:.1f} Jt" for v in df_monthly['Prediksi Total']], textposition='auto', hovertemplate='%{x}: <b>Rp %{y:,.0f}</b><extra></extra>'))
+            with profiling.stage('chart.dashboard'):
+                fig = go.Figure()
+                fig.add_trace(go.Bar(x=df_monthly['Bulan_Nama'], y=df_monthly['Prediksi Total'], name='Total Omzet', marker_color=COLOR_TOTAL, text=[f"{v/1000000:.1f} Jt" for v in df_monthly['Prediksi Total']], textposition='auto', hovertemplate='%{x}: <b>Rp %{y:,.0f}</b><extra></extra>'))
             
-            fig.update_layout(plot_bgcolor='white', height=450, xaxis=dict(showgrid=False), yaxis=dict(gridcolor=COLOR_GRID, title="Total Omzet (Rp)"))
-            st.plotly_chart(fig, use_container_width=True)
+                fig.update_layout(plot_bgcolor='white', height=450, xaxis=dict(showgrid=False), yaxis=dict(gridcolor=COLOR_GRID, title="Total Omzet (Rp)"))
+                if df_skenario is not None:
+                    sk_bulan = skenario.per_bulan()
+                    tambah_pita_skenario(fig, df_monthly['Bulan_Nama'], sk_bulan['Prediksi Total P10'], sk_bulan['Prediksi Total P50'], sk_bulan['Prediksi Total P90'])
+                st.plotly_chart(fig, use_container_width=True)
             
             with st.expander("Lihat Rincian Bulanan"):
                 st.dataframe(df_monthly[['Bulan_Nama', 'Prediksi Pagi', 'Prediksi Siang', 'Prediksi Malam', 'Prediksi Total']].style.format({
@@ -0,0 +1,43 @@
+import json
+import streamlit as st
+from core import profiling
+
+def show(rerun_id, sesi):
+    """Panel debug di sidebar: waktu per tahap untuk rerun ini + akumulasi sesi, bisa diunduh."""
+    st.markdown("#### Waktu Proses (Debug)")
+
+    total_rerun = profiling.PROFILER.elapsed_ms()
+    event_rerun = profiling.PROFILER.events(rerun=rerun_id)
+    if total_rerun is not None:
+        st.caption(f"Rerun #{rerun_id}: {total_rerun:,.1f} ms hingga panel ini.")
+
+    if event_rerun:
+        # Tahap yang dipanggil berulang (mis. predict per blok) digabung, urut kemunculan
+        df_rerun = profiling.PROFILER.to_frame(event_rerun).sort_values('start', kind='stable')
+        df_rerun = df_rerun.groupby('stage', sort=False).agg(depth=('depth', 'min'), calls=('ms', 'size'), ms=('ms', 'sum')).reset_index()
+        df_rerun['Tahap'] = ['\u00a0' * 2 * d + s for d, s in zip(df_rerun['depth'], df_rerun['stage'])]
+        st.dataframe(df_rerun[['Tahap', 'calls', 'ms']].rename(columns={'calls': 'Panggilan', 'ms': 'Waktu (ms)'})
+                     .style.format({'Waktu (ms)': "{:,.2f}"}),
+                     hide_index=True, use_container_width=True)
+    else:
+        st.caption("Tidak ada tahap terukur pada rerun ini (hasil dari cache).")
+
+    event_sesi = profiling.PROFILER.events(sesi=sesi)
+    if not event_sesi:
+        return
+
+    with st.expander("Akumulasi Sesi"):
+        ringkas = profiling.PROFILER.summary(event_sesi)
+        st.dataframe(ringkas.rename(columns={'stage': 'Tahap', 'calls': 'Panggilan', 'total_ms': 'Total (ms)',
+                                             'mean_ms': 'Rata-rata (ms)', 'max_ms': 'Maks (ms)'})
+                     .style.format({'Total (ms)': "{:,.2f}", 'Rata-rata (ms)': "{:,.2f}", 'Maks (ms)': "{:,.2f}"}),
+                     hide_index=True, use_container_width=True)
+
+    # --- EXPORT LOG ---
+    col_csv, col_json = st.columns(2)
+    with col_csv:
+        st.download_button("Log CSV", profiling.PROFILER.to_frame(event_sesi).to_csv(index=False),
+                           file_name=f"profil_{sesi}.csv", mime="text/csv", use_container_width=True)
+    with col_json:
+        st.download_button("Log JSONL", '\n'.join(json.dumps(e) for e in event_sesi),
+                           file_name=f"profil_{sesi}.jsonl", mime="application/json", use_container_width=True)
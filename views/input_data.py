@@ -1,38 +1,7 @@
 import streamlit as st
-import pandas as pd
-import os
 import time
-
-def normalize_column_names(df):
-    """
-    Fungsi pintar untuk memperbaiki nama kolom secara otomatis.
-    Mengubah 'suhu', 'Suhu (C)', 'temp' -> menjadi 'Suhu'
-    Mengubah 'hujan', 'curah hujan', 'CH' -> menjadi 'Curah Hujan'
-    """
-    new_cols = []
-    for col in df.columns:
-        c_lower = str(col).lower().strip()
-        
-        # Logika Deteksi Cerdas
-        if 'tanggal' in c_lower or 'date' in c_lower:
-            new_cols.append('Tanggal')
-        elif 'suhu' in c_lower or 'temp' in c_lower:
-            new_cols.append('Suhu')
-        elif 'hujan' in c_lower or 'rain' in c_lower or 'curah' in c_lower:
-            new_cols.append('Curah Hujan')
-        elif 'pagi' in c_lower:
-            new_cols.append('Omzet Pagi')
-        elif 'siang' in c_lower:
-            new_cols.append('Omzet Siang')
-        elif 'malam' in c_lower:
-            new_cols.append('Omzet Malam')
-        elif 'total' in c_lower and 'omzet' in c_lower:
-            new_cols.append('Total Omzet')
-        else:
-            new_cols.append(col) # Biarkan apa adanya jika tidak dikenali
-            
-    df.columns = new_cols
-    return df
+import core
+import utils
 
 def show():
     st.markdown("##  Input Data Histori")
@@ -43,54 +12,112 @@ def show():
     **Tips:** Unggah file Excel untuk memperbarui basis data prediksi sistem.
     """)
 
+    # Jurnal upsert yang belum dilebur ke file Excel utama
+    df_delta = core.read_delta(core.DATA_PATH)
+    if df_delta is not None:
+        col_info, col_btn = st.columns([3, 1])
+        with col_info:
+            st.caption(f"{len(df_delta)} baris tambahan/perbaikan tersimpan di jurnal dan sudah ikut dipakai untuk prediksi.")
+        with col_btn:
+            if st.button("Lebur ke File Excel", use_container_width=True):
+                core.compact_dataset(core.DATA_PATH)
+                st.rerun()
+
+    mode_simpan = st.radio("Mode Penyimpanan:", ["Tambah / Perbarui (gabung per tanggal)", "Ganti Seluruh Data"],
+                           horizontal=True,
+                           help="Tambah/Perbarui hanya menyimpan baris baru; tanggal yang sudah ada akan diganti.")
+
+    # Format tanggal teks berlaku untuk seluruh file (Otomatis = ditebak dari baris awal)
+    opsi_format = {"Otomatis": None, "DD/MM/YYYY": '%d/%m/%Y', "MM/DD/YYYY": '%m/%d/%Y', "YYYY-MM-DD": 'ISO8601'}
+    pilih_format = st.selectbox("Format Tanggal pada File:", list(opsi_format),
+                                help="Pilih bila tanggal berupa teks dan urutan hari/bulan bisa tertukar (mis. 02/01/2024).")
+    format_tanggal = opsi_format[pilih_format]
+
     # Komponen File Uploader
     uploaded_file = st.file_uploader("Drag & Drop File Excel Anda Di Sini", type=['xlsx', 'xls', 'csv'])
 
     if uploaded_file is not None:
         try:
-            # Baca File (Excel atau CSV)
-            if uploaded_file.name.endswith('.csv'):
-                df_new = pd.read_csv(uploaded_file)
-            else:
-                df_new = pd.read_excel(uploaded_file)
-            
-            # --- DEBUGGING: LIHAT APA YANG DIBACA ---
-            st.write("Nama Kolom Asli dari File:", list(df_new.columns))
-            
-            # 1. NORMALISASI NAMA KOLOM (AUTO-FIX)
-            df_new = normalize_column_names(df_new)
-            
-            st.write("Nama Kolom Setelah Diperbaiki:", list(df_new.columns))
-
-            # 2. VALIDASI KOLOM WAJIB
-            required_columns = [
-                'Tanggal', 'Suhu', 'Curah Hujan',
-                'Omzet Pagi', 'Omzet Siang', 'Omzet Malam'
-            ]
-            
-            # Cek yang hilang
-            missing_cols = [col for col in required_columns if col not in df_new.columns]
+            # Baca & ringkas per potongan (memori tetap kecil walau file besar).
+            # Hasil disimpan per file upload agar rerun (mis. klik Simpan) tidak membaca ulang.
+            hasil_baca = st.session_state.get('hasil_ingest')
+            kunci_baca = (uploaded_file.file_id, format_tanggal)
+            if hasil_baca is None or hasil_baca[0] != kunci_baca:
+                uploaded_file.seek(0)
+                df_new, statistik = core.ingest_file(uploaded_file, uploaded_file.name, format_tanggal=format_tanggal)
+                hasil_baca = (kunci_baca, df_new, statistik)
+                st.session_state['hasil_ingest'] = hasil_baca
+            _, df_new, statistik = hasil_baca
 
-            if not missing_cols:
-                # Pastikan Tanggal formatnya benar
-                df_new['Tanggal'] = pd.to_datetime(df_new['Tanggal'])
-                
-                # Preview Data
-                st.markdown("###  Data Valid & Siap Disimpan")
-                st.dataframe(df_new.head(), use_container_width=True)
+            # Preview Data
+            st.markdown("###  Data Valid & Siap Disimpan")
+            st.caption(f"{statistik.rows:,} baris dibaca ({statistik.chunks} potongan) -> {len(df_new):,} hari."
+                       + (f" {statistik.dropped:,} baris tanpa tanggal valid dilewati." if statistik.dropped else ""))
+            if statistik.tanggal_invalid:
+                contoh = ", ".join(f"'{c}'" for c in statistik.contoh_invalid)
+                st.warning(f"{statistik.tanggal_invalid:,} baris memiliki tanggal yang tidak sesuai format "
+                           f"{statistik.format_tanggal} dan tidak ikut disimpan (contoh: {contoh}). "
+                           "Periksa isi file atau pilih Format Tanggal yang sesuai.")
+            if statistik.format_ambigu and format_tanggal is None:
+                st.warning(f"Urutan hari/bulan pada tanggal tidak dapat dipastikan; file dibaca dengan format "
+                           f"{statistik.format_tanggal}. Pilih Format Tanggal di atas bila keliru.")
+            if statistik.transaksi:
+                st.info("File terbaca sebagai data transaksi: omzet dijumlah per hari dan dibagi ke shift "
+                        "Pagi (08:00-14:00), Siang (14:00-19:00), dan Malam (19:00-Tutup).")
+            tanpa_cuaca = int(df_new[['Suhu', 'Curah Hujan']].isna().any(axis=1).sum())
+            if tanpa_cuaca:
+                st.warning(f"{tanpa_cuaca:,} hari belum memiliki data Suhu/Curah Hujan; prediksi memakai asumsi cuaca untuk hari tersebut.")
+            st.dataframe(df_new.head(), use_container_width=True)
 
-                if st.button("Simpan Data", type="primary"):
-                    # Simpan ke file standar sistem
-                    save_path = 'TRAIN_80_ANGKA.xlsx'
-                    df_new.to_excel(save_path, index=False)
+            if st.button("Simpan Data", type="primary"):
+                if "Tambah" in mode_simpan:
+                    # Hanya baris baru yang ditulis; store & cache diperbarui per tanggal
+                    _, df_historis = utils.load_resources()
+                    core.append_dataset(df_new, core.DATA_PATH)
+                    utils.ganti_dataset(core.upsert_history(df_historis, df_new))
+                    st.success(f"Berhasil! {len(df_new)} baris digabung ke data histori.")
+                else:
+                    # Simpan ke file standar sistem (+ salinan biner untuk start cepat)
+                    core.save_dataset(df_new, core.DATA_PATH)
                     
                     st.cache_resource.clear()
+                    core.clear_result_caches()
                     st.success("Berhasil! Data tersimpan.")
-                    time.sleep(1)
-                    st.rerun()
-            else:
-                st.error(f" Masih ada kolom yang hilang: {', '.join(missing_cols)}")
-                st.warning("Coba ubah nama header di Excel Anda agar lebih jelas (Contoh: 'Suhu', 'Hujan', 'Omzet Pagi').")
-                
+                time.sleep(1)
+                st.rerun()
+
+        except core.KolomHilangError as e:
+            st.error(f" {e}")
+            st.warning("Coba ubah nama header di Excel Anda agar lebih jelas (Contoh: 'Suhu', 'Hujan', 'Omzet Pagi').")
+        except core.FormatTanggalError as e:
+            st.error(f" {e}")
+            st.warning("Pilih format yang sesuai pada 'Format Tanggal pada File' di atas, atau seragamkan penulisan tanggal di file.")
+        except ValueError as e:
+            st.error(f" {e}")
         except Exception as e:
-            st.error(f"Error: {e}")
\ No newline at end of file
+            st.error(f"Error: {e}")
+
+    # --- LATIH ULANG MODEL (THREAD LATAR) ---
+    st.markdown("---")
+    st.markdown("###  Latih Ulang Model")
+    st.write("Melatih ulang model Random Forest dari data histori terbaru. Proses berjalan di latar belakang; aplikasi tetap bisa dipakai.")
+
+    job = core.current_job()
+    if job is not None and job.berjalan:
+        st.info(f"Pelatihan sedang berjalan ({job.elapsed:,.0f} detik)...")
+        if st.button("Perbarui Status"):
+            st.rerun()
+        return
+
+    if job is not None and job.status == 'selesai':
+        r = job.report
+        memori = f", tambahan memori puncak saat latih {r.peak_mb:,.0f} MB" if r.peak_mb is not None else ""
+        st.success(f"Model baru aktif: {r.rows:,} baris latih, {r.n_estimators} pohon, "
+                   f"waktu latih {r.durasi_s:,.1f} detik{memori}, file {r.model_mb:,.1f} MB.")
+    elif job is not None and job.status == 'gagal':
+        st.error(f"Pelatihan gagal: {job.error}")
+
+    if st.button("Latih Ulang Model", type="secondary"):
+        model, df_historis = utils.load_resources()
+        core.start_retraining(df_historis, core.MODEL_PATH, base_model=model, on_done=utils.ganti_model)
+        st.rerun()
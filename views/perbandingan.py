@@ -1,8 +1,38 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from sklearn.metrics import mean_squared_error, mean_absolute_percentage_error, r2_score
+import plotly.graph_objects as go
 import utils  # Import helper format_rupiah & create_card
+import core
+from core import profiling
+from core.downsample import MAKS_TITIK
+
+OPSI_SETAHUN = "Satu Tahun Penuh"
+BARIS_PER_HALAMAN = 31
+COLOR_AKTUAL = '#64748b'
+COLOR_PREDIKSI = '#009688'
+COLOR_GRID = '#ecf0f1'
+
+# --- GRAFIK TREN AKTUAL VS PREDIKSI (SELURUH HISTORI) ---
+# Histori bertahun-tahun disederhanakan di server (min/max per ember) sebelum dikirim ke browser;
+# mempersempit rentang tanggal menampilkan resolusi penuh bila titiknya <= MAKS_TITIK.
+def buat_grafik_tren(df_tren, maks_titik=MAKS_TITIK):
+    """Figure garis Aktual vs Prediksi harian -> (fig, jumlah titik yang dikirim)."""
+    df_plot = df_tren if maks_titik is None else core.downsample_frame(df_tren, 'Tanggal', ['Total Omzet', 'Prediksi'], maks_titik, metode='minmax')
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=df_plot['Tanggal'], y=df_plot['Total Omzet'], mode='lines', name='Aktual',
+        line=dict(color=COLOR_AKTUAL, width=1.5),
+        hovertemplate='%{x|%d %b %Y}<br>Aktual: <b>Rp %{y:,.0f}</b><extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=df_plot['Tanggal'], y=df_plot['Prediksi'], mode='lines', name='Prediksi',
+        line=dict(color=COLOR_PREDIKSI, width=1.5),
+        hovertemplate='%{x|%d %b %Y}<br>Prediksi: <b>Rp %{y:,.0f}</b><extra></extra>'
+    ))
+    fig.update_layout(plot_bgcolor='white', height=420, hovermode='x unified',
+                      xaxis=dict(showgrid=False), yaxis=dict(gridcolor=COLOR_GRID, tickprefix="Rp ", title="Total Omzet (Rp)"),
+                      legend=dict(orientation='h', y=1.08))
+    return fig, len(df_plot)
 
 def show(model, df_historis):
     st.markdown("##  Komparasi Data Aktual banding Prediksi")
@@ -33,65 +63,17 @@ def show(model, df_historis):
             st.info("Mohon pastikan berkas data yang diunggah memuat informasi omzet per shift (Pagi, Siang, Malam).")
             return
 
-        # --- 1. PREPARASI DATA ---
-        df = df_historis.copy()
-        
-        # Ekstraksi Fitur Waktu
-        df['Hari'] = df['Tanggal'].dt.day
-        df['Bulan'] = df['Tanggal'].dt.month
-        df['Minggu ke'] = df['Tanggal'].dt.isocalendar().week
-        df['Weekend'] = (df['Tanggal'].dt.weekday >= 5).astype(int)
-        
-        # --- KONSTRUKSI FITUR LAG (Sesuai Konfigurasi Pelatihan Model) ---
-        
-        # 1. Lag Variabel Cuaca
-        df['Hujan_t-3'] = df['Curah Hujan'].shift(3)
-        df['Hujan_t-7'] = df['Curah Hujan'].shift(7)
-        df['Hujan_t-14'] = df['Curah Hujan'].shift(14)
-        df['Suhu_t-3'] = df['Suhu'].shift(3)
-        df['Suhu_t-7'] = df['Suhu'].shift(7)
-
-        # 2. Lag Variabel Omzet Per Shift
-        shifts = ['Omzet Pagi', 'Omzet Siang', 'Omzet Malam']
-        for col in shifts:
-            df[f'{col}_t-7'] = df[col].shift(7)
-            df[f'{col}_t-30'] = df[col].shift(30)
-
-        # Eliminasi data dengan nilai null akibat proses shifting
-        df_ready = df.dropna().reset_index(drop=True)
-
-        # Definisi Fitur Input (Urutan harus konsisten dengan model latih)
-        features = [
-            'Hari', 'Bulan', 'Minggu ke', 'Weekend',
-            'Suhu', 'Curah Hujan',
-            'Hujan_t-3', 'Hujan_t-7', 'Hujan_t-14', 'Suhu_t-3', 'Suhu_t-7',
-            'Omzet Pagi_t-7', 'Omzet Pagi_t-30',
-            'Omzet Siang_t-7', 'Omzet Siang_t-30',
-            'Omzet Malam_t-7', 'Omzet Malam_t-30'
-        ]
+        # --- 1. BACKTEST SELURUH HISTORI (CACHE) ---
+        # Fitur, prediksi, residu & metrik bulanan dihitung sekali per versi dataset & model;
+        # mengganti filter tahun/bulan hanya memotong hasil cache (tanpa inferensi ulang).
+        try:
+            hasil_backtest = core.get_backtest(model, df_historis)
+        except Exception as e:
+            st.error(f"Terjadi kesalahan komputasi prediksi: {e}")
+            return
+        df_ready = hasil_backtest.harian
         
         if len(df_ready) > 0:
-            # Eksekusi Prediksi
-            X = df_ready[features]
-            
-            try:
-                # Prediksi Multi-Output [Pagi, Siang, Malam]
-                y_pred_raw = model.predict(X)
-                
-                # Agregasi Prediksi Total
-                df_ready['Prediksi'] = y_pred_raw.sum(axis=1)
-                
-                # Kalkulasi Deviasi (Residu)
-                df_ready['Selisih'] = df_ready['Total Omzet'] - df_ready['Prediksi']
-                
-            except Exception as e:
-                st.error(f"Terjadi kesalahan komputasi prediksi: {e}")
-                return
-            
-            # Atribut Filter
-            df_ready['Tahun'] = df_ready['Tanggal'].dt.year
-            df_ready['Bulan_Angka'] = df_ready['Tanggal'].dt.month
-
             # --- 2. PANEL FILTER DATA ---
             with st.container():
                 c1, c2, c3 = st.columns([2, 2, 1])
@@ -109,8 +91,11 @@ def show(model, df_historis):
                     bulan_tersedia = sorted(df_ready[df_ready['Tahun'] == pilih_tahun]['Bulan_Angka'].unique())
                     opsi_bulan = {k: v for k, v in list_bulan_map.items() if k in bulan_tersedia}
                     if opsi_bulan:
-                        pilih_bulan_nama = st.selectbox("Pilih Bulan Evaluasi", list(opsi_bulan.values()))
-                        pilih_bulan = [k for k, v in list_bulan_map.items() if v == pilih_bulan_nama][0]
+                        pilih_bulan_nama = st.selectbox("Pilih Bulan Evaluasi", list(opsi_bulan.values()) + [OPSI_SETAHUN])
+                        if pilih_bulan_nama == OPSI_SETAHUN:
+                            pilih_bulan = None
+                        else:
+                            pilih_bulan = [k for k, v in list_bulan_map.items() if v == pilih_bulan_nama][0]
                     else:
                         st.warning("Data tidak tersedia untuk periode tahun terpilih.")
                         return
@@ -120,24 +105,29 @@ def show(model, df_historis):
                     st.write("") 
                     tombol = st.button("Tampilkan Analisis ", type="primary", use_container_width=True)
 
+            # Periode yang sudah diproses disimpan agar navigasi halaman tabel tidak menutup hasil
             if tombol:
-                df_view = df_ready[(df_ready['Tahun'] == pilih_tahun) & (df_ready['Bulan_Angka'] == pilih_bulan)]
+                st.session_state['periode_perbandingan'] = (pilih_tahun, pilih_bulan)
+
+            if st.session_state.get('periode_perbandingan') == (pilih_tahun, pilih_bulan):
+                df_view = hasil_backtest.periode(pilih_tahun, pilih_bulan)
+                label_periode = "Tahunan" if pilih_bulan is None else "Bulanan"
 
                 if not df_view.empty:
-                    # --- 3. KALKULASI METRIK EVALUASI ---
-                    total_aktual = df_view['Total Omzet'].sum()
-                    total_prediksi = df_view['Prediksi'].sum()
+                    # --- 3. METRIK EVALUASI (dari tabel metrik bulanan di cache) ---
+                    metrik = hasil_backtest.metrik(pilih_tahun, pilih_bulan)
+                    total_aktual = metrik['Total Aktual']
+                    total_prediksi = metrik['Total Prediksi']
                     total_selisih = total_aktual - total_prediksi 
                     
                     # Metrik Statistik
-                    mse = mean_squared_error(df_view['Total Omzet'], df_view['Prediksi'])
-                    rmse = np.sqrt(mse)
-                    mape = mean_absolute_percentage_error(df_view['Total Omzet'], df_view['Prediksi'])
-                    r2 = r2_score(df_view['Total Omzet'], df_view['Prediksi'])
+                    rmse = metrik['RMSE']
+                    mape = metrik['MAPE']
+                    r2 = metrik['R2']
                     akurasi_persen = 100 * (1 - mape)
 
                     # --- 4. VISUALISASI KPI ---
-                    st.markdown("###  Ringkasan Performa Bulanan")
+                    st.markdown(f"###  Ringkasan Performa {label_periode}")
                     
                     k1, k2, k3 = st.columns(3)
                     with k1:
@@ -196,45 +186,43 @@ def show(model, df_historis):
                     
                     st.write("")
 
-                    # --- 5. TABEL DETAIL (WARNA PADA NOMINAL SELISIH) ---
+                    # --- 5. GRAFIK TREN SELURUH HISTORI (DISEDERHANAKAN, ZOOM VIA RENTANG) ---
+                    st.markdown("###  Tren Aktual vs Prediksi")
+                    tgl_min = df_ready['Tanggal'].min().date()
+                    tgl_max = df_ready['Tanggal'].max().date()
+                    if tgl_min < tgl_max:
+                        rentang = st.slider("Rentang Tanggal Grafik", min_value=tgl_min, max_value=tgl_max,
+                                            value=(tgl_min, tgl_max), format="DD/MM/YYYY")
+                    else:
+                        rentang = (tgl_min, tgl_max)
+                    tanggal = df_ready['Tanggal']
+                    df_tren = df_ready[(tanggal >= pd.Timestamp(rentang[0])) & (tanggal <= pd.Timestamp(rentang[1]))]
+                    with profiling.stage('chart.perbandingan'):
+                        fig, jumlah_titik = buat_grafik_tren(df_tren)
+                        st.plotly_chart(fig, use_container_width=True)
+                    if jumlah_titik < len(df_tren):
+                        st.caption(f"Menampilkan {jumlah_titik} dari {len(df_tren)} hari (puncak & lembah tetap dipertahankan). "
+                                   "Persempit rentang tanggal untuk melihat resolusi penuh.")
+
+                    st.write("")
+
+                    # --- 6. TABEL DETAIL (WARNA PADA NOMINAL SELISIH) ---
                     st.markdown("###  Rincian Data Harian")
                     
-                    tabel_show = df_view[['Tanggal', 'Total Omzet', 'Prediksi', 'Selisih']].copy()
-                    tabel_show['Tanggal'] = tabel_show['Tanggal'].dt.strftime('%d-%m-%Y')
-                    
-                    # Render Tabel HTML
-                    html_table = '<table class="styled-table" style="width:100%">'
-                    html_table += '<thead><tr><th>Tanggal</th><th>Aktual (Rp)</th><th>Prediksi (Rp)</th><th>Selisih (Rp)</th></tr></thead>'
-                    html_table += '<tbody>'
-                    
-                    for index, row in tabel_show.iterrows():
-                        selisih = row['Selisih']
-                        aktual = row['Total Omzet']
-                        
-                        val_aktual = utils.format_rupiah(aktual)
-                        val_pred = utils.format_rupiah(row['Prediksi'])
-                        val_selisih_num = utils.format_rupiah(abs(selisih)) 
-                        
-                        # LOGIKA WARNA TEKS
-                        err_rate = abs(selisih) / aktual if aktual != 0 else 1
-                        
-                        if err_rate < 0.2: 
-                            color_style = "color: #166534; font-weight: bold;" # Hijau
-                        else:
-                            color_style = "color: #991b1b; font-weight: bold;" # Merah
-                            
-                        tanda = "+" if selisih >= 0 else "-"
-                        
-                        html_table += f"<tr><td>{row['Tanggal']}</td><td>{val_aktual}</td><td>{val_pred}</td><td style='{color_style}'>{tanda} {val_selisih_num}</td></tr>"
-                    
-                    # Footer Total
-                    html_table += f'<tr style="background-color:#e0e7ff; font-weight:bold;"><td>TOTAL PERIODE INI</td><td>{utils.format_rupiah(total_aktual)}</td><td>{utils.format_rupiah(total_prediksi)}</td><td>{utils.format_rupiah(abs(total_selisih))}</td></tr>'
-                    html_table += '</tbody></table>'
+                    # Render Tabel HTML (format per kolom, dipecah per halaman untuk periode panjang)
+                    halaman = 1
+                    jumlah_halaman = -(-len(df_view) // BARIS_PER_HALAMAN)
+                    if jumlah_halaman > 1:
+                        halaman = st.number_input(f"Halaman (1 - {jumlah_halaman})", min_value=1, max_value=jumlah_halaman, value=1, step=1)
+                        awal = (halaman - 1) * BARIS_PER_HALAMAN
+                        st.caption(f"Menampilkan baris {awal + 1} - {min(awal + BARIS_PER_HALAMAN, len(df_view))} dari {len(df_view)} hari.")
+
+                    html_table = utils.render_tabel_selisih(df_view, total_aktual, total_prediksi, total_selisih, halaman, BARIS_PER_HALAMAN)
                     
                     st.markdown(html_table, unsafe_allow_html=True)
 
                 else:
-                    st.warning("Data tidak ditemukan untuk periode bulan yang dipilih.")
+                    st.warning("Data tidak ditemukan untuk periode yang dipilih.")
         else:
             st.error("Volume data historis tidak memadai untuk melakukan analisis komparatif (kurang dari 30 entri data).")
     else:
@@ -2,6 +2,10 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import utils
+import core
+from core import features, profiling
+from core.cache import LRUCache
+from core.history_store import fingerprint_frame
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
@@ -15,35 +19,53 @@ COLOR_SUHU  = '#ef4444'
 COLOR_HUJAN = '#10b981'
 COLOR_GRID  = '#ecf0f1'
 
+# Pita rentang antar pohon (P10-P90) per shift, warna sama dengan garisnya
+PITA_SHIFT = {'Pagi': 'rgba(241, 196, 15, 0.15)', 'Siang': 'rgba(230, 126, 34, 0.15)', 'Malam': 'rgba(41, 128, 185, 0.15)'}
+
+def tambah_pita(fig, x, bawah, atas, warna, nama):
+    fig.add_trace(go.Scatter(x=x, y=atas, mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=x, y=bawah, mode='lines', line=dict(width=0), fill='tonexty', fillcolor=warna,
+                             name=nama, legendgroup=nama, showlegend=False, hoverinfo='skip'))
+
+# --- CACHE FIGURE ---
+# Figure Plotly (termasuk make_subplots) dibangun sekali per hasil prediksi 30 hari
+# (sidik jari tabel prediksi); rerun karena widget lain memakai ulang objek figure yang
+# sama sehingga st.plotly_chart cukup menserialisasinya. Insight cuaca tidak perlu
+# di-cache: statistiknya diambil dari klimatologi dataset (core.climatology).
+FIGURE_CACHE_SIZE = 32
+_figure_cache = LRUCache(maxsize=FIGURE_CACHE_SIZE)
+
+def tercache(kunci, bangun):
+    """Nilai cache untuk `kunci`; dibangun dengan `bangun()` bila belum ada."""
+    hasil = _figure_cache.get(kunci)
+    if hasil is None:
+        hasil = bangun()
+        _figure_cache.put(kunci, hasil)
+    return hasil
+
 def get_indo_month(month_int):
     months = {1: 'Januari', 2: 'Februari', 3: 'Maret', 4: 'April', 5: 'Mei', 6: 'Juni',
               7: 'Juli', 8: 'Agustus', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'Desember'}
     return months.get(month_int, '')
 
+@profiling.timed('visualisasi.insight')
 def get_monthly_smart_insight(df_historis, target_date, col_target, col_feature, feature_name, current_val):
     """
     Analisis Cerdas: Membandingkan data bulan terpilih dengan sejarah bulan yang sama di tahun lalu.
+    Statistik bulanan diambil dari klimatologi dataset (dihitung sekali per versi dataset).
     """
     bulan_target = target_date.month
     nama_bulan = get_indo_month(bulan_target)
     
-    # 1. FILTER: Ambil hanya data di bulan yang sama dari sejarah (Misal: Semua data Januari)
-    df_bulan = df_historis[df_historis['Tanggal'].dt.month == bulan_target].copy()
-    
-    # Fallback jika data bulan ini terlalu sedikit (< 10 hari), pakai semua data
-    dataset_used = "Bulan " + nama_bulan
-    if len(df_bulan) < 10:
-        df_bulan = df_historis.copy()
-        dataset_used = "Keseluruhan Data"
+    # 1. RINGKASAN BULAN YANG SAMA (fallback ke seluruh data bila < 10 hari)
+    stat = core.climatology(df_historis).ringkasan(bulan_target, col_feature)
+    dataset_used = "Bulan " + nama_bulan if stat['bulan'] else "Keseluruhan Data"
 
-    # 2. HITUNG KORELASI (Hubungan Sebab-Akibat)
-    if df_bulan[col_feature].std() == 0 or df_bulan[col_target].std() == 0:
-        corr = 0 # Data konstan tidak punya korelasi
-    else:
-        corr = df_bulan[col_target].corr(df_bulan[col_feature])
+    # 2. KORELASI (Hubungan Sebab-Akibat) dengan Total Omzet; data konstan -> 0
+    corr = stat['corr']
     
     # 3. BANDINGKAN NILAI: Saat ini vs Rata-rata Historis
-    avg_hist = df_bulan[col_feature].mean()
+    avg_hist = stat['mean']
     diff = current_val - avg_hist
     
     status_nilai = "Normal"
@@ -59,6 +81,37 @@ def get_monthly_smart_insight(df_historis, target_date, col_target, col_feature,
     
     return penjelasan, corr
 
+# --- PEMBANGUN FIGURE ---
+def grafik_tren_shift(df_viz):
+    fig = go.Figure()
+    for shift, warna in PITA_SHIFT.items():
+        tambah_pita(fig, df_viz['Tanggal'], df_viz[f'Prediksi {shift} Bawah'], df_viz[f'Prediksi {shift} Atas'], warna, shift)
+    fig.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Prediksi Pagi'], mode='lines+markers', name='Pagi', line=dict(color=COLOR_PAGI, width=2)))
+    fig.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Prediksi Siang'], mode='lines+markers', name='Siang', line=dict(color=COLOR_SIANG, width=2)))
+    fig.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Prediksi Malam'], mode='lines+markers', name='Malam', line=dict(color=COLOR_MALAM, width=2)))
+
+    fig.update_layout(plot_bgcolor='white', height=450, hovermode="x unified", xaxis=dict(showgrid=False), yaxis=dict(title='Omzet (Rp)', gridcolor=COLOR_GRID, tickprefix="Rp "), legend=dict(orientation="h", y=1.1))
+    return fig
+
+def grafik_omzet_cuaca(df_viz, kolom, label, warna):
+    """Grafik dual axis: total omzet (kiri) dan satu variabel cuaca (kanan)."""
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Prediksi Total'], name="Omzet", line=dict(color=COLOR_TOTAL, width=3)), secondary_y=False)
+    fig.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz[kolom], name=label, line=dict(color=warna, width=2, dash='dot')), secondary_y=True)
+    fig.update_layout(plot_bgcolor='white', height=350, hovermode="x unified", legend=dict(orientation="h", y=1.1))
+    fig.update_yaxes(title_text="Omzet (Rp)", secondary_y=False, showgrid=False)
+    fig.update_yaxes(title_text=label, secondary_y=True, showgrid=False)
+    return fig
+
+def grafik_importance(importances, feature_names):
+    df_imp = pd.DataFrame({'Fitur': feature_names, 'Penting': importances}).sort_values('Penting', ascending=True)
+    fig = go.Figure(go.Bar(
+        x=df_imp['Penting'], y=df_imp['Fitur'], orientation='h',
+        marker=dict(color='#4361ee'), text=[f"{val:.1%}" for val in df_imp['Penting']], textposition='auto'
+    ))
+    fig.update_layout(plot_bgcolor='white', height=600, xaxis=dict(title="Bobot Kepentingan"), yaxis=dict(showgrid=False))
+    return fig
+
 def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan, mape_text):
     st.markdown(f"## Visualisasi Tren & Analisis Faktor")
     
@@ -76,7 +129,8 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan, mape_text
     st.markdown("---")
 
     # Generate Data Prediksi
-    df_viz = utils.generate_30_days_data(model, df_historis, tanggal_pilihan, input_suhu, input_hujan)
+    df_viz = core.generate_30_days_data(model, df_historis, tanggal_pilihan, input_suhu, input_hujan, interval=True)
+    versi_prediksi = fingerprint_frame(df_viz)
     
     # Hitung KPI
     total_30_hari = df_viz['Prediksi Total'].sum()
@@ -95,15 +149,12 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan, mape_text
 
     # --- GRAFIK 1: TREN SHIFT ---
     st.subheader("1. Tren Pergerakan Omzet per Shift")
-    st.caption("Visualisasi pola fluktuasi penjualan harian berdasarkan pembagian waktu operasional (Shift Pagi, Siang, Malam).")
+    st.caption("Visualisasi pola fluktuasi penjualan harian berdasarkan pembagian waktu operasional (Shift Pagi, Siang, Malam). "
+               "Area transparan menunjukkan rentang prediksi antar pohon model (P10-P90).")
     
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Prediksi Pagi'], mode='lines+markers', name='Pagi', line=dict(color=COLOR_PAGI, width=2)))
-    fig.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Prediksi Siang'], mode='lines+markers', name='Siang', line=dict(color=COLOR_SIANG, width=2)))
-    fig.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Prediksi Malam'], mode='lines+markers', name='Malam', line=dict(color=COLOR_MALAM, width=2)))
-
-    fig.update_layout(plot_bgcolor='white', height=450, hovermode="x unified", xaxis=dict(showgrid=False), yaxis=dict(title='Omzet (Rp)', gridcolor=COLOR_GRID, tickprefix="Rp "), legend=dict(orientation="h", y=1.1))
-    st.plotly_chart(fig, use_container_width=True)
+    with profiling.stage('chart.visualisasi'):
+        fig = tercache((versi_prediksi, 'tren_shift'), lambda: grafik_tren_shift(df_viz))
+        st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
     
@@ -118,13 +169,9 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan, mape_text
         st.markdown("#### 🌡️ Omzet vs Suhu")
         
         # Grafik Dual Axis
-        fig2 = make_subplots(specs=[[{"secondary_y": True}]])
-        fig2.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Prediksi Total'], name="Omzet", line=dict(color=COLOR_TOTAL, width=3)), secondary_y=False)
-        fig2.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Suhu'], name="Suhu (°C)", line=dict(color=COLOR_SUHU, width=2, dash='dot')), secondary_y=True)
-        fig2.update_layout(plot_bgcolor='white', height=350, hovermode="x unified", legend=dict(orientation="h", y=1.1))
-        fig2.update_yaxes(title_text="Omzet (Rp)", secondary_y=False, showgrid=False)
-        fig2.update_yaxes(title_text="Suhu (°C)", secondary_y=True, showgrid=False)
-        st.plotly_chart(fig2, use_container_width=True)
+        with profiling.stage('chart.visualisasi'):
+            fig2 = tercache((versi_prediksi, 'suhu'), lambda: grafik_omzet_cuaca(df_viz, 'Suhu', "Suhu (°C)", COLOR_SUHU))
+            st.plotly_chart(fig2, use_container_width=True)
         
         # SMART INSIGHT (Monthly)
         insight_suhu, corr_suhu = get_monthly_smart_insight(df_historis, tanggal_pilihan, 'Total Omzet', 'Suhu', 'Temperatur Suhu', avg_suhu_prediksi)
@@ -140,13 +187,9 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan, mape_text
         st.markdown("#### 🌧️ Omzet vs Curah Hujan")
         
         # Grafik Dual Axis
-        fig3 = make_subplots(specs=[[{"secondary_y": True}]])
-        fig3.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Prediksi Total'], name="Omzet", line=dict(color=COLOR_TOTAL, width=3)), secondary_y=False)
-        fig3.add_trace(go.Scatter(x=df_viz['Tanggal'], y=df_viz['Hujan'], name="Hujan (mm)", line=dict(color=COLOR_HUJAN, width=2, dash='dot')), secondary_y=True)
-        fig3.update_layout(plot_bgcolor='white', height=350, hovermode="x unified", legend=dict(orientation="h", y=1.1))
-        fig3.update_yaxes(title_text="Omzet (Rp)", secondary_y=False, showgrid=False)
-        fig3.update_yaxes(title_text="Hujan (mm)", secondary_y=True, showgrid=False)
-        st.plotly_chart(fig3, use_container_width=True)
+        with profiling.stage('chart.visualisasi'):
+            fig3 = tercache((versi_prediksi, 'hujan'), lambda: grafik_omzet_cuaca(df_viz, 'Hujan', "Hujan (mm)", COLOR_HUJAN))
+            st.plotly_chart(fig3, use_container_width=True)
         
         # SMART INSIGHT (Monthly)
         insight_hujan, corr_hujan = get_monthly_smart_insight(df_historis, tanggal_pilihan, 'Total Omzet', 'Curah Hujan', 'Curah Hujan', avg_hujan_prediksi)
@@ -163,25 +206,15 @@ def show(model, df_historis, tanggal_pilihan, input_suhu, input_hujan, mape_text
     st.subheader("3. Kontribusi Variabel (Feature Importance)")
     st.markdown("Grafik ini menunjukkan bobot kontribusi setiap variabel terhadap hasil prediksi model.")
     
-    feature_names = [
-        'Hari', 'Bulan', 'Minggu ke', 'Weekend',
-        'Suhu', 'Curah Hujan',
-        'Hujan_t-3', 'Hujan_t-7', 'Hujan_t-14', 'Suhu_t-3', 'Suhu_t-7',
-        'Omzet Pagi_t-7', 'Omzet Pagi_t-30',
-        'Omzet Siang_t-7', 'Omzet Siang_t-30',
-        'Omzet Malam_t-7', 'Omzet Malam_t-30'
-    ]
+    feature_names = features.FEATURE_COLS
     
     if hasattr(model, 'feature_importances_'):
         importances = model.feature_importances_
         if len(importances) == len(feature_names):
-            df_imp = pd.DataFrame({'Fitur': feature_names, 'Penting': importances}).sort_values('Penting', ascending=True)
-            fig4 = go.Figure(go.Bar(
-                x=df_imp['Penting'], y=df_imp['Fitur'], orientation='h',
-                marker=dict(color='#4361ee'), text=[f"{val:.1%}" for val in df_imp['Penting']], textposition='auto'
-            ))
-            fig4.update_layout(plot_bgcolor='white', height=600, xaxis=dict(title="Bobot Kepentingan"), yaxis=dict(showgrid=False))
-            st.plotly_chart(fig4, use_container_width=True)
+            # Hanya bergantung pada model -> satu figure per model
+            with profiling.stage('chart.visualisasi'):
+                fig4 = tercache((core.model_token(model), 'importance'), lambda: grafik_importance(importances, feature_names))
+                st.plotly_chart(fig4, use_container_width=True)
         else:
             st.error("Mismatch fitur model.")
     else: